@@ -9,8 +9,15 @@ from pathlib import Path
 # Add the project root to the Python path
 sys.path.append(str(Path(__file__).parent.absolute()))
 
-# Import the SnapProcure crew
-from src.snap_procure.crew import SnapProcure
+# The crew (crewAI takes seconds to import) and the scraper are loaded on
+# first use so the page renders straight away
+from src.snap_procure.memory import ConversationMemory
+from src.snap_procure.response_cache import ResponseCache
+from src.snap_procure.router import IntentRouter
+from src.snap_procure.tools import flush_scraper
+from src.snap_procure.tools.metrics import metrics, request_scope, serve_from_env
+from src.snap_procure.crew_pool import CrewPool
+from src.snap_procure.jobs import JobQueue, JobQueueFull
 
 # Set page config
 st.set_page_config(
@@ -84,6 +91,11 @@ if 'show_thinking_process' not in st.session_state:
     st.session_state.show_thinking_process = True
 if 'responses' not in st.session_state:
     st.session_state.responses = []
+if 'jobs' not in st.session_state:
+    st.session_state.jobs = []
+if 'memory' not in st.session_state:
+    # What this session said so far, bounded so follow-ups don't grow the prompt
+    st.session_state.memory = ConversationMemory()
 
 # Load environment variables
 load_dotenv()
@@ -110,6 +122,15 @@ def render_sidebar():
         if show_thinking != st.session_state.show_thinking_process:
             st.session_state.show_thinking_process = show_thinking
 
+    stats = get_response_cache().stats
+    st.sidebar.caption(
+        f"Response cache: {stats['hits']} hits / {stats['misses']} misses ({stats['size']} cached)"
+    )
+    routed = get_router().stats
+    st.sidebar.caption(f"Fast path: {routed['routed']} answered, {routed['fallbacks']} sent to the crew")
+    jobs = get_job_queue().stats
+    st.sidebar.caption(f"Workers: {jobs['running']}/{jobs['workers']} busy, {jobs['pending']} waiting")
+
 def render_header():
     st.markdown("""
     <div class="header">
@@ -142,55 +163,148 @@ def render_input_form():
                 else:
                     st.session_state.processing = True
 
-def process_request(user_input):
-    """Process user input using the SnapProcure crew."""
+@st.cache_resource
+def get_response_cache():
+    """Response cache shared by every session of this server process."""
+    return ResponseCache()
+
+@st.cache_resource
+def get_router():
+    """Fast path that answers simple price lookups without running the crew."""
+    return IntentRouter()
+
+@st.cache_resource
+def get_crew_pool():
+    """Warm crews shared by every session and rerun of this server process."""
+    from src.snap_procure.crew import SnapProcure
+    return CrewPool(lambda: SnapProcure().crew(), size=int(os.environ.get("CREW_POOL_SIZE", 2)))
+
+@st.cache_resource
+def get_job_queue():
+    """Worker pool that runs crew requests off the Streamlit script thread."""
+    return JobQueue(
+        workers=int(os.environ.get("JOB_WORKERS", 2)),
+        max_pending=int(os.environ.get("JOB_QUEUE_SIZE", 20))
+    )
+
+def process_request(job, user_input, conversation, follow_up, model, cache, pool, router):
+    """
+    Process user input using the SnapProcure crew.
+
+    Runs on a job worker thread, so it must not call Streamlit; agent steps
+    and task results are reported on ``job`` as they are produced.
+    ``conversation`` is the session's rendered memory at submit time and
+    ``follow_up`` whether it has earlier turns.
+    """
+    inputs = {"conversation": conversation}
     try:
-        # Initialize the crew
-        bot = SnapProcure()
-        crew = bot.crew()
-        
-        # Process the request
-        response = crew.kickoff(inputs={"user_request": user_input})
-        
-        # Format the response for display
-        response_data = {
-            "summary": response,
-            "recommendations": [],
-            "next_steps": [
-                "Review the information above",
-                "Ask follow-up questions if needed"
-            ]
-        }
-        
-        return response_data
-    except Exception as e:
-        error_msg = str(e)
-        if "No API key provided" in error_msg or "Incorrect API key" in error_msg:
-            st.sidebar.error("❌ Invalid or missing OpenAI API key. Please check your .env file.")
-        else:
-            st.error(f"Error processing request: {error_msg}")
-        return None
+        with request_scope(job.id), metrics.span("request", entry="streamlit"):
+            # Simple price lookups skip the crew entirely; repeated requests are
+            # answered from the cache without building a crew
+            response = router.route(user_input, follow_up=follow_up)
+            if response is not None:
+                job.report("task", "Answered directly from live store prices")
+            else:
+                response = cache.get(user_input, model=model, inputs=inputs)
+
+            if response is None:
+                # Borrow a warm crew instead of re-reading the YAML and rebuilding agents
+                with pool.acquire() as crew:
+                    for kind, payload in crew.stream({"user_request": user_input, **inputs}):
+                        if kind == "result":
+                            response = payload
+                        elif kind == "error":
+                            raise payload
+                        else:
+                            job.report(kind, payload)
+                cache.set(user_input, response, model=model, inputs=inputs)
+    finally:
+        # The server runs until killed, so each request writes its prices itself
+        flush_scraper()
+        metrics.flush()
+
+    # Format the response for display
+    return {
+        "summary": response,
+        "recommendations": [],
+        "next_steps": [
+            "Review the information above",
+            "Ask follow-up questions if needed"
+        ]
+    }
+
+def submit_request(user_input):
+    """Queue a request on the worker pool and remember its job id for this session."""
+    try:
+        job_id = get_job_queue().submit(
+            process_request,
+            user_input,
+            st.session_state.memory.render(),
+            len(st.session_state.memory) > 0,
+            st.session_state.llm_id,
+            get_response_cache(),
+            get_crew_pool(),
+            get_router()
+        )
+    except JobQueueFull:
+        st.warning("⏳ SnapProcure is busy with other requests right now. Please try again in a minute.")
+        return False
+    st.session_state.jobs.append({"job_id": job_id, "request": user_input})
+    return True
+
+@st.fragment(run_every=1)
+def render_jobs():
+    """Poll this session's running jobs and show their progress."""
+    if not st.session_state.jobs:
+        return
+
+    finished = False
+    for entry in list(st.session_state.jobs):
+        job = get_job_queue().get(entry["job_id"])
+
+        if job is None or job.status == "failed":
+            error_msg = job.error if job else "The request expired before it finished."
+            if "No API key provided" in error_msg or "Incorrect API key" in error_msg:
+                st.sidebar.error("❌ Invalid or missing OpenAI API key. Please check your .env file.")
+            else:
+                st.error(f"Error processing request: {error_msg}")
+            st.session_state.jobs.remove(entry)
+            continue
+
+        if job.status == "done":
+            st.session_state.memory.add(entry["request"], job.result["summary"])
+            st.session_state.responses.append({
+                "timestamp": datetime.now().isoformat(),
+                "request": entry["request"],
+                "response": job.result
+            })
+            st.session_state.jobs.remove(entry)
+            finished = True
+            continue
+
+        label = "⏳ Waiting for a free worker..." if job.status == "queued" else "🧠 Analyzing your request..."
+        with st.status(f"{label} {entry['request'][:60]}", expanded=True):
+            for kind, text in job.events[-20:]:
+                # Show agent output as soon as the worker reports it
+                if kind == "task":
+                    st.markdown(f"**✅ {text[:500]}**")
+                elif st.session_state.show_thinking_process:
+                    st.caption(text[:300])
+
+    if finished:
+        # Redraw the whole page so the new response shows up
+        st.rerun()
 
 def render_response():
     if hasattr(st.session_state, 'processing') and st.session_state.processing:
-        with st.spinner("🧠 Analyzing your request... This may take a moment."):
-            # Process the request using the crew
-            response_data = process_request(st.session_state.instructions)
-            
-            if response_data:
-                # Store the response
-                response_entry = {
-                    "timestamp": datetime.now().isoformat(),
-                    "request": st.session_state.instructions,
-                    "response": response_data
-                }
-                st.session_state.responses.append(response_entry)
-            
-            # Reset processing state
-            st.session_state.processing = False
+        # Reset processing state; the job keeps running in the background
+        st.session_state.processing = False
+        if submit_request(st.session_state.instructions):
             st.session_state.instructions = ""  # Clear the input
             st.rerun()
-    
+
+    render_jobs()
+
     # Display responses in reverse order (newest first)
     for i, response in enumerate(reversed(st.session_state.responses)):
         with st.container():
@@ -216,6 +330,7 @@ def render_response():
             st.markdown("---")
 
 def main():
+    serve_from_env()
     render_sidebar()
     render_header()
     
@@ -226,7 +341,7 @@ def main():
         
         if hasattr(st.session_state, 'processing') and st.session_state.processing:
             render_response()
-        elif st.session_state.responses:
+        elif st.session_state.responses or st.session_state.jobs:
             render_response()
     
     with col2:
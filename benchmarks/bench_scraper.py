@@ -0,0 +1,380 @@
+#!/usr/bin/env python
+"""
+Offline benchmarks for ProcurementScraper.
+
+Runs against the committed fixtures and a local stand-in server; nothing
+touches the network. Measures:
+
+- parse throughput (products/sec and MB/sec) per store, fixture size and parser engine
+- per-store latency of a search through the real transport
+- end-to-end ``scrape_all_stores`` wall time, concurrent and sequential
+- peak Python memory of a ``scrape_all_stores`` call on the largest pages
+- many parallel queries against stores that answer 429 when overloaded,
+  with and without the per-host rate limiter
+- a bulk run of many queries with pages parsed in-process versus in a
+  pool of parse worker processes overlapping with the fetches
+
+Results are written as JSON. With ``--baseline`` the run is compared with an
+earlier report and exits non-zero when a metric regressed by more than
+``--tolerance``.
+
+    python -m benchmarks.bench_scraper -o bench_report.json
+    python -m benchmarks.bench_scraper --baseline bench_report.json --latency 0.05 --error-rate 0.1
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from src.snap_procure.tools.parse_pool import ParsePool
+from src.snap_procure.tools.parsing import HtmlParser, _lxml_available
+from src.snap_procure.tools.ratelimit import RateLimiter
+from src.snap_procure.tools.scraper import ProcurementScraper
+from src.snap_procure.tools.stores import STORE_ADAPTERS
+from src.snap_procure.tools.transport import HttpTransport
+from .fixtures import SIZES, load_fixtures
+from .server import StandInServer
+
+QUERY = '2x4x8 lumber'
+
+
+class _DiscardHistory:
+    """Price history writes are not part of what these benchmarks measure."""
+
+    def append(self, df, query):
+        pass
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _summary(timings: List[float]) -> Dict[str, float]:
+    return {
+        'p50': round(statistics.median(timings), 5),
+        'p95': round(_percentile(timings, 0.95), 5),
+        'mean': round(statistics.fmean(timings), 5),
+        'runs': len(timings),
+    }
+
+
+def _scraper(
+    server: StandInServer,
+    output_dir: str,
+    engine: str = 'auto',
+    backoff: float = 0.05,
+    rate_limiter: Optional[RateLimiter] = None,
+    parse_pool: Optional[ParsePool] = None,
+) -> ProcurementScraper:
+    return ProcurementScraper(
+        output_dir=output_dir,
+        adapters=server.adapters(STORE_ADAPTERS),
+        transport=HttpTransport(headers=ProcurementScraper.HEADERS, backoff_factor=backoff, rate_limiter=rate_limiter),
+        use_cache=False,
+        parser=HtmlParser(engine),
+        history=_DiscardHistory(),
+        parse_pool=parse_pool,
+    )
+
+
+def bench_parse(fixtures: Dict[str, Dict[str, bytes]], engines: List[str], repeat: int, output_dir: str) -> List[Dict]:
+    """Parse every fixture ``repeat`` times with each engine."""
+    adapters = {adapter.key: adapter for adapter in STORE_ADAPTERS.values()}
+    results = []
+    for engine in engines:
+        scraper = ProcurementScraper(
+            output_dir=output_dir, use_cache=False, parser=HtmlParser(engine), history=_DiscardHistory()
+        )
+        for store_key, pages in fixtures.items():
+            for size, content in pages.items():
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    products = scraper._parse_page(adapters[store_key], content)
+                    timings.append(time.perf_counter() - started)
+                seconds = statistics.median(timings)
+                results.append({
+                    'store': store_key,
+                    'size': size,
+                    'engine': engine,
+                    'bytes': len(content),
+                    'products': len(products),
+                    'seconds_per_page': round(seconds, 6),
+                    'products_per_sec': round(len(products) / seconds, 1),
+                    'mb_per_sec': round(len(content) / seconds / 1e6, 2),
+                })
+    return results
+
+
+def bench_store_latency(server: StandInServer, scraper: ProcurementScraper, repeat: int) -> List[Dict]:
+    """Search each store ``repeat`` times through the real transport."""
+    results = []
+    for name, adapter in scraper.adapters.items():
+        server.reset_stats()
+        timings, found = [], 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            found = len(scraper.scrape_adapter(adapter, QUERY))
+            timings.append(time.perf_counter() - started)
+        results.append({
+            'store': adapter.key,
+            'products': found,
+            'requests': server.stats[adapter.key]['requests'],
+            'injected_errors': server.stats[adapter.key]['errors'],
+            **_summary(timings),
+        })
+    return results
+
+
+def bench_scrape_all(server: StandInServer, scraper: ProcurementScraper, repeat: int) -> List[Dict]:
+    """Time ``scrape_all_stores`` end to end, with and without the concurrent fan-out."""
+    results = []
+    for concurrent in (True, False):
+        server.reset_stats()
+        timings, found = [], 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            found = len(scraper.scrape_all_stores(QUERY, concurrent=concurrent))
+            timings.append(time.perf_counter() - started)
+        results.append({
+            'mode': 'concurrent' if concurrent else 'sequential',
+            'products': found,
+            'requests': sum(stats['requests'] for stats in server.stats.values()),
+            'injected_errors': sum(stats['errors'] for stats in server.stats.values()),
+            **_summary(timings),
+        })
+    return results
+
+
+def bench_memory(server: StandInServer, scraper: ProcurementScraper) -> Dict:
+    """Peak traced Python memory of one ``scrape_all_stores`` call."""
+    scraper.scrape_all_stores(QUERY)  # warm up imports and connection pools
+    tracemalloc.start()
+    try:
+        df = scraper.scrape_all_stores(QUERY)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'size': server.size,
+        'products': len(df),
+        'peak_bytes': peak,
+        'retained_bytes': current,
+        'dataframe_bytes': int(df.memory_usage(deep=True).sum()),
+    }
+
+
+def bench_rate_limit(fixtures: Dict[str, Dict[str, bytes]], output_dir: str, queries: int = 24) -> List[Dict]:
+    """
+    Run many searches in parallel against stores that serve 3 requests at a
+    time and answer 429 beyond that, with and without the rate limiter.
+    """
+    results = []
+    settings = {key: 0.05 for key in fixtures}
+    for mode in ('rate_limited', 'unlimited'):
+        with StandInServer(fixtures, latency=settings, capacity={key: 3 for key in fixtures}, retry_after=1) as server:
+            limiter = None
+            if mode == 'rate_limited':
+                # The stand-in serves every store from one host
+                budget = {name: replace(adapter, requests_per_second=50, burst=8, max_concurrency=8)
+                          for name, adapter in server.adapters(STORE_ADAPTERS).items()}
+                limiter = RateLimiter.from_adapters(budget, enabled=True)
+            scraper = _scraper(server, output_dir, rate_limiter=limiter)
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                found = list(executor.map(
+                    lambda i: len(scraper.scrape_all_stores(f'{QUERY} {i}', concurrent=True)), range(queries)
+                ))
+            seconds = time.perf_counter() - started
+            scraper.transport.close()
+        results.append({
+            'mode': mode,
+            'queries': queries,
+            'seconds': round(seconds, 3),
+            'products': sum(found),
+            'failed_searches': found.count(0),
+            'requests': sum(stats['requests'] for stats in server.stats.values()),
+            'throttled': sum(stats['throttled'] for stats in server.stats.values()),
+        })
+    return results
+
+
+def bench_parse_pool(fixtures: Dict[str, Dict[str, bytes]], output_dir: str, queries: int = 24) -> List[Dict]:
+    """
+    Price many queries the way a BOM run does (several searches at a time,
+    every store in parallel) on the largest pages, parsing in-process and
+    then in a pool with one worker per core.
+    """
+    results = []
+    latency = {key: 0.02 for key in fixtures}
+    for mode in ('in_process', 'parse_pool'):
+        with StandInServer(fixtures, size=max(SIZES, key=SIZES.get), latency=latency) as server:
+            pool = ParsePool(server.adapters(STORE_ADAPTERS)) if mode == 'parse_pool' else None
+            scraper = _scraper(server, output_dir, parse_pool=pool)
+            if pool is not None:
+                # Workers start on the first page; keep their start-up out of the timing
+                scraper.scrape_all_stores(QUERY)
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                found = list(executor.map(lambda i: len(scraper.scrape_all_stores(f'{QUERY} {i}')), range(queries)))
+            seconds = time.perf_counter() - started
+            scraper.transport.close()
+            worker_errors = sum(stats['errors'] + stats['failed_pages'] for stats in pool.stats.values()) if pool else 0
+            workers = pool.workers if pool else 0
+            if pool is not None:
+                pool.close()
+        results.append({
+            'mode': mode,
+            'workers': workers,
+            'queries': queries,
+            'seconds': round(seconds, 3),
+            'products': sum(found),
+            'products_per_sec': round(sum(found) / seconds, 1),
+            'worker_errors': worker_errors,
+        })
+    return results
+
+
+def _metadata(args) -> Dict:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'repeat': args.repeat,
+        'latency': args.latency,
+        'error_rate': args.error_rate,
+        'size': args.size,
+    }
+
+
+# (section, key fields, metric, True when higher is better)
+_TRACKED = [
+    ('parse', ('store', 'size', 'engine'), 'products_per_sec', True),
+    ('store_latency', ('store',), 'p50', False),
+    ('scrape_all_stores', ('mode',), 'p50', False),
+]
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Metrics that got worse than the baseline by more than ``tolerance``.
+
+    Returns:
+        List[str]: One line per regression
+    """
+    regressions = []
+    for section, keys, metric, higher_is_better in _TRACKED:
+        previous = {tuple(row[k] for k in keys): row[metric] for row in baseline.get(section, [])}
+        for row in report.get(section, []):
+            key = tuple(row[k] for k in keys)
+            if key not in previous or not previous[key]:
+                continue
+            change = (row[metric] - previous[key]) / previous[key]
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{section} {'/'.join(map(str, key))} {metric}: {previous[key]} -> {row[metric]} ({change:+.0%})")
+
+    peak, previous_peak = report.get('memory', {}).get('peak_bytes'), baseline.get('memory', {}).get('peak_bytes')
+    if peak and previous_peak and (peak - previous_peak) / previous_peak > tolerance:
+        regressions.append(f"memory peak_bytes: {previous_peak} -> {peak} ({(peak - previous_peak) / previous_peak:+.0%})")
+    return regressions
+
+
+def run(args) -> Dict:
+    fixtures = load_fixtures()
+    if not fixtures:
+        raise SystemExit("No fixtures found; run `python -m benchmarks.fixtures generate` first")
+    engines = ['lxml', 'html.parser'] if _lxml_available() else ['html.parser']
+    latency = {key: args.latency for key in fixtures}
+    error_rate = {key: args.error_rate for key in fixtures}
+
+    report = {'meta': _metadata(args)}
+    with tempfile.TemporaryDirectory() as output_dir, redirect_stdout(io.StringIO()):
+        report['parse'] = bench_parse(fixtures, engines, args.repeat, output_dir)
+
+        with StandInServer(fixtures, size=args.size, latency=latency, jitter=0.2, error_rate=error_rate) as server:
+            scraper = _scraper(server, output_dir)
+            report['store_latency'] = bench_store_latency(server, scraper, args.repeat)
+            report['scrape_all_stores'] = bench_scrape_all(server, scraper, args.repeat)
+            scraper.transport.close()
+
+        # Memory is measured on the largest pages without injected latency or errors
+        with StandInServer(fixtures, size=max(SIZES, key=SIZES.get)) as server:
+            scraper = _scraper(server, output_dir)
+            report['memory'] = bench_memory(server, scraper)
+            scraper.transport.close()
+
+        report['rate_limit'] = bench_rate_limit(fixtures, output_dir)
+        report['parse_pool'] = bench_parse_pool(fixtures, output_dir)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline ProcurementScraper benchmarks")
+    parser.add_argument("-o", "--output", default="bench_report.json", help="JSON report path")
+    parser.add_argument("-r", "--repeat", type=int, default=20, help="Runs per measurement")
+    parser.add_argument("--size", choices=list(SIZES), default="medium", help="Fixture served by the stand-in server")
+    parser.add_argument("--latency", type=float, default=0.0, help="Injected latency per response, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of responses answered with 503")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    for row in report['parse']:
+        print(f"📄 parse {row['store']:<11} {row['size']:<7} {row['engine']:<12} "
+              f"{row['products_per_sec']:>10,.0f} products/s  {row['mb_per_sec']:>6.1f} MB/s")
+    for row in report['store_latency']:
+        print(f"🏬 {row['store']:<11} p50 {row['p50'] * 1000:7.1f} ms  p95 {row['p95'] * 1000:7.1f} ms")
+    for row in report['scrape_all_stores']:
+        print(f"🔍 scrape_all_stores {row['mode']:<10} p50 {row['p50'] * 1000:7.1f} ms  "
+              f"p95 {row['p95'] * 1000:7.1f} ms  ({row['products']} products)")
+    for row in report['rate_limit']:
+        print(f"🚦 {row['queries']} parallel searches {row['mode']:<12} {row['seconds']:6.2f} s  "
+              f"{row['throttled']} of {row['requests']} requests throttled, {row['failed_searches']} searches failed")
+    for row in report['parse_pool']:
+        print(f"⚙️ {row['queries']} queries {row['mode']:<10} ({row['workers']} workers) {row['seconds']:6.2f} s  "
+              f"{row['products_per_sec']:>8,.0f} products/s, {row['worker_errors']} worker errors")
+    memory = report['memory']
+    print(f"🧠 peak {memory['peak_bytes'] / 1e6:.1f} MB for {memory['products']} products ({memory['size']} pages)")
+    print(f"📊 Report saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        for setting in ('latency', 'error_rate', 'size'):
+            if baseline.get('meta', {}).get(setting) != report['meta'][setting]:
+                print(f"⚠️ Baseline was run with a different {setting}; latencies are not comparable")
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"❌ {line}")
+        if regressions:
+            return 1
+        print("✅ No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+"""
+Search-page fixtures for the offline scraper benchmarks.
+
+Fixtures are gzipped HTML files in ``benchmarks/fixtures`` named
+``<store key>-<size>.html.gz``. The committed ones are generated from the
+selectors in ``config/stores.yaml`` with page chrome and an embedded state
+blob sized like the real pages; ``record`` replaces them with live pages
+when the network is available.
+
+    python -m benchmarks.fixtures generate
+    python -m benchmarks.fixtures record "2x4x8 lumber"
+"""
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import gzip
+import json
+import random
+import re
+
+FIXTURE_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+# Products per page for each fixture size
+SIZES = {'small': 6, 'medium': 24, 'large': 96}
+
+_DIMENSIONS = ['2x4x8', '2x4x10', '2x6x8', '2x6x12', '4x4x8', '1x6x6', '4x8 1/2 in', '4x8 3/4 in']
+_MATERIALS = [
+    'Pressure-Treated Southern Yellow Pine Lumber', 'Prime Whitewood Stud', 'Douglas Fir Kiln-Dried Board',
+    'Premium Cedar Fence Picket', 'Sanded Plywood Sheathing', 'OSB Subfloor Panel', 'Ground Contact PT Post',
+]
+_BRANDS = ['Severe Weather', 'WeatherShield', 'Top Choice', 'ProWood', 'LP', 'Georgia-Pacific', '']
+_DELIVERY = [
+    'Free delivery tomorrow', 'Delivery in 3-5 business days', 'Get it by Oct 24', 'Same day delivery',
+    'Ships in 1 week', 'Schedule delivery 2-4 days', 'Pickup today',
+]
+
+# Markup per store key, matching the selectors in config/stores.yaml
+_TEMPLATES = {
+    'home_depot': {
+        'product': (
+            '<div class="product-pod product-pod--default" data-product-id="{sku}">'
+            '<div class="product-image"><a href="/p/{slug}/{sku}"><img src="https://images.thdstatic.com/productImages/{sku}_145.jpg" '
+            'alt="{name}" width="145" height="145" loading="lazy"></a></div>'
+            '<div class="product-header"><span class="product-header__brand">{brand}</span>'
+            '<a data-testid="product-title" href="/p/{slug}/{sku}"><span>{name}</span></a></div>'
+            '<div class="ratings" aria-label="{rating} out of 5 stars">{stars}<span>({reviews})</span></div>'
+            '{price}{delivery}'
+            '<button class="bttn bttn--primary" data-sku="{sku}">Add to Cart</button></div>'
+        ),
+        'price': '<div class="price-format__main-price"><span>${price}</span></div>',
+        'delivery': '<div class="delivery-options"><span class="delivery__subtitle">{delivery}</span></div>',
+    },
+    'lowes': {
+        'product': (
+            '<div class="product-item tile_wrapper" data-itemid="{sku}">'
+            '<div class="tile-img"><a href="https://www.lowes.com/pd/{slug}/{sku}"><img src="https://mobileimages.lowes.com/productimages/{sku}.jpg" '
+            'alt="{name}" loading="lazy"></a></div>'
+            '<div class="brand-name">{brand}</div>'
+            '<a data-selector="product-title" href="/pd/{slug}/{sku}">{name}</a>'
+            '<div class="rating" title="{rating} stars">{stars}<span class="count">{reviews}</span></div>'
+            '{price}{delivery}'
+            '<button class="add-to-cart" data-itemid="{sku}">Add to Cart</button></div>'
+        ),
+        'price': '<div class="price-box"><span class="primary">${price}</span><span class="unit">/each</span></div>',
+        'delivery': '<div class="delivery-options">{delivery}</div>',
+    },
+}
+
+_CHROME = (
+    '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{query} - Search Results</title>'
+    '<link rel="stylesheet" href="/static/app.{seed}.css"><script>window.__PRELOADED_STATE__ = {state};</script>'
+    '</head><body><header class="site-header"><nav>{nav}</nav></header>'
+    '<main><aside class="facets">{facets}</aside><section class="results">{products}</section></main>'
+    '<footer class="site-footer">{nav}</footer></body></html>'
+)
+
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def generate_page(store_key: str, count: int, seed: int = 0, query: str = '2x4x8 lumber') -> bytes:
+    """
+    Build a search results page for a store.
+
+    Roughly one product in seven has no price and one in eleven no delivery
+    line, so the benchmarks exercise the same fallbacks as real pages.
+
+    Args:
+        store_key: Key of the store in ``config/stores.yaml``
+        count: Products on the page
+        seed: Seed for the deterministic content
+        query: Search shown in the page title
+
+    Returns:
+        bytes: UTF-8 encoded HTML
+    """
+    template = _TEMPLATES[store_key]
+    rng = random.Random(f'{store_key}-{count}-{seed}')
+    products, state = [], []
+    for i in range(count):
+        brand = rng.choice(_BRANDS)
+        name = f"{rng.choice(_DIMENSIONS)} {rng.choice(_MATERIALS)}"
+        sku = str(rng.randrange(100000000, 999999999))
+        price = f"{rng.uniform(2, 80):.2f}"
+        rating = round(rng.uniform(3, 5), 1)
+        products.append(template['product'].format(
+            sku=sku,
+            slug=_slug(name),
+            name=f"{brand} {name}".strip(),
+            brand=brand,
+            rating=rating,
+            stars='<svg class="star" viewBox="0 0 24 24"><path d="M12 2l3 7h7l-6 4 2 7-6-4-6 4 2-7-6-4h7z"/></svg>' * 5,
+            reviews=rng.randrange(0, 5000),
+            price='' if i % 7 == 6 else template['price'].format(price=price),
+            delivery='' if i % 11 == 10 else template['delivery'].format(delivery=rng.choice(_DELIVERY)),
+        ))
+        # Real pages embed a large JSON state blob with every product in it
+        state.append({
+            'itemId': sku, 'name': name, 'brand': brand, 'price': float(price), 'rating': rating,
+            'media': [f'https://images.example.com/{sku}_{size}.jpg' for size in (65, 145, 300, 600, 1000)],
+            'specifications': {f'spec_{n}': rng.choice(_MATERIALS) for n in range(12)},
+        })
+
+    nav = ''.join(f'<a href="/c/{_slug(m)}">{m}</a>' for m in _MATERIALS * 6)
+    facets = ''.join(
+        f'<label><input type="checkbox" name="facet" value="{_slug(b or "other")}">{b or "Other"}</label>'
+        for b in _BRANDS * 8
+    )
+    page = _CHROME.format(
+        query=query, seed=seed, state=json.dumps({'products': state}), nav=nav, facets=facets,
+        products=''.join(products),
+    )
+    return page.encode('utf-8')
+
+
+def fixture_path(store_key: str, size: str) -> Path:
+    return FIXTURE_DIR / f'{store_key}-{size}.html.gz'
+
+
+def load_fixture(store_key: str, size: str) -> bytes:
+    """Raw HTML of a committed fixture."""
+    with gzip.open(fixture_path(store_key, size), 'rb') as f:
+        return f.read()
+
+
+def load_fixtures(sizes: Optional[List[str]] = None) -> Dict[str, Dict[str, bytes]]:
+    """Every fixture, as ``{store key: {size: html}}``."""
+    fixtures: Dict[str, Dict[str, bytes]] = {}
+    for store_key in _TEMPLATES:
+        for size in sizes or SIZES:
+            if fixture_path(store_key, size).exists():
+                fixtures.setdefault(store_key, {})[size] = load_fixture(store_key, size)
+    return fixtures
+
+
+def _save(store_key: str, size: str, content: bytes):
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    # mtime=0 keeps regenerated fixtures byte-identical
+    with open(fixture_path(store_key, size), 'wb') as f:
+        f.write(gzip.compress(content, mtime=0))
+    print(f"💾 {fixture_path(store_key, size).name}: {len(content) / 1024:.0f} KiB")
+
+
+def generate():
+    """Regenerate every synthetic fixture."""
+    for store_key in _TEMPLATES:
+        for size, count in SIZES.items():
+            _save(store_key, size, generate_page(store_key, count))
+
+
+def record(query: str, pages: int = 1):
+    """
+    Replace the fixtures with live search pages.
+
+    The first results page becomes ``medium``; with ``pages`` > 1 the pages
+    are concatenated into ``large``.
+    """
+    from src.snap_procure.tools.scraper import ProcurementScraper
+    from src.snap_procure.tools.stores import STORE_ADAPTERS
+    from src.snap_procure.tools.transport import HttpTransport
+
+    transport = HttpTransport(headers=ProcurementScraper.HEADERS)
+    for adapter in STORE_ADAPTERS.values():
+        if adapter.key not in _TEMPLATES:
+            continue
+        bodies = []
+        for page in range(pages):
+            response = transport.get(adapter.url(query, page))
+            response.raise_for_status()
+            bodies.append(response.content)
+        _save(adapter.key, 'medium', bodies[0])
+        if pages > 1:
+            _save(adapter.key, 'large', b''.join(bodies))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Manage scraper benchmark fixtures")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("generate", help="Regenerate the synthetic fixtures")
+    recorder = commands.add_parser("record", help="Record live search pages (needs network)")
+    recorder.add_argument("query", help="Search to record, e.g. '2x4x8 lumber'")
+    recorder.add_argument("-p", "--pages", type=int, default=1, help="Result pages to record")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        generate()
+    else:
+        record(args.query, args.pages)
+
+
+if __name__ == "__main__":
+    main()
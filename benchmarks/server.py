@@ -0,0 +1,180 @@
+"""
+Local HTTP stand-in for the retailer sites.
+
+Serves the benchmark fixtures on 127.0.0.1 under ``/<store key>/search`` and
+can delay, fail or throttle responses per store, so the scraper's transport,
+retries, rate limiter, deadlines and fan-out run exactly as in production
+without the network.
+"""
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+import random
+import threading
+import time
+
+
+class StandInServer:
+    """
+    Fixture server with injectable latency and errors.
+
+    Use as a context manager; ``adapters`` rewrites the store adapters to
+    point at the server. Per-store request, error and throttle counts and
+    the peak number of concurrent requests are kept in ``stats``.
+    """
+
+    def __init__(
+        self,
+        fixtures: Dict[str, Dict[str, bytes]],
+        size: str = 'medium',
+        latency: Optional[Dict[str, float]] = None,
+        jitter: float = 0.0,
+        error_rate: Optional[Dict[str, float]] = None,
+        error_status: int = 503,
+        capacity: Optional[Dict[str, int]] = None,
+        retry_after: Optional[int] = None,
+        seed: int = 0,
+    ):
+        """
+        Initialize the server (it starts on ``__enter__``).
+
+        Args:
+            fixtures: Pages as ``{store key: {size: html}}``
+            size: Fixture size served unless the request asks for ``?size=``
+            latency: Seconds added to every response, per store key
+            jitter: Random extra latency, as a fraction of the store's latency
+            error_rate: Share of requests answered with ``error_status``, per store key
+            error_status: HTTP status of injected errors
+            capacity: Concurrent requests a store serves before answering 429, per store key
+            retry_after: ``Retry-After`` seconds (an integer, as in HTTP) sent with those 429s
+            seed: Seed for the injected jitter and errors
+        """
+        self.fixtures = fixtures
+        self.size = size
+        self.latency = latency or {}
+        self.jitter = jitter
+        self.error_rate = error_rate or {}
+        self.error_status = error_status
+        self.capacity = capacity or {}
+        self.retry_after = retry_after
+        self.stats: Dict[str, Dict[str, int]] = {key: self._empty_stats() for key in fixtures}
+        self._in_flight: Dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                store_key = parsed.path.strip('/').split('/')[0]
+                size = parse_qs(parsed.query).get('size', [server.size])[0]
+                page = server.fixtures.get(store_key, {}).get(size)
+                delay, fail, overloaded = server._draw(store_key)
+                try:
+                    if overloaded:
+                        retry_after = server.retry_after
+                        headers = {'Retry-After': str(retry_after)} if retry_after is not None else {}
+                        self._send(429, b'too many requests', headers)
+                        return
+                    if delay:
+                        time.sleep(delay)
+
+                    if page is None:
+                        self._send(404, b'not found')
+                    elif fail:
+                        self._send(server.error_status, b'injected error')
+                    else:
+                        self._send(200, page)
+                finally:
+                    server._done(store_key)
+
+            def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {'requests': 0, 'errors': 0, 'throttled': 0, 'peak_concurrency': 0}
+
+    def _draw(self, store_key: str):
+        with self._lock:
+            stats = self.stats.setdefault(store_key, self._empty_stats())
+            stats['requests'] += 1
+            in_flight = self._in_flight[store_key] = self._in_flight.get(store_key, 0) + 1
+            stats['peak_concurrency'] = max(stats['peak_concurrency'], in_flight)
+            overloaded = in_flight > self.capacity.get(store_key, in_flight)
+            if overloaded:
+                stats['throttled'] += 1
+                return 0.0, False, True
+            base = self.latency.get(store_key, 0.0)
+            delay = base * (1 + self._random.uniform(0, self.jitter)) if base else 0.0
+            fail = self._random.random() < self.error_rate.get(store_key, 0.0)
+            if fail:
+                stats['errors'] += 1
+        return delay, fail, False
+
+    def _done(self, store_key: str):
+        with self._lock:
+            self._in_flight[store_key] -= 1
+
+    def adapters(self, adapters: Dict) -> Dict:
+        """
+        Copies of store adapters whose URLs point at this server.
+
+        Args:
+            adapters: Adapters keyed by store name, e.g. ``STORE_ADAPTERS``
+
+        Returns:
+            Dict: Adapters for the stores that have fixtures
+        """
+        local = {}
+        for name, adapter in adapters.items():
+            if adapter.key not in self.fixtures:
+                continue
+            base = f'{self.url}/{adapter.key}'
+            local[name] = replace(
+                adapter,
+                base_url=base,
+                search_url=base + '/search?q={query}',
+                page_url=base + '/search?q={query}&offset={offset}',
+            )
+        return local
+
+    def reset_stats(self):
+        with self._lock:
+            for stats in self.stats.values():
+                stats.update(self._empty_stats())
+
+    def __enter__(self) -> 'StandInServer':
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='stand-in-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
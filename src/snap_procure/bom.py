@@ -0,0 +1,211 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List
+import contextvars
+import json
+import os
+import pandas as pd
+from .tools.cache import normalize_query
+from .tools.pricing import frame_cents
+from .tools.ranking import format_cents, rank_products
+
+# Raw scrape columns kept in the checkpoint; delivery columns are re-derived on load.
+# Checkpoints written before prices were kept in cents have 'price' / 'delivery_price'
+CHECKPOINT_COLUMNS = ['store', 'name', 'url', 'price_cents', 'delivery_text', 'delivery_price_cents', 'timestamp']
+
+
+def load_bom(path: str) -> List[Dict]:
+    """
+    Read a bill of materials from CSV or JSON.
+
+    Each line item needs a ``product`` and may have ``quantity`` (default 1)
+    and ``max_delivery_days``. JSON may be a list of items or ``{"items": [...]}``.
+
+    Args:
+        path: CSV or JSON file
+
+    Returns:
+        List[Dict]: Line items in file order
+    """
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        items = data.get('items', []) if isinstance(data, dict) else data
+        df = pd.DataFrame(items)
+    else:
+        df = pd.read_csv(path)
+
+    df.columns = [column.strip().lower() for column in df.columns]
+    if df.empty:
+        raise ValueError(f"{path} has no line items")
+    if 'product' not in df.columns:
+        raise ValueError(f"{path} has no 'product' column")
+
+    df = df[df['product'].notna() & (df['product'].astype(str).str.strip() != '')]
+    if df.empty:
+        raise ValueError(f"{path} has no line items")
+    quantity = df['quantity'] if 'quantity' in df.columns else pd.Series(1, index=df.index)
+    quantity = pd.to_numeric(quantity, errors='coerce').fillna(1).astype(int)
+    max_days = pd.to_numeric(df.get('max_delivery_days'), errors='coerce') if 'max_delivery_days' in df else None
+
+    items = []
+    for i, product in enumerate(df['product']):
+        days = max_days.iloc[i] if max_days is not None else None
+        items.append({
+            'line': i + 1,
+            'product': str(product).strip(),
+            'quantity': int(quantity.iloc[i]),
+            'max_delivery_days': int(days) if days is not None and pd.notna(days) else None,
+        })
+    return items
+
+
+class BomRun:
+    """
+    Prices a whole bill of materials in one batch.
+
+    Identical queries are scraped once, up to ``workers`` queries run at a
+    time, and each query that found at least one priced product is appended
+    to a JSON-lines checkpoint so an interrupted run resumes where it
+    stopped. Queries that failed or found nothing are retried by the next run.
+    """
+
+    def __init__(self, scraper, checkpoint_path: str, workers: int = 4, top_k: int = 1):
+        """
+        Initialize the run.
+
+        Args:
+            scraper: ProcurementScraper used for every query
+            checkpoint_path: JSON-lines file of finished queries
+            workers: Queries scraped concurrently
+            top_k: Options kept per delivery speed for each line item
+        """
+        self.scraper = scraper
+        self.checkpoint_path = checkpoint_path
+        self.workers = workers
+        self.top_k = top_k
+        # Why a query has no products this run, by normalized query
+        self.failures: Dict[str, str] = {}
+
+    def _load_checkpoint(self) -> Dict[str, pd.DataFrame]:
+        done = {}
+        if not os.path.exists(self.checkpoint_path):
+            return done
+        with open(self.checkpoint_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by the interruption; that query is redone
+                    continue
+                done[entry['query']] = pd.DataFrame(entry['products'])
+        return done
+
+    def _save_checkpoint(self, query: str, df: pd.DataFrame):
+        products = df[[column for column in CHECKPOINT_COLUMNS if column in df.columns]]
+        entry = {'query': query, 'products': json.loads(products.to_json(orient='records', date_format='iso'))}
+        with open(self.checkpoint_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+
+    def scrape(self, items: List[Dict]) -> Dict[str, pd.DataFrame]:
+        """
+        Scrape every distinct query in the BOM, skipping ones already checkpointed.
+
+        Queries that raise or return no priced product are left out of the
+        result and the checkpoint; the reason is kept in ``failures``.
+
+        Returns:
+            Dict[str, pd.DataFrame]: Products per normalized query
+        """
+        results = self._load_checkpoint()
+        self.failures = {}
+        queries = {}
+        for item in items:
+            queries.setdefault(normalize_query(item['product']), item['product'])
+        todo = {key: product for key, product in queries.items() if key not in results}
+
+        print(f"📦 {len(items)} line items, {len(queries)} distinct products, "
+              f"{len(queries) - len(todo)} already done")
+
+        Path(self.checkpoint_path).parent.mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bom') as executor:
+            # Workers run in copies of the caller's context so their spans keep the request id
+            futures = {
+                executor.submit(contextvars.copy_context().run, self.scraper.scrape_all_stores, product): key
+                for key, product in todo.items()
+            }
+            for n, future in enumerate(as_completed(futures), start=1):
+                key = futures[future]
+                try:
+                    df = future.result()
+                except Exception as e:
+                    print(f"❌ Error pricing '{todo[key]}': {str(e)}")
+                    self.failures[key] = f'scrape failed: {e}'
+                    continue
+                if df.empty or not frame_cents(df).notna().any():
+                    print(f"[{n}/{len(todo)}] {todo[key]}: no priced products")
+                    self.failures[key] = 'no priced products found' if not df.empty else 'not found'
+                    continue
+                self._save_checkpoint(key, df)
+                results[key] = df
+                print(f"[{n}/{len(todo)}] {todo[key]}: {len(df)} products")
+
+        return results
+
+    def price(self, items: List[Dict]) -> pd.DataFrame:
+        """
+        Price and rank every line item.
+
+        Returns:
+            pd.DataFrame: Ranked options for each line item, in BOM order
+        """
+        results = self.scrape(items)
+        priced = []
+        for item in items:
+            key = normalize_query(item['product'])
+            df = results.get(key)
+            if df is None or df.empty:
+                priced.append(pd.DataFrame([{**item, 'status': self.failures.get(key, 'not found')}]))
+                continue
+            ranked = rank_products(df, item['quantity'], item['max_delivery_days'], self.top_k)
+            if ranked.empty:
+                priced.append(pd.DataFrame([{**item, 'status': 'no option within constraints'}]))
+                continue
+            for key, value in item.items():
+                ranked.insert(len(ranked.columns), key, value)
+            ranked['status'] = 'ok'
+            priced.append(ranked)
+
+        leading = ['line', 'product', 'quantity', 'max_delivery_days', 'status']
+        if not priced:
+            return pd.DataFrame(columns=leading)
+        out = pd.concat(priced, ignore_index=True)
+        return out[leading + [column for column in out.columns if column not in leading]]
+
+    def run(self, items: List[Dict], output_path: str) -> pd.DataFrame:
+        """
+        Price the BOM and write the consolidated CSV.
+
+        The checkpoint is removed only once every distinct query has been
+        scraped; otherwise it is kept so the next run retries just the
+        failed ones.
+        """
+        priced = self.price(items)
+        priced.to_csv(output_path, index=False)
+
+        ok = priced[priced['status'] == 'ok']
+        if ok.empty:
+            print(f"\n⚠️ Priced 0/{len(items)} line items")
+        else:
+            best = ok.sort_values('total_cents').drop_duplicates('line')
+            print(f"\n✅ Priced {best['line'].nunique()}/{len(items)} line items, "
+                  f"cheapest total {format_cents(best['total_cents'].sum())}")
+        print(f"📄 Results saved to {output_path}")
+
+        if self.failures:
+            print(f"⚠️ {len(self.failures)} of the products have no priced offer yet; "
+                  "run the same command again to retry them")
+        elif os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        return priced
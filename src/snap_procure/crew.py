@@ -1,8 +1,16 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List
-from src.snap_procure.tools.scraper import ProcurementScraper
+from typing import TYPE_CHECKING, List
+from .crew_metrics import install_crew_metrics
+from .tools import get_scraper
+from .tools.catalog_tool import SearchCatalogTool
+from .tools.matching_tool import CompareStoresTool
+from .tools.ranking_tool import RankSuppliersTool
+from .tools.scraper_tool import ScrapeProductsTool
+
+if TYPE_CHECKING:
+    from .tools.scraper import ProcurementScraper
 
 @CrewBase
 class SnapProcure:
@@ -13,7 +21,11 @@ class SnapProcure:
 
     agents: List[BaseAgent]
     tasks: List[Task]
-    scraper: ProcurementScraper = ProcurementScraper(output_dir='data')
+
+    @property
+    def scraper(self) -> 'ProcurementScraper':
+        """The shared scraper used by every crew's tools."""
+        return get_scraper()
 
     @agent
     def order_manager(self) -> Agent:
@@ -30,7 +42,7 @@ class SnapProcure:
         """Agent responsible for collecting product data from suppliers."""
         return Agent(
             config=self.agents_config['data_collector'],
-            tools=[],
+            tools=[ScrapeProductsTool(scraper=self.scraper), SearchCatalogTool(scraper=self.scraper)],
             verbose=True,
             allow_delegation=False
         )
@@ -40,6 +52,7 @@ class SnapProcure:
         """Agent responsible for analyzing and recommending products."""
         return Agent(
             config=self.agents_config['procurement_analyst'],
+            tools=[RankSuppliersTool(scraper=self.scraper), CompareStoresTool(scraper=self.scraper)],
             verbose=True,
             allow_delegation=False
         )
@@ -57,8 +70,7 @@ class SnapProcure:
         return Task(
             config=self.tasks_config['collect_supplier_data'],
             agent=self.data_collector(),
-            output_file='data/raw_products.json',
-            callback=self._scrape_products
+            output_file='data/raw_products.json'
         )
 
     @task
@@ -79,18 +91,10 @@ class SnapProcure:
             output_file='data/recommendation.md'
         )
 
-    def _scrape_products(self, task_output: str) -> str:
-        try:
-            product = task_output.split("product: ")[1].split("\n")[0].strip()
-            df = self.scraper.scrape_all_stores(product)
-            if df.empty:
-                return "No products found. Please try a different search term."
-            return f"Successfully scraped {len(df)} products. Proceed with analysis."
-        except Exception as e:
-            return f"Error during scraping: {str(e)}"
-
     @crew
     def crew(self) -> Crew:
+        # Agent/task/LLM latency and token metrics (registered once per process)
+        install_crew_metrics()
         return Crew(
             agents=[
                 self.data_collector(),
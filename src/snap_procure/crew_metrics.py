@@ -0,0 +1,135 @@
+from typing import Any, Dict, List, Tuple
+import threading
+import time
+from .tools.metrics import metrics
+
+_installed = False
+_install_lock = threading.Lock()
+_local = threading.local()
+
+TOKEN_FIELDS = ('prompt_tokens', 'completion_tokens', 'cached_prompt_tokens', 'successful_requests')
+
+
+def _agent_name(agent: Any) -> str:
+    return (getattr(agent, 'role', None) or type(agent).__name__).strip()
+
+
+def _task_name(task: Any) -> str:
+    if task is None:
+        return ''
+    return getattr(task, 'name', None) or (getattr(task, 'description', '') or '').strip()[:40]
+
+
+def _tokens(agent: Any) -> Dict[str, int]:
+    process = getattr(agent, '_token_process', None)
+    if process is None:
+        return {}
+    summary = process.get_summary()
+    return {field: getattr(summary, field, 0) or 0 for field in TOKEN_FIELDS}
+
+
+def _stack(name: str) -> List:
+    stack = getattr(_local, name, None)
+    if stack is None:
+        stack = []
+        setattr(_local, name, stack)
+    return stack
+
+
+def _current_agent() -> str:
+    agents = _stack('agents')
+    return agents[-1][0] if agents else 'unknown'
+
+
+def install_crew_metrics():
+    """
+    Record latency and token usage for every agent, task and LLM call.
+
+    Handlers are registered once per process on crewAI's event bus, which
+    emits synchronously on the thread running the crew; per-thread stacks
+    pair each start with its completion, so pooled crews running in
+    parallel and delegations nested inside the manager are kept apart.
+    Token counts are the difference of the agent's running totals between
+    start and completion, so they are per agent *and* task.
+    """
+    global _installed
+    with _install_lock:
+        if _installed or not metrics.enabled:
+            return
+        _installed = True
+
+    from crewai.utilities.events import (
+        AgentExecutionCompletedEvent,
+        AgentExecutionErrorEvent,
+        AgentExecutionStartedEvent,
+        LLMCallCompletedEvent,
+        LLMCallFailedEvent,
+        LLMCallStartedEvent,
+        TaskCompletedEvent,
+        TaskFailedEvent,
+        TaskStartedEvent,
+        crewai_event_bus,
+    )
+
+    def agent_started(source, event):
+        _stack('agents').append((_agent_name(event.agent), _task_name(event.task), time.perf_counter(), _tokens(event.agent)))
+
+    def agent_finished(source, event):
+        agents = _stack('agents')
+        if not agents:
+            return
+        agent, task, started, before = agents.pop()
+        seconds = time.perf_counter() - started
+        status = 'error' if isinstance(event, AgentExecutionErrorEvent) else 'ok'
+        metrics.observe('agent_execution_seconds', seconds, agent=agent, task=task)
+        after = _tokens(event.agent)
+        usage = {field: after.get(field, 0) - before.get(field, 0) for field in TOKEN_FIELDS}
+        for field in ('prompt_tokens', 'completion_tokens', 'cached_prompt_tokens'):
+            if usage[field]:
+                metrics.inc('llm_tokens_total', usage[field], agent=agent, task=task, kind=field[:-len('_tokens')])
+        metrics.event(
+            'agent_execution', agent=agent, task=task, status=status,
+            duration_ms=round(seconds * 1000, 3), **usage,
+        )
+
+    def task_started(source, event):
+        _stack('tasks').append((_task_name(event.task), time.perf_counter()))
+
+    def task_finished(source, event):
+        tasks = _stack('tasks')
+        if not tasks:
+            return
+        task, started = tasks.pop()
+        seconds = time.perf_counter() - started
+        status = 'error' if isinstance(event, TaskFailedEvent) else 'ok'
+        metrics.observe('task_seconds', seconds, task=task)
+        metrics.event('task', task=task, status=status, duration_ms=round(seconds * 1000, 3))
+
+    def llm_started(source, event):
+        _stack('llm_calls').append(time.perf_counter())
+
+    def llm_finished(source, event):
+        calls = _stack('llm_calls')
+        if not calls:
+            return
+        seconds = time.perf_counter() - calls.pop()
+        agent = _current_agent()
+        status = 'error' if isinstance(event, LLMCallFailedEvent) else 'ok'
+        metrics.observe('llm_call_seconds', seconds, agent=agent)
+        metrics.inc('llm_calls_total', agent=agent, status=status)
+        model = getattr(source, 'model', None)
+        metrics.event('llm_call', agent=agent, model=model, status=status, duration_ms=round(seconds * 1000, 3))
+
+    handlers: List[Tuple[type, Any]] = [
+        (AgentExecutionStartedEvent, agent_started),
+        (AgentExecutionCompletedEvent, agent_finished),
+        (AgentExecutionErrorEvent, agent_finished),
+        (TaskStartedEvent, task_started),
+        (TaskCompletedEvent, task_finished),
+        (TaskFailedEvent, task_finished),
+        (LLMCallStartedEvent, llm_started),
+        (LLMCallCompletedEvent, llm_finished),
+        (LLMCallFailedEvent, llm_finished),
+    ]
+    for event_type, handler in handlers:
+        crewai_event_bus.register_handler(event_type, handler)
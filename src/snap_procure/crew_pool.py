@@ -0,0 +1,142 @@
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import contextvars
+import queue
+import threading
+
+
+def describe_step(step: Any) -> str:
+    """Short text for an agent step (AgentAction / AgentFinish / tool result)."""
+    for attribute in ('output', 'result', 'thought', 'text'):
+        value = getattr(step, attribute, None)
+        if value:
+            return str(value)
+    return str(step)
+
+
+class PooledCrew:
+    """
+    A built crew whose agent steps and task results can be observed.
+
+    Callbacks are installed once on every agent and task and forward to
+    whoever is currently running the crew, so the crew can be reused by
+    many requests without rebuilding it.
+    """
+
+    def __init__(self, crew):
+        self.crew = crew
+        self._listener: Optional[Callable[[str, str], None]] = None
+
+        agents = list(crew.agents)
+        if getattr(crew, 'manager_agent', None) is not None:
+            agents.append(crew.manager_agent)
+        for agent in agents:
+            agent.step_callback = self._on_step
+        for task in crew.tasks:
+            task.callback = self._on_task
+
+    def _on_step(self, step: Any):
+        if self._listener:
+            self._listener('step', describe_step(step))
+
+    def _on_task(self, output: Any):
+        if self._listener:
+            agent = getattr(output, 'agent', '') or ''
+            text = getattr(output, 'raw', None) or str(output)
+            self._listener('task', f"{agent.strip()}: {text}" if agent else text)
+
+    def kickoff(self, inputs: Dict[str, Any]) -> Any:
+        """Run the crew to completion."""
+        return self.crew.kickoff(inputs=inputs)
+
+    def stream(self, inputs: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+        """
+        Run the crew in the background and yield its output as it is produced.
+
+        Args:
+            inputs: Kickoff inputs
+
+        Yields:
+            Tuple[str, Any]: ('step', text) and ('task', text) events while the
+            crew runs, then ('result', answer) or ('error', exception)
+        """
+        events: queue.Queue = queue.Queue()
+        self._listener = lambda kind, text: events.put((kind, text))
+
+        def run():
+            try:
+                events.put(('result', self.crew.kickoff(inputs=inputs)))
+            except Exception as e:
+                events.put(('error', e))
+
+        # Run in a copy of the caller's context so crew metrics keep the request id
+        worker = threading.Thread(
+            target=contextvars.copy_context().run, args=(run,), name='crew-stream', daemon=True
+        )
+        worker.start()
+        try:
+            while True:
+                kind, payload = events.get()
+                yield kind, payload
+                if kind in ('result', 'error'):
+                    return
+        finally:
+            worker.join()
+            self._listener = None
+
+
+class CrewPool:
+    """
+    Process-wide pool of warm crews.
+
+    Crews are built lazily, at most ``size`` of them, and handed out one
+    request at a time; a request waits when every crew is busy.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 2):
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Builds a new crew, e.g. ``lambda: SnapProcure().crew()``
+            size: Maximum number of crews kept warm
+        """
+        self.factory = factory
+        self.size = size
+        self._idle: List[PooledCrew] = []
+        self._built = 0
+        self._available = threading.Semaphore(size)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[PooledCrew]:
+        """
+        Check out a warm crew for one request.
+
+        Args:
+            timeout: Seconds to wait for a free crew; None waits forever
+
+        Yields:
+            PooledCrew: A crew reserved for the caller
+        """
+        if not self._available.acquire(timeout=timeout):
+            raise TimeoutError("No crew became available in time")
+        try:
+            with self._lock:
+                pooled = self._idle.pop() if self._idle else None
+            if pooled is None:
+                pooled = PooledCrew(self.factory())
+                with self._lock:
+                    self._built += 1
+            try:
+                yield pooled
+            finally:
+                with self._lock:
+                    self._idle.append(pooled)
+        finally:
+            self._available.release()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Crews built so far and crews currently idle."""
+        return {'built': self._built, 'idle': len(self._idle), 'size': self.size}
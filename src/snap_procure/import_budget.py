@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+Import-time budget for the CLI and the Streamlit app.
+
+Every target is imported in a fresh interpreter a few times; the median
+wall time must stay within its budget and none of the heavy dependencies
+listed for it may be loaded. Run ``python -m snap_procure.import_budget``
+(or the ``import_budget`` script); it exits non-zero when a budget is blown.
+"""
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Loaded on first use only; a cold start that pulls them in is a regression
+HEAVY_MODULES = ['crewai', 'pandas', 'pyarrow', 'litellm']
+
+
+@dataclass
+class Budget:
+    """How long importing a target may take and what it may not load."""
+    target: str
+    seconds: float
+    forbidden: List[str] = field(default_factory=lambda: list(HEAVY_MODULES))
+
+
+BUDGETS = [
+    Budget('snap_procure', 0.05),
+    Budget('snap_procure.main', 0.05),
+    Budget('snap_procure.router', 0.5),
+    Budget('snap_procure.response_cache', 0.1),
+    # Module-level code of the Streamlit script, i.e. everything before the first render
+    Budget('app.py', 1.5),
+]
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+target = {target!r}
+if target.endswith('.py'):
+    import runpy
+    runpy.run_path(target, run_name='__import_budget__')
+else:
+    __import__(target)
+elapsed = time.perf_counter() - started
+print(json.dumps({{'seconds': elapsed, 'loaded': sorted(m for m in {forbidden!r} if m in sys.modules)}}))
+"""
+
+
+@dataclass
+class Result:
+    target: str
+    seconds: float
+    budget: float
+    loaded: List[str]
+    slowest: List[Dict]
+
+    @property
+    def ok(self) -> bool:
+        return self.seconds <= self.budget and not self.loaded
+
+
+def _environment() -> Dict[str, str]:
+    env = dict(os.environ)
+    paths = [str(PROJECT_ROOT / 'src'), str(PROJECT_ROOT)]
+    if env.get('PYTHONPATH'):
+        paths.append(env['PYTHONPATH'])
+    env['PYTHONPATH'] = os.pathsep.join(paths)
+    # Keep Streamlit quiet when the script runs outside `streamlit run`
+    env.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+    return env
+
+
+def _slowest_imports(stderr: str, top: int = 5) -> List[Dict]:
+    """Top-level imports and their direct children by cumulative time, from ``-X importtime``."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented by two spaces per level; deeper ones are
+        # already counted in their parent's cumulative time
+        if name.startswith('     '):
+            continue
+        imports.append({'module': name.strip(), 'seconds': int(cumulative) / 1e6})
+    return sorted(imports, key=lambda entry: entry['seconds'], reverse=True)[:top]
+
+
+def measure(budget: Budget, repeat: int = 3) -> Result:
+    """
+    Import a target in fresh interpreters and compare it with its budget.
+
+    Args:
+        budget: Target and limits
+        repeat: Fresh interpreters to time; the median is reported
+
+    Returns:
+        Result: Median seconds, forbidden modules that were loaded and the
+        slowest top-level imports of the last run
+    """
+    probe = _PROBE.format(target=budget.target, forbidden=budget.forbidden)
+    timings, loaded, slowest = [], [], []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', probe],
+            cwd=PROJECT_ROOT,
+            env=_environment(),
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Importing {budget.target} failed:\n{completed.stderr[-2000:]}")
+        report = json.loads(completed.stdout.strip().splitlines()[-1])
+        timings.append(report['seconds'])
+        loaded = report['loaded']
+        slowest = _slowest_imports(completed.stderr)
+    return Result(budget.target, round(statistics.median(timings), 4), budget.seconds, loaded, slowest)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check import times against their budgets")
+    parser.add_argument("targets", nargs="*", help="Only check these targets")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Fresh interpreters per target")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    budgets = [budget for budget in BUDGETS if not args.targets or budget.target in args.targets]
+    results = [measure(budget, args.repeat) for budget in budgets]
+
+    for result in results:
+        mark = "✅" if result.ok else "❌"
+        print(f"{mark} {result.target:<30} {result.seconds * 1000:8.1f} ms  (budget {result.budget * 1000:.0f} ms)")
+        if result.loaded:
+            print(f"   loads {', '.join(result.loaded)} eagerly")
+        if not result.ok:
+            for entry in result.slowest:
+                print(f"   {entry['seconds'] * 1000:8.1f} ms  {entry['module']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([{**asdict(result), 'ok': result.ok} for result in results], f, indent=2)
+
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
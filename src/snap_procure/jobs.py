@@ -0,0 +1,123 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import queue
+import threading
+import time
+import uuid
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+@dataclass
+class Job:
+    """A request running (or waiting to run) on the worker pool."""
+    id: str
+    status: str = 'queued'  # queued -> running -> done | failed
+    events: List[Tuple[str, str]] = field(default_factory=list)
+    result: Any = None
+    error: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    def report(self, kind: str, text: str):
+        """Record a progress event; safe to call from the worker thread."""
+        self.events.append((kind, text))
+
+
+class JobQueue:
+    """
+    Local job queue with a fixed pool of worker threads.
+
+    ``submit`` returns a job id immediately; callers poll ``get`` for status
+    and progress. At most ``max_pending`` jobs may wait for a worker, beyond
+    that ``submit`` raises JobQueueFull so the caller can push back.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 20, keep_finished: int = 200):
+        """
+        Initialize the queue and start its workers.
+
+        Args:
+            workers: Jobs run concurrently
+            max_pending: Jobs allowed to wait for a free worker
+            keep_finished: Finished jobs remembered for polling before the oldest are dropped
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self.keep_finished = keep_finished
+        self._pending: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._jobs: Dict[str, Job] = {}
+        self._finished: List[str] = []
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> str:
+        """
+        Queue ``fn(job, *args, **kwargs)`` to run on a worker.
+
+        ``fn`` receives its Job first so it can ``report`` progress.
+
+        Returns:
+            str: The job id
+
+        Raises:
+            JobQueueFull: When ``max_pending`` jobs are already waiting
+        """
+        job = Job(id=uuid.uuid4().hex[:12])
+        with self._lock:
+            self._jobs[job.id] = job
+        try:
+            self._pending.put_nowait((job, fn, args, kwargs))
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job.id]
+            raise JobQueueFull(f"{self.max_pending} requests are already waiting")
+        return job.id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Current state of a job, or None if it is unknown or expired."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _work(self):
+        while True:
+            job, fn, args, kwargs = self._pending.get()
+            job.status = 'running'
+            job.started_at = time.time()
+            try:
+                job.result = fn(job, *args, **kwargs)
+                job.status = 'done'
+            except Exception as e:
+                job.error = str(e)
+                job.status = 'failed'
+            finally:
+                job.finished_at = time.time()
+                self._retire(job)
+
+    def _retire(self, job: Job):
+        with self._lock:
+            self._finished.append(job.id)
+            while len(self._finished) > self.keep_finished:
+                self._jobs.pop(self._finished.pop(0), None)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Queue depth and job counts by status."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {'queued': 0, 'running': 0, 'done': 0, 'failed': 0}
+        for job in jobs:
+            counts[job.status] += 1
+        return {'workers': self.workers, 'pending': self._pending.qsize(), **counts}
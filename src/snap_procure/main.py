@@ -1,17 +1,33 @@
 #!/usr/bin/env python
+import argparse
+import os
 import sys
 from datetime import datetime
-from snap_procure.crew import SnapProcure
+
+# Entry points import what they need when they run: crewAI alone takes
+# seconds to import, and `bom` never needs it
 
 
 def run():
     """
     Entry point for interactive chat mode.
-    Every user message is routed to the chat task via kickoff.
+    Every user message is routed to the chat task via kickoff, together with
+    a bounded summary of the conversation so far.
     """
+    from snap_procure.crew import SnapProcure
+    from snap_procure.memory import ConversationMemory
+    from snap_procure.response_cache import ResponseCache
+    from snap_procure.router import IntentRouter
+    from snap_procure.tools import flush_scraper
+    from snap_procure.tools.metrics import metrics, request_scope, serve_from_env
+
+    serve_from_env()
     bot = SnapProcure()
     crew = bot.crew()
-    
+    cache = ResponseCache()
+    router = IntentRouter(bot.scraper)
+    memory = ConversationMemory()
+
     print("\n🤖 SnapProcure Chatbot: assisting general contractors! "
           "(type 'exit' to quit)\n")
 
@@ -21,17 +37,25 @@ def run():
             print("Goodbye!")
             sys.exit(0)
 
-        # Use kickoff with the user_request input
+        # Simple price/availability lookups are answered straight from the
+        # scraper; everything else goes through kickoff with the user_request
+        # and conversation inputs, and repeated questions are answered from
+        # the response cache
         try:
-            reply = crew.kickoff(
-                inputs={
-                    "user_request": user_input
-                }
-            )
+            with request_scope(), metrics.span("request", entry="cli") as span:
+                reply = router.route(user_input, follow_up=len(memory) > 0)
+                if reply is None:
+                    span.set(context_tokens=memory.tokens)
+                    reply = cache.kickoff(crew, user_input, inputs={"conversation": memory.render()})
+            memory.add(user_input, reply)
             print(f"Bot: {reply}\n")
         except Exception as e:
             print(f"⚠️  Error generating reply: {e}", file=sys.stderr)
             sys.exit(1)
+        finally:
+            # Prices scraped this turn are written now, not at interpreter exit
+            flush_scraper()
+            metrics.flush()
 
 # def run():
 #     """
@@ -63,9 +87,126 @@ def run():
 #         print(f"\n❌ An error occurred: {e}", file=sys.stderr)
 #         sys.exit(1)
 
+def bom():
+    """
+    Price a whole bill of materials (CSV or JSON with product, quantity,
+    max_delivery_days) in one batch and write a consolidated ranked CSV.
+    Re-running the same command after an interruption resumes from the checkpoint.
+    """
+    parser = argparse.ArgumentParser(description="Price a bill of materials")
+    parser.add_argument("path", help="BOM file (.csv or .json)")
+    parser.add_argument("-o", "--output", help="Output CSV (default: data/<bom>_priced.csv)")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Products scraped concurrently")
+    parser.add_argument("-k", "--top-k", type=int, default=1, help="Options kept per delivery speed")
+    parser.add_argument(
+        "-p", "--parse-workers", type=int, default=None,
+        help="Processes parsing result pages while the next ones download (default: one per core, 0 parses in-process)"
+    )
+    args = parser.parse_args(sys.argv[1:])
+
+    from snap_procure.bom import BomRun, load_bom
+    from snap_procure.tools.metrics import metrics, request_scope
+    from snap_procure.tools.parse_pool import ParsePool
+    from snap_procure.tools.scraper import ProcurementScraper
+    from snap_procure.tools.stores import STORE_ADAPTERS
+
+    stem = os.path.splitext(os.path.basename(args.path))[0]
+    output = args.output or os.path.join("data", f"{stem}_priced.csv")
+
+    pool = ParsePool(STORE_ADAPTERS, workers=args.parse_workers)
+    scraper = ProcurementScraper(output_dir="data", parse_pool=pool if pool.workers > 0 else None)
+    try:
+        items = load_bom(args.path)
+        pricing = BomRun(
+            scraper,
+            checkpoint_path=os.path.join("data", f".{stem}.checkpoint.jsonl"),
+            workers=args.workers,
+            top_k=args.top_k
+        )
+        with request_scope(), metrics.span("bom", entry="cli") as span:
+            span.set(items=len(items))
+            pricing.run(items, output)
+        errors = sum(stats["errors"] + stats["failed_pages"] for stats in pool.stats.values())
+        if errors:
+            print(f"⚠️ {errors} products or pages could not be parsed")
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrupted; run the same command again to resume.", file=sys.stderr)
+        sys.exit(130)
+    except Exception as e:
+        print(f"\n❌ An error occurred: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        scraper.history.close()
+        pool.close()
+
+def catalog():
+    """
+    Build or search the local product catalog.
+    `catalog build` backfills it from the price history and earlier
+    data/procurement_*.csv results; `catalog search "pt 2x4" --max-price 10`
+    queries it without contacting the retailers.
+    """
+    parser = argparse.ArgumentParser(description="Local catalog of previously seen products")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("build", help="Backfill from the price history and earlier CSV results")
+    search = commands.add_parser("search", help="Search previously seen products")
+    search.add_argument("query", nargs="?", default="", help="What to look for, e.g. 'pressure treated 2x4'")
+    search.add_argument("-s", "--store", action="append", help="Only this store (repeatable)")
+    search.add_argument("--min-price", type=float, help="Lowest unit price in dollars")
+    search.add_argument("--max-price", type=float, help="Highest unit price in dollars")
+    search.add_argument("-n", "--limit", type=int, default=10, help="Products to show")
+    args = parser.parse_args(sys.argv[1:])
+
+    from snap_procure.tools.catalog import CatalogIndex
+
+    index = CatalogIndex(os.path.join("data", "catalog.sqlite"))
+    if args.command == "build":
+        from snap_procure.tools.history import PriceHistory
+
+        added = index.import_history(PriceHistory(os.path.join("data", "history")))
+        added += index.import_csv(os.path.join("data", "procurement_*.csv"))
+        print(f"📚 Catalog updated with {added} products ({len(index)} indexed)")
+        return
+
+    products = index.search(
+        args.query, stores=args.store, min_price=args.min_price, max_price=args.max_price, limit=args.limit
+    )
+    if not products:
+        print("No matching products in the catalog.")
+    for product in products:
+        print(f"{product['price']:>12}  {product['store']:<12} {product['name'][:70]}  (seen {product['last_seen'][:10]})")
+        print(f"{'':>12}  {product['url']}")
+
+def _sample_inputs():
+    """Kickoff inputs for training and testing: one first message with no history yet."""
+    from snap_procure.memory import ConversationMemory
+
+    return {
+        "user_request": "What's the cheapest 2x4x8 lumber I can get delivered by tomorrow?",
+        "conversation": ConversationMemory().render()
+    }
+
+def train():
+    """
+    Train the crew for a given number of iterations.
+    """
+    from snap_procure.crew import SnapProcure
+
+    try:
+        SnapProcure().crew().train(
+            n_iterations=int(sys.argv[1]),
+            filename=sys.argv[2],
+            inputs=_sample_inputs()
+        )
+
+    except Exception as e:
+        raise Exception(f"An error occurred while training the crew: {e}")
+
 # For backward compatibility
 def replay():
     """Replay the crew execution from a specific task."""
+    from snap_procure.crew import SnapProcure
+
     try:
         if len(sys.argv) < 2:
             print("Please provide a task ID to replay")
@@ -80,16 +221,13 @@ def test():
     """
     Test the crew execution and returns the results.
     """
-    inputs = {
-        "topic": "AI LLMs",
-        "current_year": str(datetime.now().year)
-    }
+    from snap_procure.crew import SnapProcure
 
     try:
         SnapProcure().crew().test(
             n_iterations=int(sys.argv[1]),
             eval_llm=sys.argv[2],
-            inputs=inputs
+            inputs=_sample_inputs()
         )
 
     except Exception as e:
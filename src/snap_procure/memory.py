@@ -0,0 +1,180 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional
+import os
+import re
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+_PRICE = re.compile(r'\$\s?\d[\d,]*(?:\.\d{2})?')
+_MARKUP = re.compile(r'[*_`#>]+')
+# Words that point back at earlier turns ("is it cheaper at lowe's?", "price of those")
+_REFERENCE_WORDS = {
+    'it', 'its', 'they', 'them', 'that', 'this', 'these', 'those', 'one', 'ones', 'other', 'same',
+    'again', 'instead', 'else', 'too', 'also', 'more', 'cheaper', 'previous', 'above',
+}
+# Fragments that only make sense as a continuation ("and at lowe's?", "what about 20?")
+_CONTINUATION = re.compile(r"^\W*(?:and|or|but|so|then|what about|how about)\b")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English prose)."""
+    return (len(text) + 3) // 4
+
+
+def refers_back(request: str) -> bool:
+    """Whether a request leans on earlier turns rather than standing on its own."""
+    text = request.lower()
+    return bool(_CONTINUATION.search(text) or _REFERENCE_WORDS.intersection(re.findall(r"[a-z]+", text)))
+
+
+def _clip_tokens(text: str, max_tokens: int) -> str:
+    """Beginning of ``text`` within ``max_tokens`` estimated tokens."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return text[:max(0, max_tokens * 4 - 2)].rstrip() + ' …'
+
+
+def _clip(text: str, max_words: int) -> str:
+    words = text.split()
+    if len(words) <= max_words:
+        return ' '.join(words)
+    return ' '.join(words[:max_words]) + ' …'
+
+
+def _first_sentence(text: str) -> str:
+    """First line of prose, skipping markdown tables, headings and rules."""
+    for line in text.splitlines():
+        line = _MARKUP.sub('', line).strip()
+        if not line or line.startswith('|') or set(line) <= set('-=| :'):
+            continue
+        return _SENTENCE_END.split(line, maxsplit=1)[0]
+    return ''
+
+
+@dataclass
+class Turn:
+    """One exchange of the conversation."""
+    user: str
+    assistant: str
+
+
+def summarize_turn(turn: Turn) -> str:
+    """
+    One-line extractive summary of a turn.
+
+    Keeps the gist of the question, the first sentence of the answer and
+    the prices quoted in it, which is what follow-ups ("the cheaper one",
+    "what about 20 of them?") refer back to. No LLM call, so rolling turns
+    into the summary adds no latency or cost.
+    """
+    asked = _clip(_first_sentence(turn.user) or turn.user, 25)
+    answered = _clip(_first_sentence(turn.assistant), 30)
+    line = f"Asked: {asked}"
+    if answered:
+        line += f" → Answered: {answered}"
+    prices = list(dict.fromkeys(_PRICE.findall(turn.assistant)))[:4]
+    if prices:
+        line += f" (quoted {', '.join(prices)})"
+    return line
+
+
+class ConversationMemory:
+    """
+    Bounded memory of a chat session.
+
+    The last ``max_turns`` exchanges are kept verbatim, each answer clipped
+    to its share of ``token_budget`` (a long ranked table keeps its
+    beginning); older ones are rolled into a running summary of one line
+    per turn. When the context is still over budget, more turns are rolled
+    and then the oldest summary lines dropped, so the prompt the crew sees
+    stays the same size however long the session runs.
+    """
+
+    def __init__(
+        self,
+        max_turns: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        summarizer: Callable[[Turn], str] = summarize_turn,
+    ):
+        """
+        Initialize the memory.
+
+        Args:
+            max_turns: Exchanges kept verbatim (env MEMORY_TURNS, default 3)
+            token_budget: Upper bound of the rendered context in estimated tokens
+                (env MEMORY_TOKENS, default 1200)
+            summarizer: Turns an exchange into its summary line
+        """
+        self.max_turns = max_turns if max_turns is not None else int(os.environ.get('MEMORY_TURNS', 3))
+        self.token_budget = token_budget if token_budget is not None else int(os.environ.get('MEMORY_TOKENS', 1200))
+        self.summarizer = summarizer
+        self.turns: Deque[Turn] = deque()
+        self.summary: Deque[str] = deque()
+        self.summarized = 0
+        self.dropped = 0
+
+    def add(self, user: str, assistant):
+        """Record an exchange and shrink the context back into the budget."""
+        # Verbatim turns share the budget with (at least) one turn's worth of summary
+        share = self.token_budget // (self.max_turns + 1)
+        self.turns.append(Turn(_clip_tokens(str(user).strip(), share // 2), _clip_tokens(str(assistant).strip(), share)))
+        while len(self.turns) > self.max_turns:
+            self._roll()
+        self._fit()
+
+    def _roll(self):
+        self.summary.append(self.summarizer(self.turns.popleft()))
+        self.summarized += 1
+
+    def _fit(self):
+        # Older verbatim turns go first, then the summary's oldest lines
+        while self.tokens > self.token_budget and len(self.turns) > 1:
+            self._roll()
+        while self.tokens > self.token_budget and self.summary:
+            self.summary.popleft()
+            self.dropped += 1
+
+    def _render_lines(self) -> List[str]:
+        lines = []
+        if self.summary or self.dropped:
+            lines.append("Earlier in this conversation:")
+            if self.dropped:
+                lines.append(f"- ({self.dropped} earlier exchanges omitted)")
+            lines.extend(f"- {line}" for line in self.summary)
+        if self.turns:
+            lines.append("Latest exchanges:")
+            for turn in self.turns:
+                lines.append(f"User: {turn.user}")
+                lines.append(f"Assistant: {turn.assistant}")
+        return lines
+
+    def render(self) -> str:
+        """The conversation as prompt context (summary first, then the latest turns)."""
+        lines = self._render_lines()
+        return '\n'.join(lines) if lines else "This is the first message of the conversation."
+
+    def __len__(self) -> int:
+        """Exchanges so far, verbatim or summarized."""
+        return len(self.turns) + self.summarized
+
+    @property
+    def tokens(self) -> int:
+        """Estimated tokens of the rendered context."""
+        return estimate_tokens('\n'.join(self._render_lines()))
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Verbatim turns, summarized turns and estimated context size."""
+        return {
+            'turns': len(self.turns),
+            'summarized': self.summarized,
+            'dropped': self.dropped,
+            'tokens': self.tokens,
+        }
+
+    def clear(self):
+        """Forget the whole conversation."""
+        self.turns.clear()
+        self.summary.clear()
+        self.summarized = 0
+        self.dropped = 0
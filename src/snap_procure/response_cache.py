@@ -0,0 +1,130 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+from .memory import refers_back
+from .tools.cache import normalize_query
+from .tools.metrics import metrics
+
+CONFIG_DIR = Path(__file__).resolve().parent / 'config'
+
+
+def config_hash(config_dir: Path = CONFIG_DIR) -> str:
+    """Hash of the agents/tasks YAML, so editing a prompt invalidates cached answers."""
+    digest = hashlib.sha256()
+    for name in ('agents.yaml', 'tasks.yaml'):
+        path = config_dir / name
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def default_model() -> str:
+    """Model id the crew runs with when none is passed explicitly."""
+    return os.environ.get('MODEL') or os.environ.get('OPENAI_MODEL_NAME') or 'default'
+
+
+class ResponseCache:
+    """
+    In-process cache of crew answers.
+
+    Answers are keyed on the normalized request text, any extra kickoff
+    inputs, the model id and a hash of the agents/tasks config, expire
+    after ``ttl`` seconds and are evicted least recently used beyond
+    ``max_entries``. The ``conversation`` input only counts for requests
+    that refer back to it, so a question repeated later in a chat is
+    still answered from the cache.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        config_dir: Path = CONFIG_DIR,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an answer stays valid (env RESPONSE_CACHE_TTL, default 1 hour)
+            max_entries: Answers kept before eviction (env RESPONSE_CACHE_SIZE, default 256)
+            config_dir: Directory holding agents.yaml and tasks.yaml
+        """
+        self.ttl = ttl if ttl is not None else float(os.environ.get('RESPONSE_CACHE_TTL', 3600))
+        self.max_entries = max_entries if max_entries is not None else int(os.environ.get('RESPONSE_CACHE_SIZE', 256))
+        self.config_hash = config_hash(config_dir)
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, request: str, model: Optional[str] = None, inputs: Optional[Dict] = None) -> str:
+        """Cache key for a request."""
+        text = normalize_query(request).rstrip('?.! ')
+        inputs = dict(inputs or {})
+        # A self-contained question gets the same answer whatever was said
+        # before it; a follow-up means something else in another conversation
+        if not refers_back(text):
+            inputs.pop('conversation', None)
+        context = json.dumps(inputs, sort_keys=True, default=str) if inputs else ''
+        raw = '\x1f'.join([text, context, model or default_model(), self.config_hash])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, request: str, model: Optional[str] = None, inputs: Optional[Dict] = None) -> Optional[Any]:
+        """Return the cached answer for a request, or None."""
+        key = self.key(request, model, inputs)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[1] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                metrics.inc('response_cache_misses_total')
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        metrics.inc('response_cache_hits_total')
+        return entry[0]
+
+    def set(self, request: str, answer: Any, model: Optional[str] = None, inputs: Optional[Dict] = None):
+        """Store the answer to a request."""
+        key = self.key(request, model, inputs)
+        with self._lock:
+            self._entries[key] = (answer, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def kickoff(self, crew, request: str, model: Optional[str] = None, inputs: Optional[Dict] = None) -> Any:
+        """
+        Answer a request from the cache or by running the crew.
+
+        Args:
+            crew: The crew to run on a miss
+            request: The user's request
+            model: Model id the crew runs with
+            inputs: Extra kickoff inputs besides ``user_request``
+
+        Returns:
+            The crew's answer
+        """
+        answer = self.get(request, model, inputs)
+        if answer is not None:
+            return answer
+        answer = crew.kickoff(inputs={'user_request': request, **(inputs or {})})
+        self.set(request, answer, model, inputs)
+        return answer
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+    def clear(self):
+        """Drop every cached answer."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,314 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import os
+import re
+from .memory import refers_back
+from .tools.cache import normalize_query
+from .tools.metrics import metrics
+from .tools.stores import STORE_ADAPTERS, store_aliases
+
+# A lookup must ask for a price or availability...
+_LOOKUP_CUE = re.compile(
+    r"\b(price|prices|pricing|priced|cost|costs|how much|in stock|available|availability|"
+    r"carry|carries|sell|sells|cheapest)\b"
+)
+# ...and must not ask for judgement, planning or anything spanning several products
+_OPEN_ENDED = re.compile(
+    r"\b(compare|comparison|versus|vs|recommend\w*|suggest\w*|should|which|why|best|better|"
+    r"alternative\w*|instead|plan|planning|project|estimate|quote|budget|order|purchase|buy|"
+    r"help|need|explain|difference|and|or|also)\b|[,;]"
+    # "what's the cost to build a deck", "what about lowe's", "how much lumber to frame a wall"
+    r"|\b(?:costs?|price) to\b|\b(?:what|how) about\b|\bhow (?:much|many)\b.*\bto\b"
+)
+# "what did we see for...", "have we seen..." ask about earlier results, answered from the catalog
+_HISTORY_CUE = re.compile(
+    r"\b(?:did we see|have we seen|we(?:'ve)? seen|we saw|did we find|have we found|seen before|"
+    r"last time|previously|so far|on file|in the catalog)\b"
+)
+_PRICE_RANGE = re.compile(
+    r"(?:\b(?:between|from)\s+)?\$\s?(\d+(?:\.\d+)?)\s*(?:-|to|and)\s*\$?\s?(\d+(?:\.\d+)?)"
+)
+_PRICE_MAX = re.compile(r"\b(?:under|below|less than|cheaper than|up to|at most|max)\s+\$\s?(\d+(?:\.\d+)?)")
+_PRICE_MIN = re.compile(r"\b(?:over|above|more than|at least|min)\s+\$\s?(\d+(?:\.\d+)?)")
+_QUANTITY = re.compile(r"\b(?:for|qty|quantity)\s+(\d+)\b|\b(\d+)\s+(?:pcs|pieces|units|ea|each)\b")
+_DELIVERY_DAYS = re.compile(r"\b(?:within|in|under)\s+(\d+)\s+(?:business\s+)?days?\b")
+_DELIVERY_NAMED = {
+    re.compile(r"\b(?:same[\s-]day|(?:by|delivered|arriving) today)\b"): 0,
+    re.compile(r"\b(?:next[\s-]day|(?:by|delivered|arriving) tomorrow|tomorrow)\b"): 1,
+}
+_FILLER_PHRASES = re.compile(
+    r"\b(?:in stock|right now|at the moment|go for|do you|can you|could you|tell me|look up|check)\b"
+)
+_FILLER_WORDS = {
+    'what', "what's", 'whats', 'is', 'are', 'was', 'the', 'a', 'an', 'of', 'for', 'how', 'much',
+    'does', 'do', 'price', 'prices', 'pricing', 'priced', 'cost', 'costs', 'current', 'currently',
+    'available', 'availability', 'have', 'has', 'carry', 'carries', 'sell', 'sells', 'at', 'from',
+    'on', 'please', 'me', 'there', 'any', 'now', 'today', 'cheapest', 'get', 'it', 'they', 'i',
+    'delivered', 'delivery', 'shipped', 'shipping',
+}
+# Left over from phrasing rather than naming a product: a product needs one other word
+_NON_PRODUCT_WORDS = {
+    'to', 'about', 'with', 'without', 'by', 'in', 'into', 'of', 'off', 'up', 'out', 'over', 'than',
+    'this', 'that', 'these', 'those', 'them', 'one', 'ones', 'other', 'others', 'same', 'some',
+    'something', 'anything', 'thing', 'things', 'stuff', 'more', 'less', 'again', 'too', 'else',
+    'here', 'build', 'make', 'need', 'use', 'buy', 'find', 'see', 'ship', 'install', 'like', 'want',
+    'you', 'we', 'us', 'my', 'our', 'your',
+}
+_MAX_WORDS = 20
+_MAX_PRODUCT_WORDS = 8
+
+
+@dataclass
+class LookupIntent:
+    """A simple price/availability question the router can answer without the crew."""
+    product: str
+    stores: List[str] = field(default_factory=list)
+    quantity: int = 1
+    max_delivery_days: Optional[int] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    # Asked about earlier results rather than current prices
+    from_catalog: bool = False
+
+
+class IntentRouter:
+    """
+    Fast path in front of the hierarchical crew.
+
+    Requests that are plain price or availability lookups for a single
+    product ("what's the price of 2x4x8 at Lowe's?") are answered straight
+    from the scraper and a template, skipping manager planning and every
+    LLM round trip; questions about earlier results ("what did we see for
+    pressure-treated 2x4s under $10?") are answered from the local catalog
+    without contacting the retailers. Anything open-ended returns None from
+    ``route`` so the caller runs the full crew.
+    """
+
+    def __init__(
+        self,
+        scraper=None,
+        adapters: Optional[Dict[str, Any]] = None,
+        top_k: int = 3,
+        enabled: Optional[bool] = None,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            scraper: ProcurementScraper used to answer lookups; defaults to the
+                shared scraper, built on the first lookup
+            adapters: Store adapters whose names are recognised; defaults to every configured store
+            top_k: Options shown per delivery speed
+            enabled: Use the fast path at all (env FAST_PATH, default on)
+        """
+        self._scraper = scraper
+        self.top_k = top_k
+        self.enabled = enabled if enabled is not None else os.environ.get('FAST_PATH', '1') != '0'
+        self._aliases = store_aliases(adapters if adapters is not None else STORE_ADAPTERS)
+        self._store_pattern = re.compile(
+            r"\b(?:at|from|on)?\s*(" + '|'.join(
+                re.escape(alias) for alias in sorted(self._aliases, key=len, reverse=True)
+            ) + r")(?:'s)?(?=\W|$)"
+        )
+        self.routed = 0
+        self.fallbacks = 0
+
+    @property
+    def scraper(self):
+        if self._scraper is None:
+            from .tools import get_scraper
+            self._scraper = get_scraper()
+        return self._scraper
+
+    def classify(self, request: str, follow_up: bool = False) -> Optional[LookupIntent]:
+        """
+        Recognise a simple lookup.
+
+        Args:
+            request: The user's request
+            follow_up: The conversation has earlier turns, so a request that
+                refers back to them ("is it cheaper at lowe's?") needs the crew
+
+        Returns:
+            Optional[LookupIntent]: The lookup, or None when the request needs the crew
+        """
+        text = normalize_query(request).rstrip('?.! ')
+        if follow_up and refers_back(text):
+            return None
+        from_catalog = bool(_HISTORY_CUE.search(text))
+        if len(text.split()) > _MAX_WORDS or not (from_catalog or _LOOKUP_CUE.search(text)):
+            return None
+        text = _HISTORY_CUE.sub(' ', text)
+
+        stores = []
+        for match in self._store_pattern.finditer(text):
+            store = self._aliases[match.group(1)]
+            if store not in stores:
+                stores.append(store)
+        text = self._store_pattern.sub(' ', text)
+
+        # Price bounds first: "between $3 and $6" is not an open-ended "and"
+        min_price = max_price = None
+        match = _PRICE_RANGE.search(text)
+        if match:
+            min_price, max_price = sorted((float(match.group(1)), float(match.group(2))))
+            text = text[:match.start()] + ' ' + text[match.end():]
+        for pattern in (_PRICE_MAX, _PRICE_MIN):
+            match = pattern.search(text)
+            if match:
+                if pattern is _PRICE_MAX:
+                    max_price = float(match.group(1))
+                else:
+                    min_price = float(match.group(1))
+                text = text[:match.start()] + ' ' + text[match.end():]
+
+        # Store names may contain words such as "and", so only veto on what is left
+        if _OPEN_ENDED.search(text):
+            return None
+
+        quantity = 1
+        match = _QUANTITY.search(text)
+        if match:
+            quantity = int(match.group(1) or match.group(2))
+            text = text[:match.start()] + ' ' + text[match.end():]
+
+        max_delivery_days = None
+        match = _DELIVERY_DAYS.search(text)
+        if match:
+            max_delivery_days = int(match.group(1))
+            text = text[:match.start()] + ' ' + text[match.end():]
+        for pattern, days in _DELIVERY_NAMED.items():
+            if pattern.search(text):
+                max_delivery_days = days
+                text = pattern.sub(' ', text)
+
+        text = _FILLER_PHRASES.sub(' ', text)
+        words = [word for word in re.findall(r"[\w/.\"'-]+", text) if word.strip("'\".-") not in _FILLER_WORDS]
+        product = ' '.join(word.strip("'\"") for word in words).strip(' .-')
+        if not product or len(product.split()) > _MAX_PRODUCT_WORDS:
+            return None
+        if all(word in _NON_PRODUCT_WORDS or not re.search(r'[a-z0-9]', word) for word in product.split()):
+            return None
+
+        return LookupIntent(product, stores, quantity, max_delivery_days, min_price, max_price, from_catalog)
+
+    def answer(self, intent: LookupIntent) -> Optional[str]:
+        """
+        Answer a lookup from live scrape results (or the catalog for ``from_catalog`` lookups).
+
+        Returns:
+            Optional[str]: Templated answer, or None when nothing usable was found
+        """
+        if intent.from_catalog:
+            return self.answer_from_catalog(intent)
+
+        from .tools.pricing import frame_cents
+        from .tools.ranking import format_ranked_table, rank_products
+
+        df = self.scraper.scrape_all_stores(intent.product, stores=intent.stores or None)
+        if not df.empty and (intent.min_price is not None or intent.max_price is not None):
+            cents = frame_cents(df, 'price')
+            if intent.min_price is not None:
+                df = df[cents >= round(intent.min_price * 100)]
+            if intent.max_price is not None:
+                df = df[cents <= round(intent.max_price * 100)]
+        ranked = rank_products(df, intent.quantity, intent.max_delivery_days, self.top_k)
+        if ranked.empty:
+            return None
+
+        lines = [
+            f"Here are the cheapest options for **{intent.product}** at {self._describe(intent)}:",
+            '',
+            format_ranked_table(ranked),
+        ]
+        missing = [
+            name for name, status in df.attrs.get('store_status', {}).items()
+            if status['status'] in ('timeout', 'error')
+        ]
+        if missing:
+            lines += ['', f"⚠️ No live results from {', '.join(missing)} right now."]
+        lines += ['', "Prices are live from the retailer sites. Ask me to compare or recommend options for a full analysis."]
+        return '\n'.join(lines)
+
+    def answer_from_catalog(self, intent: LookupIntent) -> Optional[str]:
+        """
+        Answer a question about earlier results from the local catalog.
+
+        Returns:
+            Optional[str]: Templated answer, or None when the catalog has no match
+        """
+        products = self.scraper.catalog.search(
+            intent.product,
+            stores=intent.stores or None,
+            min_price=intent.min_price,
+            max_price=intent.max_price,
+            max_delivery_days=intent.max_delivery_days,
+            limit=self.top_k * 3,
+        )
+        if not products:
+            return None
+
+        total = intent.quantity > 1
+        lines = [
+            f"Here is what earlier searches found for **{intent.product}** at {self._describe(intent)}:",
+            '',
+            '| Store | Product | Price |' + (' Total |' if total else '') + ' Last seen |',
+            '|---|---|---|' + ('---|' if total else '') + '---|',
+        ]
+        for product in products:
+            cents = product['price_cents']
+            row = f"| {product['store']} | [{product['name'][:70]}]({product['url']}) | {product['price']} |"
+            if total:
+                row += f" ${cents * intent.quantity / 100:,.2f} |" if cents is not None else ' – |'
+            lines.append(row + f" {product['last_seen'][:10]} |")
+        lines += ['', "These are the last prices we saw, not live ones. Ask for current prices to check the retailers again."]
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _describe(intent: LookupIntent) -> str:
+        """Stores and constraints of a lookup, e.g. "Lowe's (delivery within 2 days)"."""
+        where = ' and '.join(intent.stores) if intent.stores else 'all stores'
+        constraints = []
+        if intent.quantity > 1:
+            constraints.append(f"totals for {intent.quantity} units")
+        if intent.max_delivery_days is not None:
+            constraints.append(f"delivery within {intent.max_delivery_days} days")
+        if intent.min_price is not None and intent.max_price is not None:
+            constraints.append(f"${intent.min_price:g}–${intent.max_price:g}")
+        elif intent.max_price is not None:
+            constraints.append(f"under ${intent.max_price:g}")
+        elif intent.min_price is not None:
+            constraints.append(f"over ${intent.min_price:g}")
+        return where + (f" ({', '.join(constraints)})" if constraints else '')
+
+    def route(self, request: str, follow_up: bool = False) -> Optional[str]:
+        """
+        Answer the request on the fast path if it is a simple lookup.
+
+        Args:
+            request: The user's request
+            follow_up: The conversation has earlier turns (see ``classify``)
+
+        Returns:
+            Optional[str]: The answer, or None when the caller should run the crew
+        """
+        intent = self.classify(request, follow_up) if self.enabled else None
+        if intent is not None:
+            try:
+                with metrics.span('fast_path.answer'):
+                    reply = self.answer(intent)
+            except Exception as e:
+                print(f"⚠️ Fast path failed, falling back to the crew: {e}")
+                reply = None
+            if reply is not None:
+                self.routed += 1
+                metrics.inc('fast_path_total', outcome='routed')
+                return reply
+        self.fallbacks += 1
+        metrics.inc('fast_path_total', outcome='fallback')
+        return None
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Requests answered on the fast path and requests handed to the crew."""
+        return {'routed': self.routed, 'fallbacks': self.fallbacks}
@@ -0,0 +1,30 @@
+from typing import TYPE_CHECKING, Optional
+import threading
+
+if TYPE_CHECKING:
+    from .scraper import ProcurementScraper
+
+_scraper: Optional['ProcurementScraper'] = None
+_scraper_lock = threading.Lock()
+
+
+def get_scraper() -> 'ProcurementScraper':
+    """
+    Process-wide scraper, built on first use.
+
+    Constructing it imports pandas, BeautifulSoup and pyarrow and creates the
+    ``data`` directory, so none of that happens until something scrapes.
+    """
+    global _scraper
+    if _scraper is None:
+        with _scraper_lock:
+            if _scraper is None:
+                from .scraper import ProcurementScraper
+                _scraper = ProcurementScraper(output_dir='data')
+    return _scraper
+
+
+def flush_scraper():
+    """Write the shared scraper's buffered price history, if it has been built."""
+    if _scraper is not None:
+        _scraper.history.flush()
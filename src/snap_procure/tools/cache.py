@@ -0,0 +1,224 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from .metrics import metrics
+
+# Unit spellings folded to a single canonical "<number> <unit>" so
+# "2 x 4 x 8 feet", "2x4x8 ft" and "2x4x8ft" share a cache entry
+_UNIT_ALIASES = [
+    (re.compile(r'(\d)\s*(?:"|inches|inch|in\.?)(?!\w)'), r'\1 in'),
+    (re.compile(r"(\d)\s*(?:'|feet|foot|ft\.?)(?!\w)"), r'\1 ft'),
+    (re.compile(r'(\d)\s*(?:gallons|gallon|gal\.?)(?!\w)'), r'\1 gal'),
+    (re.compile(r'(\d)\s*(?:pounds|pound|lbs\.?|lb\.?)(?!\w)'), r'\1 lb'),
+]
+_DIMENSION_SEPARATOR = re.compile(r'(\d)\s*(?:x|by|×)\s*(?=\d)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query so trivially different spellings share a key.
+
+    Lowercases, collapses whitespace, joins dimensions ("2 x 4 x 8" -> "2x4x8")
+    and folds unit spellings, with or without a space after the number
+    ("8 feet", "8ft", "8 ft.", "8'" -> "8 ft").
+    """
+    text = _WHITESPACE.sub(' ', query.lower()).strip()
+    text = _DIMENSION_SEPARATOR.sub(r'\1x', text)
+    for pattern, replacement in _UNIT_ALIASES:
+        text = pattern.sub(replacement, text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+class ScrapeCache:
+    """
+    Disk-backed cache of store search results.
+
+    Entries are keyed by store and normalized query and kept in a SQLite file.
+    Each store has its own TTL; the cache is bounded to ``max_entries`` and
+    evicts least recently used entries. With ``stale_ttl`` set, expired
+    entries younger than ``ttl + stale_ttl`` are still returned immediately
+    while a background refresh replaces them.
+    """
+
+    def __init__(
+        self,
+        path: str = 'data/scrape_cache.sqlite',
+        default_ttl: float = 6 * 3600,
+        store_ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 5000,
+        stale_ttl: float = 0,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite file holding the cache
+            default_ttl: Seconds an entry stays fresh when the store has no TTL of its own
+            store_ttls: Per-store TTLs in seconds, keyed by store name
+            max_entries: Maximum number of cached searches before LRU eviction
+            stale_ttl: Extra seconds an expired entry may be served while it is refreshed
+        """
+        self.path = path
+        self.default_ttl = default_ttl
+        self.store_ttls = store_ttls or {}
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._refresher: Optional[ThreadPoolExecutor] = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    store TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (store, query)
+                )
+                """
+            )
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_search_cache_accessed ON search_cache (accessed_at)'
+            )
+
+    @contextmanager
+    def _connect(self):
+        # A connection per operation keeps the cache safe to use from the fan-out threads
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def ttl_for(self, store: str) -> float:
+        """TTL in seconds for a store."""
+        return self.store_ttls.get(store, self.default_ttl)
+
+    def _lookup(self, store: str, query: str) -> Optional[Tuple[List[Dict], float]]:
+        # Products and the epoch time they were scraped
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT payload, fetched_at FROM search_cache WHERE store = ? AND query = ?',
+                (store, query),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                'UPDATE search_cache SET accessed_at = ? WHERE store = ? AND query = ?',
+                (time.time(), store, query),
+            )
+        return json.loads(row[0]), row[1]
+
+    def set(self, store: str, query: str, products: List[Dict], fetched_at: Optional[float] = None):
+        """Store the products found for a search, evicting old entries if needed."""
+        key = normalize_query(query)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?, ?)',
+                (store, key, json.dumps(products), fetched_at or now, now),
+            )
+            count = conn.execute('SELECT COUNT(*) FROM search_cache').fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    """
+                    DELETE FROM search_cache WHERE rowid IN (
+                        SELECT rowid FROM search_cache ORDER BY accessed_at ASC LIMIT ?
+                    )
+                    """,
+                    (count - self.max_entries,),
+                )
+
+    def get(self, store: str, query: str) -> Optional[List[Dict]]:
+        """Return fresh cached products for a search, or None."""
+        cached = self._lookup(store, normalize_query(query))
+        if cached is None or time.time() - cached[1] > self.ttl_for(store):
+            return None
+        return cached[0]
+
+    def get_or_fetch(
+        self, store: str, query: str, fetch: Callable[[str], List[Dict]]
+    ) -> Tuple[List[Dict], float, bool]:
+        """
+        Return cached products for a search, fetching them on a miss.
+
+        Args:
+            store: Store name
+            query: The product searched for
+            fetch: Callable that scrapes the store for ``query``
+
+        Returns:
+            Tuple[List[Dict], float, bool]: The products, the epoch time they
+            were scraped (for a cache hit, the time of the original scrape) and
+            whether this call scraped them
+        """
+        key = normalize_query(query)
+        cached = self._lookup(store, key)
+        ttl = self.ttl_for(store)
+
+        if cached is not None:
+            products, fetched_at = cached
+            age = time.time() - fetched_at
+            if age <= ttl:
+                self.hits += 1
+                metrics.inc('scrape_cache_hits_total', store=store)
+                return products, fetched_at, False
+            if age <= ttl + self.stale_ttl:
+                self.stale_hits += 1
+                metrics.inc('scrape_cache_stale_hits_total', store=store)
+                self._refresh_in_background(store, query, key, fetch)
+                return products, fetched_at, False
+
+        self.misses += 1
+        metrics.inc('scrape_cache_misses_total', store=store)
+        products = fetch(query)
+        fetched_at = time.time()
+        # Empty results are usually a blocked or failed request, so they aren't cached
+        if products:
+            self.set(store, query, products, fetched_at)
+        return products, fetched_at, True
+
+    def _refresh_in_background(self, store: str, query: str, key: str, fetch: Callable[[str], List[Dict]]):
+        with self._lock:
+            if (store, key) in self._refreshing:
+                return
+            self._refreshing.add((store, key))
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-refresh')
+
+        def refresh():
+            try:
+                products = fetch(query)
+                if products:
+                    self.set(store, query, products)
+            except Exception as e:
+                print(f"⚠️ Background refresh failed for {store}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard((store, key))
+
+        self._refresher.submit(refresh)
+
+    def clear(self):
+        """Remove every cached search."""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM search_cache')
@@ -0,0 +1,341 @@
+from contextlib import contextmanager
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+import glob
+import os
+import re
+import sqlite3
+import time
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from .history import PriceHistory
+
+# Spellings of the same material or treatment folded into one short token,
+# so "Pressure-Treated", "pressure treated" and "PT" all match each other
+_SYNONYMS = [
+    (re.compile(r'\bpressure[\s-]*treated\b|\bp\.?t\.?(?=\s|$)'), 'pt'),
+    (re.compile(r'\bkiln[\s-]*dried\b|\bk\.?d\.?(?=\s|$)'), 'kd'),
+    (re.compile(r'\bsouthern[\s-]*yellow[\s-]*pine\b'), 'syp'),
+    (re.compile(r'\bdoug(?:las)?[\s-]*fir\b'), 'df'),
+    (re.compile(r'\bspruce[\s-]*pine[\s-]*fir\b'), 'spf'),
+    (re.compile(r'\boriented[\s-]*strand[\s-]*board\b'), 'osb'),
+    (re.compile(r'\bground[\s-]*contact\b'), 'gc'),
+]
+# "2 in. x 4 in. x 8 ft." / "2-in x 4-in x 8-ft" / "2 x 4 x 8'" -> "2x4x8"
+_NUMBER = r'\d+(?:\.\d+|/\d+)?'
+_DIMENSION_JOIN = re.compile(
+    rf'({_NUMBER})[\s-]*(?:in\b\.?|inch(?:es)?\b|ft\b\.?|feet\b|foot\b|"|\')?\s*(?:x|by|×)\s*(?=\d)'
+)
+# Lumber grades ("#2 Prime") are kept apart from dimensions and counts
+_GRADE = re.compile(r'#\s?(\d)\b')
+_TOKEN = re.compile(rf'{_NUMBER}(?:x{_NUMBER})*|[a-z]+\d*')
+_STOPWORDS = {
+    'a', 'an', 'and', 'the', 'of', 'for', 'with', 'in', 'inch', 'inches', 'ft', 'feet', 'foot',
+    'x', 'by', 'to', 'on', 'at', 'or', 'per', 'each', 'ea', 'pack', 'pk',
+}
+
+
+def catalog_tokens(text: str, expand: bool = False) -> List[str]:
+    """
+    Normalized search tokens of a product name or query.
+
+    Dimensions are joined ("2 in. x 4 in. x 8 ft." -> ``2x4x8``), material
+    and treatment spellings folded (``pt``, ``kd``, ``syp``, ``df``, ...),
+    units and stop words dropped and plurals stemmed ("studs" -> ``stud``,
+    "2x4s" -> ``2x4``).
+
+    Args:
+        text: Product name or search text
+        expand: Also emit the cross-section of a full dimension (``2x4x8`` ->
+            ``2x4``), so a name matches searches that leave out the length
+
+    Returns:
+        List[str]: Tokens in order of appearance, without duplicates
+    """
+    text = _DIMENSION_JOIN.sub(r'\1x', text.lower())
+    text = _GRADE.sub(r' grade\1 ', text)
+    for pattern, token in _SYNONYMS:
+        text = pattern.sub(f' {token} ', text)
+
+    tokens = []
+    for token in _TOKEN.findall(text):
+        if token in _STOPWORDS or (len(token) == 1 and not token.isdigit()):
+            continue
+        if token.isalpha() and len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+        if expand and token.count('x') >= 2 and token[0].isdigit():
+            tokens.append('x'.join(token.split('x')[:2]))
+    return list(dict.fromkeys(tokens))
+
+
+def _format_cents(cents: Optional[int]) -> str:
+    return f'${cents / 100:,.2f}' if cents is not None else 'Price not available'
+
+
+class CatalogIndex:
+    """
+    Local, searchable catalog of every product the scraper has seen.
+
+    Products are kept in SQLite, one row per product URL with its latest
+    price, and indexed in an FTS5 table of normalized name tokens ranked
+    with BM25. Scrapes add to it incrementally; store, price and delivery
+    filters run on indexed columns, so questions like "what did we see for
+    pressure-treated 2x4s under $10" are answered in milliseconds without
+    contacting the retailers.
+    """
+
+    def __init__(self, path: str = 'data/catalog.sqlite'):
+        """
+        Initialize the catalog.
+
+        Args:
+            path: SQLite file holding the products and their search index
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS products (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT NOT NULL UNIQUE,
+                    store TEXT NOT NULL COLLATE NOCASE,
+                    name TEXT NOT NULL,
+                    price_cents INTEGER,
+                    delivery_speed TEXT,
+                    delivery_days REAL,
+                    query TEXT,
+                    seen_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_products_store_price ON products (store, price_cents)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_products_price ON products (price_cents)')
+            # Tokens are normalized in Python; FTS5 only has to keep "2x4x8" and "1/2" whole
+            conn.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS products_fts
+                USING fts5(tokens, tokenize="unicode61 tokenchars './'")
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        # A connection per operation so scrapes on several threads can add products
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add_products(self, products: Iterable[Dict]) -> int:
+        """
+        Add or update products.
+
+        Each product needs ``store``, ``name`` and ``url``; ``price_cents``,
+        ``delivery_speed``, ``delivery_days``, ``query`` and ``seen_at``
+        (epoch seconds, default now) are optional. An older observation
+        never overwrites a newer one.
+
+        Returns:
+            int: Products inserted or updated
+        """
+        now = time.time()
+        changed = 0
+        with self._connect() as conn:
+            for product in products:
+                if not product.get('url') or not product.get('name'):
+                    continue
+                row = conn.execute(
+                    """
+                    INSERT INTO products (url, store, name, price_cents, delivery_speed, delivery_days, query, seen_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (url) DO UPDATE SET
+                        store = excluded.store, name = excluded.name, price_cents = excluded.price_cents,
+                        delivery_speed = excluded.delivery_speed, delivery_days = excluded.delivery_days,
+                        query = excluded.query, seen_at = excluded.seen_at
+                    WHERE excluded.seen_at >= products.seen_at
+                    RETURNING id
+                    """,
+                    (
+                        product['url'], product['store'], product['name'], product.get('price_cents'),
+                        product.get('delivery_speed'), product.get('delivery_days'), product.get('query'),
+                        product.get('seen_at') or now,
+                    ),
+                ).fetchone()
+                if row is None:
+                    continue
+                conn.execute(
+                    'INSERT OR REPLACE INTO products_fts (rowid, tokens) VALUES (?, ?)',
+                    (row[0], ' '.join(catalog_tokens(product['name'], expand=True))),
+                )
+                changed += 1
+        return changed
+
+    def add(self, df: 'pd.DataFrame', query: Optional[str] = None) -> int:
+        """
+        Add the products of one scrape.
+
+        Args:
+            df: Products as returned by ``ProcurementScraper.scrape_all_stores``
+            query: The product searched for
+
+        Returns:
+            int: Products inserted or updated
+        """
+        if df.empty:
+            return 0
+        import pandas as pd
+        from .pricing import frame_cents
+
+        def value(x):
+            return None if x is None or pd.isna(x) else x
+
+        df = df.assign(
+            _cents=frame_cents(df, 'price'),
+            _seen=pd.to_datetime(df['timestamp'], errors='coerce') if 'timestamp' in df else pd.NaT,
+        )
+        products = [
+            {
+                'store': str(product['store']),
+                'name': product.get('name'),
+                'url': product.get('url'),
+                'price_cents': None if value(product['_cents']) is None else int(product['_cents']),
+                'delivery_speed': None if value(product.get('delivery_speed')) is None else str(product['delivery_speed']),
+                'delivery_days': value(product.get('delivery_days')),
+                'query': query,
+                'seen_at': None if value(product['_seen']) is None else product['_seen'].timestamp(),
+            }
+            for product in df.to_dict('records')
+        ]
+        return self.add_products(products)
+
+    def search(
+        self,
+        text: str = '',
+        stores: Optional[List[str]] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        max_delivery_days: Optional[float] = None,
+        limit: int = 10,
+    ) -> List[Dict]:
+        """
+        Search the catalog.
+
+        Products matching every token of ``text`` are ranked by BM25; when
+        none do, products matching any token are returned instead. Without
+        ``text`` the filters alone select products, cheapest first.
+
+        Args:
+            text: What to look for, e.g. "pressure treated 2x4"
+            stores: Only these stores (case-insensitive)
+            min_price: Lowest unit price in dollars
+            max_price: Highest unit price in dollars
+            max_delivery_days: Skip products known to arrive later than this
+            limit: Maximum number of products
+
+        Returns:
+            List[Dict]: Products with store, name, url, price, price_cents,
+            delivery_speed, delivery_days, last_seen and (for text searches) score
+        """
+        filters, params = [], []
+        if stores:
+            filters.append(f"p.store IN ({', '.join('?' * len(stores))})")
+            params.extend(stores)
+        if min_price is not None:
+            filters.append('p.price_cents >= ?')
+            params.append(round(min_price * 100))
+        if max_price is not None:
+            filters.append('p.price_cents <= ?')
+            params.append(round(max_price * 100))
+        if max_delivery_days is not None:
+            filters.append('(p.delivery_days IS NULL OR p.delivery_days <= ?)')
+            params.append(max_delivery_days)
+
+        columns = 'p.store, p.name, p.url, p.price_cents, p.delivery_speed, p.delivery_days, p.seen_at'
+        tokens = catalog_tokens(text)
+        with self._connect() as conn:
+            if not tokens:
+                where = f"WHERE {' AND '.join(filters)}" if filters else ''
+                rows = conn.execute(
+                    f'SELECT {columns}, NULL FROM products p {where} '
+                    f'ORDER BY p.price_cents IS NULL, p.price_cents LIMIT ?',
+                    (*params, limit),
+                ).fetchall()
+            else:
+                rows = []
+                quoted = [f'"{token}"' for token in tokens]
+                for operator in (' AND ', ' OR ') if len(tokens) > 1 else (' AND ',):
+                    rows = conn.execute(
+                        f'SELECT {columns}, bm25(products_fts) AS score '
+                        f'FROM products_fts JOIN products p ON p.id = products_fts.rowid '
+                        f"WHERE products_fts MATCH ? {''.join(' AND ' + f for f in filters)} "
+                        f'ORDER BY score, p.price_cents IS NULL, p.price_cents LIMIT ?',
+                        (operator.join(quoted), *params, limit),
+                    ).fetchall()
+                    if rows:
+                        break
+
+        return [
+            {
+                'store': store,
+                'name': name,
+                'url': url,
+                'price': _format_cents(cents),
+                'price_cents': cents,
+                'delivery_speed': speed,
+                'delivery_days': days,
+                'last_seen': datetime.fromtimestamp(seen_at).isoformat(timespec='seconds'),
+                **({'score': round(-score, 4)} if score is not None else {}),
+            }
+            for store, name, url, cents, speed, days, seen_at, score in rows
+        ]
+
+    def import_history(self, history: 'PriceHistory') -> int:
+        """Backfill from the latest prices in the price history store."""
+        import pandas as pd
+
+        df = history.latest_prices()
+        if df.empty:
+            return 0
+        return self.add_products(
+            {
+                'store': row.store,
+                'name': row.name,
+                'url': row.url,
+                'price_cents': None if pd.isna(row.price_cents) else int(row.price_cents),
+                'seen_at': row.scraped_at.timestamp(),
+            }
+            for row in df.itertuples(index=False)
+        )
+
+    def import_csv(self, pattern: str = 'data/procurement_*.csv') -> int:
+        """Backfill from earlier scrape result CSVs (``store``, ``name``, ``url``, ``price`` columns)."""
+        import pandas as pd
+
+        added = 0
+        for path in sorted(glob.glob(pattern)):
+            df = pd.read_csv(path)
+            if not {'store', 'name', 'url'} <= set(df.columns):
+                print(f"⚠️ Skipping {path}: not a scrape result")
+                continue
+            if 'timestamp' not in df:
+                df['timestamp'] = datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+            added += self.add(df)
+        return added
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM products').fetchone()[0]
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Products indexed per store."""
+        with self._connect() as conn:
+            return dict(conn.execute('SELECT store, COUNT(*) FROM products GROUP BY store ORDER BY store').fetchall())
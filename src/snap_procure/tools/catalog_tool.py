@@ -0,0 +1,64 @@
+from crewai.tools import BaseTool
+from typing import Any, List, Optional, Type
+from pydantic import BaseModel, Field
+import json
+
+# Only what the agents need; everything else stays out of the context window
+OUTPUT_FIELDS = ['store', 'name', 'price', 'delivery_days', 'last_seen', 'url']
+
+
+class SearchCatalogToolInput(BaseModel):
+    """Input schema for SearchCatalogTool."""
+    query: str = Field(..., description="What to look for, e.g. 'pressure treated 2x4'. May be empty when filtering only.")
+    stores: Optional[List[str]] = Field(
+        None, description="Only these stores (e.g. ['Home Depot']). Defaults to all stores."
+    )
+    min_price: Optional[float] = Field(None, description="Lowest unit price in dollars.")
+    max_price: Optional[float] = Field(None, description="Highest unit price in dollars.")
+    top_k: int = Field(10, description="Maximum number of products to return.")
+
+
+class SearchCatalogTool(BaseTool):
+    name: str = "Search previously seen products"
+    description: str = (
+        "Searches the local catalog of every product earlier searches found, without "
+        "contacting the retailers. Returns compact JSON with store, name, last seen price, "
+        "days to deliver, when it was seen and the product URL, best match first. Use it "
+        "for questions about what was seen before or for a quick ballpark; prices may be "
+        "out of date, so use 'Search supplier products' for current prices."
+    )
+    args_schema: Type[BaseModel] = SearchCatalogToolInput
+    scraper: Any = Field(default=None, exclude=True)
+    name_width: int = 80
+
+    def _run(
+        self,
+        query: str,
+        stores: Optional[List[str]] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        top_k: int = 10,
+    ) -> str:
+        from .stores import resolve_stores
+
+        if stores:
+            # Catalog rows carry the configured store names, however the agent spelled them
+            stores, unknown = resolve_stores(stores, self.scraper.adapters)
+            if unknown:
+                return json.dumps({
+                    'query': query,
+                    'error': f"Unknown stores {unknown}; choose from {list(self.scraper.adapters)}",
+                })
+
+        products = self.scraper.catalog.search(
+            query, stores=stores or None, min_price=min_price, max_price=max_price, limit=top_k
+        )
+        products = [
+            {**{field: product[field] for field in OUTPUT_FIELDS}, 'name': product['name'][:self.name_width]}
+            for product in products
+        ]
+        return json.dumps(
+            {'query': query, 'returned': len(products), 'products': products},
+            separators=(',', ':'),
+            ensure_ascii=False,
+        )
@@ -0,0 +1,158 @@
+from typing import Dict, List, Optional
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from .cache import normalize_query
+from .pricing import price_to_cents
+
+# Fields that make up a product's content hash; timestamps and derived
+# columns are left out so an unchanged listing always hashes the same
+HASHED_FIELDS = ('name', 'price_cents', 'delivery_text', 'delivery_price_cents')
+
+
+def _price_cents(product: Dict) -> Optional[int]:
+    # Snapshots stored before prices were kept in cents have a 'price' string
+    if 'price_cents' in product:
+        return product['price_cents']
+    return price_to_cents(product.get('price'))
+
+
+def product_hash(product: Dict) -> str:
+    """Stable content hash of the fields of a product that matter for a refresh."""
+    payload = json.dumps([product.get(field) for field in HASHED_FIELDS], separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ChangeTracker:
+    """
+    Remembers what each search returned last time so refreshes can be incremental.
+
+    Keeps HTTP validators (ETag / Last-Modified) per results page for
+    conditional requests, and a content hash per product so a refresh can
+    report only new, removed and changed products.
+    """
+
+    def __init__(self, path: str = 'data/changes.sqlite'):
+        """
+        Initialize the tracker.
+
+        Args:
+            path: SQLite file holding validators and product snapshots
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS page_validators (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS product_snapshots (
+                    store TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    product TEXT NOT NULL,
+                    PRIMARY KEY (store, query, url)
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        # A connection per operation so refreshes can run from several threads
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Request headers that let the server answer 304 Not Modified for a page."""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT etag, last_modified FROM page_validators WHERE url = ?', (url,)
+            ).fetchone()
+        headers = {}
+        if row and row[0]:
+            headers['If-None-Match'] = row[0]
+        if row and row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def save_validators(self, url: str, response):
+        """Remember a page's ETag / Last-Modified, if the server sent any."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO page_validators VALUES (?, ?, ?, ?)',
+                (url, etag, last_modified, time.time()),
+            )
+
+    def diff(self, store: str, query: str, products: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        Compare products with the previous snapshot of a search and store the new one.
+
+        Args:
+            store: Store name
+            query: The product searched for
+            products: Products returned by this scrape
+
+        Returns:
+            Dict[str, List[Dict]]: 'new', 'removed' and 'changed' products
+            ('changed' entries carry the previous price as ``previous_price_cents``)
+        """
+        key = normalize_query(query)
+        current = {product['url']: (product_hash(product), product) for product in products}
+
+        with self._connect() as conn:
+            previous = {
+                url: (content_hash, json.loads(product))
+                for url, content_hash, product in conn.execute(
+                    'SELECT url, content_hash, product FROM product_snapshots WHERE store = ? AND query = ?',
+                    (store, key),
+                )
+            }
+
+            new = [product for url, (_, product) in current.items() if url not in previous]
+            removed = [product for url, (_, product) in previous.items() if url not in current]
+            changed = [
+                {**product, 'previous_price_cents': _price_cents(previous[url][1])}
+                for url, (content_hash, product) in current.items()
+                if url in previous and previous[url][0] != content_hash
+            ]
+
+            if removed:
+                conn.executemany(
+                    'DELETE FROM product_snapshots WHERE store = ? AND query = ? AND url = ?',
+                    [(store, key, product['url']) for product in removed],
+                )
+            updates = new + changed
+            if updates:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO product_snapshots VALUES (?, ?, ?, ?, ?)',
+                    [
+                        (store, key, product['url'], current[product['url']][0],
+                         json.dumps(current[product['url']][1]))
+                        for product in updates
+                    ],
+                )
+
+        return {'new': new, 'removed': removed, 'changed': changed}
@@ -0,0 +1,157 @@
+from datetime import date
+from enum import Enum
+from typing import Optional
+import re
+import numpy as np
+import pandas as pd
+
+
+class DeliverySpeed(str, Enum):
+    """Delivery speed categories, fastest first."""
+    SAME_DAY = 'same_day'
+    NEXT_DAY = 'next_day'
+    TWO_DAY = 'two_day'
+    STANDARD = 'standard'
+
+
+# Ordered so sorting a speed column puts the fastest options first
+SPEED_DTYPE = pd.CategoricalDtype([speed.value for speed in DeliverySpeed], ordered=True)
+
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+# Patterns are compiled once and applied to a whole column at a time.
+# 'by Mon, May 20' / 'arrives may 20'
+_MONTH_DAY = re.compile(r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(\d{1,2})\b')
+# 'on 05/20' / '5/20/25'
+_SLASH_DATE = re.compile(r'\b(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?\b')
+# 'in 3-5 business days' / '2-day' / '1 week'
+_RELATIVE = re.compile(r'(\d+)(?:\s*(?:-|to)\s*(\d+))?\s*-?\s*(business\s+)?(day|week)')
+_SAME_DAY = re.compile(r'same[\s-]day|today')
+_NEXT_DAY = re.compile(r'next[\s-]day|tomorrow')
+
+
+def _offset_days(today: np.datetime64, days: pd.Series, business: pd.Series) -> pd.Series:
+    """Add a (possibly missing) number of calendar or business days to today."""
+    known = days.notna()
+    whole_days = days.fillna(0).astype('int64').to_numpy()
+    calendar = today + whole_days.astype('timedelta64[D]')
+    workdays = np.busday_offset(today, whole_days, roll='forward')
+    result = np.where(business.to_numpy(dtype=bool), workdays, calendar)
+    return pd.Series(result, index=days.index).where(known)
+
+
+def normalize_delivery(delivery_text: pd.Series, today: Optional[date] = None) -> pd.DataFrame:
+    """
+    Resolve a column of free-text delivery strings to concrete delivery data.
+
+    Args:
+        delivery_text: Delivery strings as scraped, e.g. 'delivery by mon, may 20'
+            or 'free delivery in 3-5 business days'
+        today: Reference date for relative strings; defaults to the current date
+
+    Returns:
+        pd.DataFrame: Indexed like ``delivery_text`` with columns
+        ``delivery_earliest`` / ``delivery_latest`` (dates), ``delivery_days``
+        (days until the latest delivery date, NaN when unknown or already past) and
+        ``delivery_speed`` (ordered category of DeliverySpeed values)
+    """
+    if isinstance(delivery_text.dtype, pd.CategoricalDtype):
+        # A batch repeats a handful of delivery strings: resolve each once and
+        # gather by code (missing values are code -1, the '' row appended last)
+        unique = pd.Series([*delivery_text.cat.categories.astype(str), ''])
+        resolved = normalize_delivery(unique, today=today).iloc[delivery_text.cat.codes.to_numpy()]
+        return resolved.set_axis(delivery_text.index)
+
+    today = pd.Timestamp(today or date.today()).normalize()
+    today64 = today.to_datetime64().astype('datetime64[D]')
+    text = delivery_text.fillna('').astype(str).str.lower()
+
+    earliest = pd.Series(pd.NaT, index=text.index, dtype='datetime64[ns]')
+    latest = earliest.copy()
+
+    # Absolute dates: 'may 20' (rolled into next year once passed) or '05/20[/25]'
+    month_day = text.str.extract(_MONTH_DAY)
+    month_day_date = pd.to_datetime(
+        pd.DataFrame({
+            'year': today.year,
+            'month': month_day[0].map(_MONTHS),
+            'day': pd.to_numeric(month_day[1]),
+        }),
+        errors='coerce',
+    )
+    month_day_date = month_day_date.where(
+        month_day_date >= today, month_day_date + pd.DateOffset(years=1)
+    )
+
+    slash = text.str.extract(_SLASH_DATE)
+    slash_year = pd.to_numeric(slash[2]).fillna(today.year)
+    slash_year = slash_year.where(slash_year >= 100, slash_year + 2000)
+    slash_date = pd.to_datetime(
+        pd.DataFrame({'year': slash_year, 'month': pd.to_numeric(slash[0]), 'day': pd.to_numeric(slash[1])}),
+        errors='coerce',
+    )
+    # Like 'may 20', a year-less '05/20' that has passed means next year
+    slash_date = slash_date.where(
+        slash[2].notna() | (slash_date >= today), slash_date + pd.DateOffset(years=1)
+    )
+
+    absolute = month_day_date.fillna(slash_date)
+    earliest = earliest.fillna(absolute)
+    latest = latest.fillna(absolute)
+
+    # Relative ranges: '3-5 business days', '1 week'
+    relative = text.str.extract(_RELATIVE)
+    weeks = relative[3].eq('week').map({True: 7, False: 1})
+    low = pd.to_numeric(relative[0])
+    high = pd.to_numeric(relative[1]).fillna(low) * weeks
+    low = low * weeks
+    business = relative[2].notna()
+    earliest = earliest.fillna(_offset_days(today64, low, business))
+    latest = latest.fillna(_offset_days(today64, high, business))
+
+    # Keywords last, so an explicit date always wins
+    keyword_days = pd.Series(np.nan, index=text.index)
+    keyword_days = keyword_days.mask(text.str.contains(_NEXT_DAY), 1)
+    keyword_days = keyword_days.mask(text.str.contains(_SAME_DAY), 0)
+    keyword_date = today + pd.to_timedelta(keyword_days, unit='D')
+    earliest = earliest.fillna(keyword_date)
+    latest = latest.fillna(keyword_date)
+
+    # A date already past (e.g. '05/20/25') is stale, not same-day: treat it as unknown
+    stale = latest < today
+    earliest = earliest.mask(stale)
+    latest = latest.mask(stale)
+    days = (latest - today).dt.days
+
+    speed = np.select(
+        [days == 0, days == 1, days == 2],
+        [DeliverySpeed.SAME_DAY.value, DeliverySpeed.NEXT_DAY.value, DeliverySpeed.TWO_DAY.value],
+        default=DeliverySpeed.STANDARD.value,
+    )
+
+    return pd.DataFrame({
+        'delivery_earliest': earliest.dt.date,
+        'delivery_latest': latest.dt.date,
+        'delivery_days': days,
+        'delivery_speed': pd.Series(speed, index=text.index).astype(SPEED_DTYPE),
+    }, index=text.index)
+
+
+def add_delivery_columns(df: pd.DataFrame, today: Optional[date] = None) -> pd.DataFrame:
+    """
+    Add normalized delivery columns to a scrape DataFrame in one pass.
+
+    Args:
+        df: Products with a ``delivery_text`` column
+        today: Reference date for relative delivery strings
+
+    Returns:
+        pd.DataFrame: ``df`` with the columns from :func:`normalize_delivery`
+    """
+    if df.empty or 'delivery_text' not in df.columns:
+        return df
+    normalized = normalize_delivery(df['delivery_text'], today=today)
+    return df.drop(columns=normalized.columns, errors='ignore').join(normalized)
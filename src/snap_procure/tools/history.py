@@ -0,0 +1,201 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from urllib.parse import quote
+import os
+import threading
+import time
+import uuid
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from .cache import normalize_query
+from .pricing import frame_cents
+
+# Typed columns stored for every scraped product; the store and date columns
+# are hive partitions (data/history/store=.../date=YYYY-MM-DD/*.parquet)
+SCHEMA = pa.schema([
+    ('store', pa.string()),
+    ('date', pa.string()),
+    ('query', pa.string()),
+    ('name', pa.string()),
+    ('url', pa.string()),
+    ('price_cents', pa.int64()),
+    ('delivery_speed', pa.string()),
+    ('delivery_days', pa.float64()),
+    ('scraped_at', pa.timestamp('us')),
+])
+
+PARTITIONING = ds.partitioning(
+    pa.schema([('store', pa.string()), ('date', pa.string())]),
+    flavor='hive',
+)
+
+
+class PriceHistory:
+    """
+    Append-only, partitioned Parquet store of scraped prices.
+
+    Appends are buffered in memory and written as one file per store/date
+    partition once ``batch_rows`` rows or ``flush_interval`` seconds have
+    accumulated, or when the owner calls :meth:`flush` / :meth:`close`.
+    Nothing is written at interpreter exit, so entry points flush before
+    they return. Queries only read the partitions and columns they need.
+    """
+
+    def __init__(self, root: str = 'data/history', batch_rows: int = 5000, flush_interval: float = 300.0):
+        """
+        Initialize the history store.
+
+        Args:
+            root: Directory holding the partitioned dataset
+            batch_rows: Buffered rows that trigger a write
+            flush_interval: Seconds after which buffered rows are written regardless
+        """
+        self.root = root
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self._buffer: List[pa.Table] = []
+        self._buffered_rows = 0
+        self._buffered_since: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def to_table(df: pd.DataFrame, query: str) -> pa.Table:
+        """Convert a scrape DataFrame into a table with the history schema."""
+        scraped_at = pd.to_datetime(df['timestamp']) if 'timestamp' in df else pd.Timestamp.now()
+        columns = pd.DataFrame({
+            'store': df['store'].astype(str),
+            'query': normalize_query(query),
+            'name': df.get('name'),
+            'url': df.get('url'),
+            'price_cents': frame_cents(df, 'price'),
+            'delivery_speed': df['delivery_speed'].astype(str) if 'delivery_speed' in df else None,
+            'delivery_days': df['delivery_days'] if 'delivery_days' in df else None,
+            'scraped_at': scraped_at,
+        }, index=df.index)
+        columns['date'] = pd.to_datetime(columns['scraped_at']).dt.strftime('%Y-%m-%d')
+        return pa.Table.from_pandas(columns, schema=SCHEMA, preserve_index=False)
+
+    def append(self, df: pd.DataFrame, query: str):
+        """
+        Buffer the products from one scrape for writing.
+
+        Args:
+            df: Products as returned by ``ProcurementScraper.scrape_all_stores``
+            query: The product searched for
+        """
+        if df.empty:
+            return
+        table = self.to_table(df, query)
+        with self._lock:
+            self._buffer.append(table)
+            self._buffered_rows += table.num_rows
+            if self._buffered_since is None:
+                self._buffered_since = time.monotonic()
+            due = (
+                self._buffered_rows >= self.batch_rows
+                or time.monotonic() - self._buffered_since >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write every buffered row to the dataset."""
+        with self._lock:
+            if not self._buffer:
+                return
+            table = pa.concat_tables(self._buffer)
+            self._buffer = []
+            self._buffered_rows = 0
+            self._buffered_since = None
+
+            # One pq.write_table per partition: with pyarrow 20, ds.write_dataset
+            # leaves writer threads that abort the interpreter at exit
+            partitions = table.group_by(['store', 'date'], use_threads=False).aggregate([])
+            basename = f'part-{uuid.uuid4().hex}-0.parquet'
+            for key in partitions.to_pylist():
+                rows = table.filter((pc.field('store') == key['store']) & (pc.field('date') == key['date']))
+                directory = os.path.join(
+                    self.root, f"store={quote(key['store'], safe='')}", f"date={quote(key['date'], safe='')}"
+                )
+                os.makedirs(directory, exist_ok=True)
+                pq.write_table(rows.drop_columns(['store', 'date']), os.path.join(directory, basename))
+
+    def close(self):
+        """Write any buffered rows; the store stays usable."""
+        self.flush()
+
+    def __enter__(self) -> 'PriceHistory':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read(
+        self,
+        columns: List[str],
+        store: Optional[str] = None,
+        query: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        try:
+            dataset = ds.dataset(self.root, format='parquet', partitioning=PARTITIONING)
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return pd.DataFrame(columns=columns)
+
+        # Partition filters prune whole directories before any file is opened
+        filters = []
+        if store is not None:
+            filters.append(pc.field('store') == store)
+        if since is not None:
+            filters.append(pc.field('date') >= since.strftime('%Y-%m-%d'))
+            filters.append(pc.field('scraped_at') >= pa.scalar(since, pa.timestamp('us')))
+        if query is not None:
+            filters.append(pc.field('query') == normalize_query(query))
+        condition = None
+        for expression in filters:
+            condition = expression if condition is None else condition & expression
+
+        return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+    def latest_prices(self, store: Optional[str] = None, query: Optional[str] = None) -> pd.DataFrame:
+        """
+        Most recent price seen for each product URL.
+
+        Args:
+            store: Only this store
+            query: Only products found for this search
+
+        Returns:
+            pd.DataFrame: One row per product URL with its latest price
+        """
+        self.flush()
+        df = self._read(['store', 'url', 'name', 'price_cents', 'scraped_at'], store=store, query=query)
+        if df.empty:
+            return df
+        latest = df.sort_values('scraped_at').drop_duplicates(['store', 'url'], keep='last')
+        return latest.reset_index(drop=True)
+
+    def price_history(self, query: str, days: int = 30, store: Optional[str] = None) -> pd.DataFrame:
+        """
+        Prices seen for a search over the last ``days`` days.
+
+        Args:
+            query: The product searched for
+            days: How far back to look
+            store: Only this store
+
+        Returns:
+            pd.DataFrame: Price observations ordered by time
+        """
+        self.flush()
+        since = datetime.now() - timedelta(days=days)
+        df = self._read(
+            ['store', 'url', 'name', 'price_cents', 'scraped_at'],
+            store=store,
+            query=query,
+            since=since,
+        )
+        return df.sort_values('scraped_at').reset_index(drop=True)
@@ -0,0 +1,297 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+import re
+import pandas as pd
+from .catalog import catalog_tokens
+from .pricing import frame_cents
+from .ranking import format_cents
+
+MATCH_COLUMNS = ['group', 'description', 'store', 'name', 'url', 'unit_cents', 'score']
+
+_PACK = re.compile(r'\b(\d+)[\s-]*(?:pack|pk|count|ct|pcs?|pieces?)\b|\b(?:pack|box|case) of (\d+)\b')
+_DIMENSION = re.compile(r'^\d+(?:\.\d+|/\d+)?(?:x\d+(?:\.\d+|/\d+)?)+$')
+_SPECIES = frozenset(['syp', 'df', 'spf', 'cedar', 'redwood', 'whitewood', 'pine', 'fir', 'hem', 'oak', 'poplar', 'osb'])
+# Treated and untreated lumber are never the same product
+_TREATED = frozenset(['pt', 'gc'])
+_KINDS = frozenset([
+    'lumber', 'stud', 'board', 'post', 'picket', 'plywood', 'sheathing', 'panel', 'beam', 'joist',
+    'rail', 'baluster', 'timber', 'decking', 'siding', 'trim', 'furring', 'lattice',
+])
+_GENERIC = frozenset(['prime', 'premium', 'select', 'common', 'standard'])
+_LABELS = {'syp': 'SYP', 'df': 'Douglas fir', 'spf': 'SPF', 'osb': 'OSB'}
+
+
+@dataclass(frozen=True)
+class ProductAttributes:
+    """What a product name says about the product, normalized for matching."""
+    dimension: Optional[str]
+    species: Optional[str]
+    treated: bool
+    kind: Optional[str]
+    pack: int
+    brand: Optional[str]
+    # Every other descriptive token (type, grade, finish, ...)
+    descriptors: FrozenSet[str]
+
+
+@lru_cache(maxsize=8192)
+def product_attributes(name: str) -> ProductAttributes:
+    """
+    Normalize a product name into matchable attributes.
+
+    Dimensions, species and treatment come from the catalog's token
+    normalization ("2-in x 4-in x 8-ft Pressure Treated Southern Yellow
+    Pine" -> ``2x4x8``, ``syp``, treated). The brand is whatever leads the
+    name before its first dimension, the product type (stud, picket,
+    plywood, ...) its first type word; pack counts ("3-Pack", "box of 50")
+    default to 1.
+    """
+    text = name.lower()
+    match = _PACK.search(text)
+    pack = int(match.group(1) or match.group(2)) if match else 1
+    if match:
+        text = text[:match.start()] + ' ' + text[match.end():]
+
+    tokens = catalog_tokens(text)
+    dimension = next((token for token in tokens if _DIMENSION.match(token)), None)
+    leading = []
+    for token in tokens:
+        if token[0].isdigit() or token in _SPECIES or token in _TREATED:
+            break
+        leading.append(token)
+    # Only a name that starts with words and later gives a dimension has a brand in front
+    brand = ' '.join(leading[:3]) if leading and dimension and len(leading) < len(tokens) else None
+
+    species = next((token for token in tokens if token in _SPECIES), None)
+    brand_tokens = set(leading[:3]) if brand else set()
+    descriptors = frozenset(
+        token for token in tokens
+        if token != dimension and token not in _SPECIES and token not in _TREATED
+        and token not in _GENERIC and token not in brand_tokens
+    )
+    return ProductAttributes(
+        dimension=dimension,
+        species=species,
+        treated=bool(_TREATED.intersection(tokens)),
+        kind=next((token for token in tokens if token in _KINDS), None),
+        pack=pack,
+        brand=brand,
+        descriptors=descriptors,
+    )
+
+
+def similarity(a: ProductAttributes, b: ProductAttributes) -> float:
+    """
+    How likely two products are the same item, 0 to 1.
+
+    Dimension, treatment and pack count must agree, and so must the
+    species and the product type when both names give one; the score is then the overlap of
+    the remaining descriptive words, nudged up when the brands agree.
+    """
+    if a.dimension != b.dimension or a.treated != b.treated or a.pack != b.pack:
+        return 0.0
+    if a.species and b.species and a.species != b.species:
+        return 0.0
+    if a.kind and b.kind and a.kind != b.kind:
+        return 0.0
+    union = a.descriptors | b.descriptors
+    score = len(a.descriptors & b.descriptors) / len(union) if union else 1.0
+    if a.brand and a.brand == b.brand:
+        score = min(1.0, score + 0.2)
+    return score
+
+
+def _block_keys(attributes: ProductAttributes, siblings: Dict[Tuple, Set[Tuple]]) -> List[Tuple]:
+    """
+    Blocks a product is compared in.
+
+    A block holds one size, treatment and pack count, split further by
+    species and product type when the name gives them. A name that leaves
+    either out may match any of them, so it joins every sibling block of
+    its size.
+    """
+    base = _base_key(attributes)
+    species = [attributes.species] if attributes.species else sorted({key[0] for key in siblings[base]}, key=str)
+    kinds = [attributes.kind] if attributes.kind else sorted({key[1] for key in siblings[base]}, key=str)
+    return [(base, s, k) for s in species or [None] for k in kinds or [None]]
+
+
+def _base_key(attributes: ProductAttributes) -> Tuple:
+    if attributes.dimension:
+        return attributes.dimension, attributes.treated, attributes.pack
+    # Without a size, only products sharing their first descriptive word are compared
+    return None, attributes.treated, attributes.pack, min(attributes.descriptors, default='')
+
+
+def match_products(df: pd.DataFrame, threshold: float = 0.5, max_block: int = 50) -> pd.DataFrame:
+    """
+    Group the same product across stores.
+
+    Names are normalized once and products are bucketed into blocks by
+    size, treatment, pack count, species and product type, the attributes
+    that must agree anyway. Only cross-store pairs within a block are
+    scored, so the work grows with the block sizes rather than with the
+    square of the result set. The best-scoring pairs are merged first and
+    a group never holds two products from one store.
+
+    Args:
+        df: Products as returned by ``ProcurementScraper.scrape_all_stores``
+        threshold: Lowest similarity that counts as the same product
+        max_block: Oversized blocks are only compared through their cheapest
+            ``max_block`` products per store
+
+    Returns:
+        pd.DataFrame: One row per product in a group of two or more stores,
+        with ``group``, a shared ``description``, ``unit_cents`` and the
+        ``score`` of the pair that brought it into the group
+    """
+    if df.empty:
+        return pd.DataFrame(columns=MATCH_COLUMNS)
+
+    cents = frame_cents(df, 'price')
+    priced = cents.notna().to_numpy()
+    stores = df['store'].astype(str).to_numpy()[priced].tolist()
+    names = df['name'].astype(str).to_numpy()[priced].tolist()
+    urls = df['url'].to_numpy()[priced].tolist()
+    prices = cents.to_numpy()[priced].astype('int64').tolist()
+    attributes = [product_attributes(name) for name in names]
+
+    siblings: Dict[Tuple, Set[Tuple]] = defaultdict(set)
+    for attrs in attributes:
+        if attrs.species or attrs.kind:
+            siblings[_base_key(attrs)].add((attrs.species, attrs.kind))
+
+    # A store's listings with identical attributes are scored once, through the cheapest
+    blocks: Dict[Tuple, Dict[str, Dict[ProductAttributes, int]]] = defaultdict(lambda: defaultdict(dict))
+    for i, (store, attrs) in enumerate(zip(stores, attributes)):
+        for key in _block_keys(attrs, siblings):
+            listings = blocks[key][store]
+            if attrs not in listings or prices[i] < prices[listings[attrs]]:
+                listings[attrs] = i
+
+    scores: Dict[Tuple[int, int], float] = {}
+    for by_store in blocks.values():
+        if len(by_store) < 2:
+            continue
+        members = [
+            sorted(by_store[store].values(), key=prices.__getitem__)[:max_block] for store in sorted(by_store)
+        ]
+        for s, left in enumerate(members):
+            for right in members[s + 1:]:
+                for i in left:
+                    for j in right:
+                        if (i, j) not in scores:
+                            scores[i, j] = similarity(attributes[i], attributes[j])
+
+    # Greedy merge, best pairs first; a group holds at most one product per store
+    pairs = sorted(
+        ((score, i, j) for (i, j), score in scores.items() if score >= threshold),
+        key=lambda pair: (-pair[0], prices[pair[1]] + prices[pair[2]]),
+    )
+    group_of: Dict[int, int] = {}
+    groups: Dict[int, Dict[str, int]] = {}
+    joined_with: Dict[int, float] = {}
+    for score, i, j in pairs:
+        gi, gj = group_of.get(i), group_of.get(j)
+        if gi is None and gj is None:
+            group = i
+            groups[group] = {stores[i]: i, stores[j]: j}
+            group_of[i] = group_of[j] = group
+            joined_with[i] = joined_with[j] = score
+        elif gi is None or gj is None:
+            group, new = (gj, i) if gi is None else (gi, j)
+            if stores[new] not in groups[group]:
+                groups[group][stores[new]] = new
+                group_of[new] = group
+                joined_with[new] = score
+        elif gi != gj and not set(groups[gi]) & set(groups[gj]):
+            for store, member in groups.pop(gj).items():
+                groups[gi][store] = member
+                group_of[member] = gi
+
+    rows = []
+    for number, members in enumerate(groups.values(), start=1):
+        indices = list(members.values())
+        description = _describe([attributes[i] for i in indices], names[indices[0]])
+        for i in indices:
+            rows.append({
+                'group': number,
+                'description': description,
+                'store': stores[i],
+                'name': names[i],
+                'url': urls[i],
+                'unit_cents': prices[i],
+                'score': round(joined_with[i], 3),
+            })
+    return pd.DataFrame(rows, columns=MATCH_COLUMNS)
+
+
+def _describe(attributes: List[ProductAttributes], name: str) -> str:
+    """Short label built from what every product in a group has in common."""
+    first = attributes[0]
+    shared = frozenset.intersection(*(attrs.descriptors for attrs in attributes))
+    words = [first.dimension] if first.dimension else []
+    if first.treated:
+        words.append('pressure-treated')
+    species = {attrs.species for attrs in attributes} - {None}
+    if len(species) == 1:
+        words.append(_LABELS.get(next(iter(species)), next(iter(species))))
+    words += [
+        '#' + token[5:] if token.startswith('grade') else token
+        for token in catalog_tokens(name) if token in shared
+    ]
+    if first.pack > 1:
+        words.append(f'{first.pack}-pack')
+    return ' '.join(words) or name
+
+
+def compare_stores(matches: pd.DataFrame, top_k: Optional[int] = 10) -> pd.DataFrame:
+    """
+    One row per matched product with its price at every store.
+
+    Args:
+        matches: Output of :func:`match_products`
+        top_k: Keep the groups with the cheapest best price
+
+    Returns:
+        pd.DataFrame: ``description``, one integer-cent column per store,
+        ``cheapest`` store and ``savings_cents`` against the dearest store
+    """
+    if matches.empty:
+        return pd.DataFrame(columns=['description', 'cheapest', 'savings_cents'])
+    wide = matches.pivot_table(index=['group', 'description'], columns='store', values='unit_cents', aggfunc='min')
+    wide = wide.astype('Int64')
+    stores = list(wide.columns)
+    table = wide.reset_index()
+    table['cheapest'] = wide.idxmin(axis=1).to_numpy()
+    table['savings_cents'] = (wide.max(axis=1) - wide.min(axis=1)).to_numpy()
+    table = table.assign(_best=wide.min(axis=1).to_numpy()).sort_values(['_best', 'group'])
+    if top_k is not None:
+        table = table.head(top_k)
+    return table[['description', *stores, 'cheapest', 'savings_cents']].reset_index(drop=True)
+
+
+def format_comparison_table(comparison: pd.DataFrame) -> str:
+    """
+    Render a store comparison as a compact markdown table.
+
+    Args:
+        comparison: Output of :func:`compare_stores`
+
+    Returns:
+        str: Markdown table, or a short note when nothing matched across stores
+    """
+    if comparison.empty:
+        return "No product was found at more than one store."
+
+    stores = [column for column in comparison.columns if column not in ('description', 'cheapest', 'savings_cents')]
+    lines = [
+        "| Product | " + " | ".join(stores) + " | Cheapest | Saves |",
+        "|---|" + "---|" * len(stores) + "---|---|",
+    ]
+    for _, row in comparison.iterrows():
+        prices = " | ".join(format_cents(row[store]) for store in stores)
+        lines.append(f"| {row['description']} | {prices} | {row['cheapest']} | {format_cents(row['savings_cents'])} |")
+    return "\n".join(lines)
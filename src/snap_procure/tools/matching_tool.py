@@ -0,0 +1,29 @@
+from crewai.tools import BaseTool
+from typing import Any, Type
+from pydantic import BaseModel, Field
+
+
+class CompareStoresToolInput(BaseModel):
+    """Input schema for CompareStoresTool."""
+    product: str = Field(..., description="The product to compare, e.g. '2x4x8 lumber'.")
+    top_k: int = Field(10, description="Maximum number of matched products to return.")
+
+
+class CompareStoresTool(BaseTool):
+    name: str = "Compare prices across stores"
+    description: str = (
+        "Finds the same product at different stores (same size, species, treatment and "
+        "pack count, even when the stores word the name differently) and returns a compact "
+        "markdown table with each store's unit price, the cheapest store and how much it "
+        "saves. Use it instead of pairing products up by eye."
+    )
+    args_schema: Type[BaseModel] = CompareStoresToolInput
+    scraper: Any = Field(default=None, exclude=True)
+
+    def _run(self, product: str, top_k: int = 10) -> str:
+        # pandas is only imported once the tool is actually used
+        from .matching import compare_stores, format_comparison_table, match_products
+
+        # Repeated searches are served from the scraper's cache
+        df = self.scraper.scrape_all_stores(product)
+        return format_comparison_table(compare_stores(match_products(df), top_k=top_k))
@@ -0,0 +1,339 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional, Tuple
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_request_id: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def current_request_id() -> Optional[str]:
+    """Id of the request being handled on this thread/context, if any."""
+    return _request_id.get()
+
+
+@contextmanager
+def request_scope(request_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Tag every span and event recorded inside the block with a request id.
+
+    Worker threads only inherit the id when they are started with a copy of
+    the caller's context (``contextvars.copy_context().run``).
+    """
+    request_id = request_id or uuid.uuid4().hex[:12]
+    token = _request_id.set(request_id)
+    try:
+        yield request_id
+    finally:
+        _request_id.reset(token)
+
+
+def _key(name: str, labels: Dict[str, object]) -> _Key:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+class Span:
+    """Times a block; extra attributes can be attached with ``set``."""
+
+    __slots__ = ('metrics', 'name', 'labels', 'attributes', 'started')
+
+    def __init__(self, metrics: 'Metrics', name: str, labels: Dict[str, object]):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+        self.attributes: Dict[str, object] = {}
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> 'Span':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics._finish_span(self, time.perf_counter() - self.started, exc)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Metrics:
+    """
+    Counters, latency histograms and spans for the whole pipeline.
+
+    Spans are written as JSON lines (one object per finished span or event,
+    tagged with the current request id) and feed a latency histogram;
+    counters and histograms are exported in the Prometheus text format to a
+    file and/or a ``/metrics`` endpoint. With ``enabled=False`` every call is
+    a no-op.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        jsonl_path: Optional[str] = None,
+        prometheus_path: Optional[str] = None,
+        namespace: str = 'snap_procure',
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            enabled: Record anything at all
+            jsonl_path: File spans and events are appended to, one JSON object per line
+            prometheus_path: File the Prometheus text exposition is written to on ``flush``
+            namespace: Prefix of every exported metric name
+            buckets: Latency histogram bucket bounds in seconds
+        """
+        self.enabled = enabled
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self.namespace = namespace
+        self.buckets = buckets
+        self._counters: Dict[_Key, float] = {}
+        self._histograms: Dict[_Key, list] = {}
+        self._lock = threading.Lock()
+        self._jsonl = None
+        self._server = None
+        if enabled and (jsonl_path or prometheus_path):
+            atexit.register(self.flush)
+
+    @classmethod
+    def from_env(cls) -> 'Metrics':
+        """
+        Registry configured from the environment.
+
+        METRICS=0 disables recording, METRICS_JSONL and METRICS_PROM_FILE set
+        the export files.
+        """
+        return cls(
+            enabled=os.environ.get('METRICS', '1') != '0',
+            jsonl_path=os.environ.get('METRICS_JSONL') or None,
+            prometheus_path=os.environ.get('METRICS_PROM_FILE') or None,
+        )
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add ``value`` to a counter."""
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Record a latency in a histogram."""
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # [count, sum, per-bucket counts...]
+                histogram = self._histograms[key] = [0, 0.0] + [0] * len(self.buckets)
+            histogram[0] += 1
+            histogram[1] += seconds
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram[2 + i] += 1
+                    break
+
+    def span(self, name: str, **labels):
+        """
+        Time a block as a span.
+
+        The duration goes to the ``<name>_seconds`` histogram with ``labels``
+        and, with a JSON-lines file configured, a span record is written.
+
+        Example:
+            with metrics.span('scrape.fetch', store='Home Depot') as span:
+                ...
+                span.set(bytes=len(content))
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, labels)
+
+    def _finish_span(self, span: Span, seconds: float, exc: Optional[BaseException]):
+        self.observe(f'{span.name}_seconds', seconds, **span.labels)
+        if exc is not None:
+            self.inc(f'{span.name}_errors_total', **span.labels)
+        if self.jsonl_path:
+            record = {
+                'type': 'span',
+                'name': span.name,
+                'duration_ms': round(seconds * 1000, 3),
+                'status': 'error' if exc is not None else 'ok',
+                **span.labels,
+                **span.attributes,
+            }
+            if exc is not None:
+                record['error'] = f'{type(exc).__name__}: {exc}'
+            self._write(record)
+
+    def event(self, name: str, **fields):
+        """Write a one-off structured event (JSON-lines only)."""
+        if self.enabled and self.jsonl_path:
+            self._write({'type': 'event', 'name': name, **fields})
+
+    def _write(self, record: Dict):
+        record = {
+            'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'request_id': _request_id.get(),
+            'thread': threading.current_thread().name,
+            **record,
+        }
+        line = json.dumps(record, default=str) + '\n'
+        with self._lock:
+            if self._jsonl is None:
+                directory = os.path.dirname(self.jsonl_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._jsonl = open(self.jsonl_path, 'a', encoding='utf-8')
+            self._jsonl.write(line)
+
+    def counter(self, name: str, **labels) -> float:
+        """Current value of a counter."""
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Counters and histogram counts/sums keyed by ``name{labels}``."""
+        def label(key: _Key) -> str:
+            name, labels = key
+            return name + ('{' + ','.join(f'{k}={v}' for k, v in labels) + '}' if labels else '')
+
+        with self._lock:
+            return {
+                'counters': {label(key): value for key, value in self._counters.items()},
+                'histograms': {
+                    label(key): {'count': h[0], 'sum': round(h[1], 6)} for key, h in self._histograms.items()
+                },
+            }
+
+    def _metric_name(self, name: str) -> str:
+        return f"{self.namespace}_{name.replace('.', '_').replace('-', '_')}"
+
+    @staticmethod
+    def _labels(labels: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(labels) + ([extra] if extra else [])
+        if not pairs:
+            return ''
+        escaped = (
+            f'{name}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+            for name, value in pairs
+        )
+        return '{' + ','.join(escaped) + '}'
+
+    def render_prometheus(self) -> str:
+        """Every counter and histogram in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, list(h)) for key, h in self._histograms.items())
+
+        lines = []
+        typed = set()
+        for (name, labels), value in counters:
+            metric = self._metric_name(name)
+            if metric not in typed:
+                lines.append(f'# TYPE {metric} counter')
+                typed.add(metric)
+            lines.append(f'{metric}{self._labels(labels)} {value:g}')
+        for (name, labels), histogram in histograms:
+            metric = self._metric_name(name)
+            if metric not in typed:
+                lines.append(f'# TYPE {metric} histogram')
+                typed.add(metric)
+            cumulative = 0
+            for bound, count in zip(self.buckets, histogram[2:]):
+                cumulative += count
+                lines.append(f'{metric}_bucket{self._labels(labels, ("le", f"{bound:g}"))} {cumulative}')
+            lines.append(f'{metric}_bucket{self._labels(labels, ("le", "+Inf"))} {histogram[0]}')
+            lines.append(f'{metric}_sum{self._labels(labels)} {histogram[1]:.6f}')
+            lines.append(f'{metric}_count{self._labels(labels)} {histogram[0]}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: Optional[str] = None):
+        """Write the Prometheus exposition atomically (for node_exporter's textfile collector)."""
+        path = path or self.prometheus_path
+        if not path or not self.enabled:
+            return
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(self.render_prometheus())
+        os.replace(temporary, path)
+
+    def serve(self, port: int, host: str = '0.0.0.0'):
+        """Expose ``/metrics`` over HTTP on a background thread (once per registry)."""
+        if self._server is not None or not self.enabled:
+            return
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='metrics-server', daemon=True).start()
+        print(f"📈 Metrics at http://{host}:{self._server.server_address[1]}/metrics")
+
+    def flush(self):
+        """Flush the JSON-lines file and rewrite the Prometheus file."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._jsonl is not None:
+                self._jsonl.flush()
+        self.write_prometheus()
+
+
+# Process-wide registry used by the scraper, the crew and both entry points
+metrics = Metrics.from_env()
+
+
+def serve_from_env():
+    """Start the ``/metrics`` endpoint when METRICS_PORT is set."""
+    port = os.environ.get('METRICS_PORT')
+    if port:
+        metrics.serve(int(port))
@@ -0,0 +1,160 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+import multiprocessing
+import os
+import threading
+import time
+from .parsing import HtmlParser, ParsedPage, extract_products
+from .records import ProductRecord
+from .stores import StoreAdapter
+
+# State of a worker process, set once by _init_worker
+_worker_adapters: Dict[str, StoreAdapter] = {}
+_worker_parser: Optional[HtmlParser] = None
+
+
+def _init_worker(adapters: Dict[str, StoreAdapter], engine: str):
+    global _worker_adapters, _worker_parser
+    _worker_adapters = adapters
+    _worker_parser = HtmlParser(engine)
+
+
+def _parse_in_worker(store: str, content: bytes) -> Tuple[List[tuple], int, int, float]:
+    """Parse one page in a worker; records travel back as plain tuples."""
+    started = time.perf_counter()
+    page = extract_products(_worker_adapters[store], content, _worker_parser)
+    rows = [
+        (record.store, record.name, record.url, record.price_cents, record.delivery_text, record.delivery_price_cents)
+        for record in page.records
+    ]
+    return rows, page.containers, page.errors, time.perf_counter() - started
+
+
+class ParsePool:
+    """
+    Parses results pages in worker processes.
+
+    Parsing and selector matching are pure-Python and CPU-bound, so under
+    the GIL the scraper's fetch threads take turns on a single core. With a
+    pool, a thread hands the raw response bytes to a worker and waits on
+    the result without holding the GIL: other threads keep fetching while
+    up to ``workers`` pages are parsed on separate cores. Workers get the
+    store adapters once, when they start, and send back compact tuples
+    rather than parse trees.
+
+    Per-store page, product and error counts (products that failed to
+    parse inside a worker, and pages whose parse raised) are kept in
+    ``stats``. If a worker dies, the pool is rebuilt and the page is parsed
+    in-process.
+    """
+
+    def __init__(
+        self,
+        adapters: Dict[str, StoreAdapter],
+        workers: Optional[int] = None,
+        engine: str = 'auto',
+    ):
+        """
+        Initialize the pool; worker processes start on the first page.
+
+        Args:
+            adapters: Stores whose pages will be parsed, keyed by name
+            workers: Worker processes (env PARSE_WORKERS, default one per core)
+            engine: Parser engine the workers use, see ``HtmlParser``
+        """
+        self.adapters = {adapter.name: adapter for adapter in adapters.values()}
+        self.workers = workers if workers is not None else int(os.environ.get('PARSE_WORKERS', os.cpu_count() or 1))
+        self.engine = HtmlParser(engine).engine
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self.restarts = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned rather than forked: the scraper forks from a process full of threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self.adapters, self.engine),
+                )
+            return self._executor
+
+    def submit(self, adapter: StoreAdapter, content: bytes) -> Future:
+        """Queue a page for parsing; the future resolves to the worker's raw result."""
+        return self._pool().submit(_parse_in_worker, adapter.name, content)
+
+    def parse(self, adapter: StoreAdapter, content: bytes) -> ParsedPage:
+        """
+        Parse a page in a worker and wait for its products.
+
+        Args:
+            adapter: The store the page belongs to
+            content: Raw response body of the results page
+
+        Returns:
+            ParsedPage: Same result as ``extract_products`` in-process
+        """
+        executor = self._pool()
+        try:
+            rows, containers, errors, seconds = executor.submit(_parse_in_worker, adapter.name, content).result()
+        except BrokenProcessPool:
+            print("⚠️ A parse worker died; restarting the pool and parsing this page here")
+            self._restart(executor)
+            started = time.perf_counter()
+            page = extract_products(adapter, content, HtmlParser(self.engine))
+            self._record(adapter.name, len(content), page, time.perf_counter() - started)
+            return page
+        except Exception:
+            self._record(adapter.name, len(content), None, 0.0)
+            raise
+
+        page = ParsedPage([ProductRecord(*row) for row in rows], containers, errors)
+        self._record(adapter.name, len(content), page, seconds)
+        return page
+
+    def _record(self, store: str, size: int, page: Optional[ParsedPage], seconds: float):
+        with self._lock:
+            stats = self._stats.setdefault(
+                store, {'pages': 0, 'bytes': 0, 'products': 0, 'errors': 0, 'failed_pages': 0, 'seconds': 0.0}
+            )
+            stats['pages'] += 1
+            stats['bytes'] += size
+            stats['seconds'] += seconds
+            if page is None:
+                stats['failed_pages'] += 1
+            else:
+                stats['products'] += len(page.records)
+                stats['errors'] += page.errors
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        # Every thread waiting on the dead pool lands here; only the first
+        # replaces it, so a pool another thread already rebuilt is left alone
+        with self._lock:
+            if self._executor is not broken:
+                return
+            self._executor = None
+            self.restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-store pages, bytes, products, product errors, failed pages and worker seconds."""
+        with self._lock:
+            return {store: dict(stats) for store, stats in self._stats.items()}
+
+    def close(self):
+        """Stop the worker processes (a later page starts them again)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> 'ParsePool':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
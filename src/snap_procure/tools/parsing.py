@@ -0,0 +1,193 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+from urllib.parse import urljoin
+import time
+from bs4 import BeautifulSoup, SoupStrainer
+from .pricing import price_to_cents
+from .records import ProductRecord
+
+if TYPE_CHECKING:
+    from .stores import StoreAdapter
+
+
+def _lxml_available() -> bool:
+    try:
+        import lxml  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HtmlParser:
+    """
+    Parser engine for store search pages.
+
+    Parses raw response bytes with the fastest available backend ('lxml' when
+    installed, the stdlib 'html.parser' otherwise) and, when container classes
+    are given, only builds the tree for those product containers instead of
+    the whole page. Cumulative parse statistics are kept in ``stats``.
+    """
+
+    ENGINES = ('lxml', 'html.parser')
+
+    def __init__(self, engine: str = 'auto'):
+        """
+        Initialize the parser.
+
+        Args:
+            engine: 'lxml', 'html.parser' or 'auto' to pick lxml when installed
+        """
+        if engine == 'auto':
+            engine = 'lxml' if _lxml_available() else 'html.parser'
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown parser engine '{engine}', expected one of {self.ENGINES}")
+        self.engine = engine
+        self.stats: Dict[str, float] = {'pages': 0, 'bytes': 0, 'seconds': 0.0, 'containers': 0}
+
+    def parse(self, content: bytes, container_classes: Optional[Iterable[str]] = None) -> BeautifulSoup:
+        """
+        Parse a page, optionally keeping only the product containers.
+
+        Args:
+            content: Raw response body (``response.content``); bytes let the
+                backend detect the encoding itself instead of decoding twice
+            container_classes: CSS classes of the product containers; every
+                other part of the page is skipped while parsing
+
+        Returns:
+            BeautifulSoup: The (partial) document
+        """
+        strainer = None
+        if container_classes:
+            wanted = frozenset(container_classes)
+
+            # While parsing, the strainer sees the raw class attribute ("product-pod
+            # product-pod--default"), so match on any of its classes, not the whole string
+            def has_container_class(value: Optional[str]) -> bool:
+                return bool(value) and not wanted.isdisjoint(value.split())
+
+            strainer = SoupStrainer(class_=has_container_class)
+
+        started = time.perf_counter()
+        soup = BeautifulSoup(content, self.engine, parse_only=strainer)
+        self.stats['pages'] += 1
+        self.stats['bytes'] += len(content)
+        self.stats['seconds'] += time.perf_counter() - started
+        return soup
+
+    def select_containers(self, content: bytes, container_classes: List[str]) -> list:
+        """
+        Parse a page and return its product containers.
+
+        Args:
+            content: Raw response body
+            container_classes: CSS classes identifying a product container
+
+        Returns:
+            list: Container elements in document order
+        """
+        soup = self.parse(content, container_classes)
+        selector = ', '.join(f'.{name}' for name in container_classes)
+        containers = soup.select(selector)
+        self.stats['containers'] += len(containers)
+        return containers
+
+    @property
+    def throughput(self) -> float:
+        """Parsed megabytes per second so far."""
+        if not self.stats['seconds']:
+            return 0.0
+        return self.stats['bytes'] / 1_000_000 / self.stats['seconds']
+
+
+@dataclass
+class ParsedPage:
+    """Products extracted from one results page, with what went wrong on the way."""
+    records: List[ProductRecord] = field(default_factory=list)
+    # Product containers found on the page; 0 usually means the markup changed
+    containers: int = 0
+    # Containers that raised while being read
+    errors: int = 0
+
+
+def parse_delivery_options(delivery_element) -> Dict:
+    """
+    Extract the raw delivery options from the delivery element.
+
+    Dates, days-to-deliver and speed are resolved for a whole batch at once
+    by ``normalize_delivery`` rather than per product here.
+    """
+    try:
+        # This is a simplified example - actual implementation will depend on the website structure
+        return {
+            'delivery_text': ' '.join(delivery_element.get_text(' ', strip=True).lower().split()),
+            'delivery_price_cents': 0  # This would be extracted from the page
+        }
+    except Exception as e:
+        print(f"Error parsing delivery options: {e}")
+        return {}
+
+
+def extract_products(adapter: 'StoreAdapter', content: bytes, parser: HtmlParser) -> ParsedPage:
+    """
+    Read the products on a search results page of any store.
+
+    Pure function of its arguments, so it runs the same in the scraper's
+    process and in a parse worker (see ``ParsePool``).
+
+    Args:
+        adapter: The store the page belongs to
+        content: Raw response body of the results page
+        parser: Parser engine to build the tree with
+
+    Returns:
+        ParsedPage: Product records in page order, the number of containers
+        and of containers that could not be read
+    """
+    page = ParsedPage()
+
+    # Find all product containers. Only the containers are parsed; the
+    # rest of the page is skipped.
+    product_containers = parser.select_containers(content, adapter.containers)
+    page.containers = len(product_containers)
+
+    if not product_containers:
+        print("⚠️ No products found on the page. The site structure might have changed.")
+        return page
+
+    for item in product_containers:
+        try:
+            # Extract product URL
+            link_element = adapter.title_selector.select_one(item)
+            if not link_element or 'href' not in link_element.attrs:
+                continue
+
+            # Ensure we have a clean, absolute URL
+            product_url = urljoin(adapter.base_url, link_element['href'].strip())
+
+            # Extract product name
+            name = link_element.get_text(strip=True)
+
+            # Extract price
+            price_element = adapter.price_selector.select_one(item)
+            price_cents = price_to_cents(price_element.get_text(strip=True)) if price_element else None
+
+            # Get delivery information
+            delivery_element = adapter.delivery_selector.select_one(item) if adapter.delivery_selector else None
+            delivery_info = parse_delivery_options(delivery_element) if delivery_element else {}
+
+            # Construct the product record; the batch it ends up in carries the timestamp
+            page.records.append(ProductRecord(
+                store=adapter.name,
+                name=name,
+                url=product_url,
+                price_cents=price_cents,
+                **delivery_info
+            ))
+
+        except Exception as e:
+            print(f"⚠️ Error parsing product: {str(e)}")
+            page.errors += 1
+            continue
+
+    return page
@@ -0,0 +1,73 @@
+from typing import Optional
+import re
+import pandas as pd
+
+# '$1,234.56', '$5.47/each', '$.99', '5' -> optional dollars and cents, at least one of them
+_PRICE = r'(?=\.?\d)(\d[\d,]*)?(?:\.(\d{1,2}))?'
+_PRICE_PATTERN = re.compile(_PRICE)
+# An amount after a '$' wins over earlier numbers: '2 for $10' is $10
+_DOLLAR_PRICE_PATTERN = re.compile(r'\$\s*' + _PRICE)
+
+
+def _cents(dollars: Optional[str], cents: Optional[str]) -> int:
+    return int((dollars or '0').replace(',', '')) * 100 + int((cents or '0').ljust(2, '0'))
+
+
+def price_to_cents(text: Optional[str]) -> Optional[int]:
+    """
+    Parse one scraped price string into integer cents.
+
+    Args:
+        text: Price string such as '$5.47', '$1,299.00' or 'Price not available'
+
+    Returns:
+        Optional[int]: Cents, or None where no price could be read
+    """
+    if not text:
+        return None
+    match = _DOLLAR_PRICE_PATTERN.search(text) or _PRICE_PATTERN.search(text)
+    if not match:
+        return None
+    return _cents(match.group(1), match.group(2))
+
+
+def parse_price_cents(prices: pd.Series) -> pd.Series:
+    """
+    Parse a column of scraped price strings into integer cents.
+
+    Args:
+        prices: Price strings such as '$5.47', '$1,299.00' or 'Price not available'
+
+    Returns:
+        pd.Series: Nullable Int64 cents, <NA> where no price could be read
+    """
+    text = prices.astype('string')
+    parts = text.str.extract(_DOLLAR_PRICE_PATTERN)
+    no_dollar = parts[0].isna() & parts[1].isna()
+    if no_dollar.any():
+        parts = parts.where(~no_dollar, text.str.extract(_PRICE_PATTERN))
+    dollars = pd.to_numeric(parts[0].str.replace(',', '', regex=False), errors='coerce')
+    cents = pd.to_numeric(parts[1].str.ljust(2, '0'), errors='coerce')
+    found = dollars.notna() | cents.notna()
+    return (dollars.fillna(0) * 100 + cents.fillna(0)).where(found).round().astype('Int64')
+
+
+def frame_cents(df: pd.DataFrame, field: str = 'price') -> pd.Series:
+    """
+    Integer cents of a price field of a scrape DataFrame.
+
+    Scrapes carry ``<field>_cents`` already; price strings from older
+    checkpoints and CSV exports are parsed.
+
+    Args:
+        df: Products, e.g. as returned by ``ProcurementScraper.scrape_all_stores``
+        field: 'price' or 'delivery_price'
+
+    Returns:
+        pd.Series: Nullable Int64 cents, all <NA> when the frame has neither column
+    """
+    if f'{field}_cents' in df:
+        return df[f'{field}_cents'].astype('Int64')
+    if field in df:
+        return parse_price_cents(df[field])
+    return pd.Series(pd.NA, index=df.index, dtype='Int64')
@@ -0,0 +1,93 @@
+from typing import Optional
+import pandas as pd
+from .delivery import SPEED_DTYPE, add_delivery_columns
+from .pricing import frame_cents
+
+RANKED_COLUMNS = [
+    'delivery_speed', 'rank', 'store', 'name', 'unit_cents', 'delivery_cents',
+    'total_cents', 'delivery_latest', 'url',
+]
+
+
+def format_cents(cents) -> str:
+    """Format integer cents as a dollar amount, e.g. 54700 -> '$547.00'."""
+    if pd.isna(cents):
+        return 'n/a'
+    return f"${int(cents) / 100:,.2f}"
+
+
+def rank_products(
+    df: pd.DataFrame,
+    quantity: int = 1,
+    max_delivery_days: Optional[int] = None,
+    top_k: int = 3,
+) -> pd.DataFrame:
+    """
+    Rank scraped products by total cost within each delivery speed.
+
+    Args:
+        df: Products as returned by ``ProcurementScraper.scrape_all_stores``
+        quantity: Units needed; total cost is unit price * quantity + delivery fee
+        max_delivery_days: Drop products known to arrive later than this
+        top_k: Options kept per delivery speed
+
+    Returns:
+        pd.DataFrame: Cheapest options per speed, fastest speed first, with
+        integer-cent ``unit_cents`` / ``delivery_cents`` / ``total_cents``
+    """
+    if df.empty:
+        return pd.DataFrame(columns=RANKED_COLUMNS)
+    if 'delivery_speed' not in df.columns:
+        df = add_delivery_columns(df)
+
+    ranked = pd.DataFrame({
+        'store': df['store'],
+        'name': df['name'],
+        'url': df['url'],
+        'unit_cents': frame_cents(df, 'price'),
+        'delivery_cents': frame_cents(df, 'delivery_price').fillna(0),
+        'delivery_speed': df['delivery_speed'].astype(SPEED_DTYPE) if 'delivery_speed' in df else None,
+        'delivery_days': df['delivery_days'] if 'delivery_days' in df else float('nan'),
+        'delivery_latest': df['delivery_latest'] if 'delivery_latest' in df else None,
+    })
+    ranked['delivery_speed'] = ranked['delivery_speed'].fillna('standard')
+    ranked = ranked[ranked['unit_cents'].notna()]
+
+    if max_delivery_days is not None:
+        # Unknown delivery times are kept; the narrative can flag them
+        ranked = ranked[~(ranked['delivery_days'] > max_delivery_days)]
+
+    ranked['total_cents'] = ranked['unit_cents'] * quantity + ranked['delivery_cents']
+    ranked = ranked.sort_values(['delivery_speed', 'total_cents'], kind='stable')
+    ranked['rank'] = ranked.groupby('delivery_speed', observed=True).cumcount() + 1
+    ranked = ranked[ranked['rank'] <= top_k]
+
+    return ranked[RANKED_COLUMNS].reset_index(drop=True)
+
+
+def format_ranked_table(ranked: pd.DataFrame, name_width: int = 60) -> str:
+    """
+    Render ranked options as a compact markdown table, grouped by speed.
+
+    Args:
+        ranked: Output of :func:`rank_products`
+        name_width: Product names are truncated to this many characters
+
+    Returns:
+        str: Markdown table, or a short note when nothing matched
+    """
+    if ranked.empty:
+        return "No priced products matched the request."
+
+    lines = [
+        "| Speed | # | Store | Product | Unit | Total | Arrives by | Link |",
+        "|---|---|---|---|---|---|---|---|",
+    ]
+    for row in ranked.itertuples(index=False):
+        name = row.name if len(row.name) <= name_width else row.name[:name_width - 1] + '…'
+        arrives = row.delivery_latest if pd.notna(row.delivery_latest) else 'unknown'
+        lines.append(
+            f"| {row.delivery_speed} | {row.rank} | {row.store} | {name} | "
+            f"{format_cents(row.unit_cents)} | {format_cents(row.total_cents)} | {arrives} | {row.url} |"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,40 @@
+from crewai.tools import BaseTool
+from typing import Any, Optional, Type
+from pydantic import BaseModel, Field
+
+
+class RankSuppliersToolInput(BaseModel):
+    """Input schema for RankSuppliersTool."""
+    product: str = Field(..., description="The product to price, e.g. '2x4x8 lumber'.")
+    quantity: int = Field(1, description="Number of units needed.")
+    max_delivery_days: Optional[int] = Field(
+        None, description="Only keep options delivered within this many days."
+    )
+    top_k: int = Field(3, description="Options to keep per delivery speed.")
+
+
+class RankSuppliersTool(BaseTool):
+    name: str = "Rank supplier options"
+    description: str = (
+        "Computes total cost (unit price * quantity + delivery fee) for every scraped "
+        "option of a product, ranks them by cost within each delivery speed (fastest "
+        "first) and returns a compact markdown table. Use it instead of doing the "
+        "arithmetic yourself; only write the narrative around its output."
+    )
+    args_schema: Type[BaseModel] = RankSuppliersToolInput
+    scraper: Any = Field(default=None, exclude=True)
+
+    def _run(
+        self,
+        product: str,
+        quantity: int = 1,
+        max_delivery_days: Optional[int] = None,
+        top_k: int = 3,
+    ) -> str:
+        # pandas is only imported once the tool is actually used
+        from .ranking import format_ranked_table, rank_products
+
+        # Repeated searches are served from the scraper's cache
+        df = self.scraper.scrape_all_stores(product)
+        ranked = rank_products(df, quantity=quantity, max_delivery_days=max_delivery_days, top_k=top_k)
+        return format_ranked_table(ranked)
@@ -0,0 +1,307 @@
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Deque, Dict, Hashable, Iterator, Optional
+from urllib.parse import urlparse
+import os
+import threading
+import time
+import requests
+from .metrics import metrics
+
+# Statuses that mean "slow down" rather than "this request is broken"
+THROTTLE_STATUSES = frozenset([429, 503])
+
+
+class RateLimited(requests.RequestException):
+    """A host asked us to back off for longer than a request may wait."""
+
+
+@dataclass(frozen=True)
+class HostLimit:
+    """
+    Request budget for one host.
+
+    Attributes:
+        requests_per_second: Sustained rate the token bucket refills at
+        burst: Requests that may be sent back to back after an idle period
+        max_concurrency: Upper bound of the adaptive in-flight limit
+        min_concurrency: Lower bound the limit is never decreased below
+    """
+    requests_per_second: float = 2.0
+    burst: int = 4
+    max_concurrency: int = 4
+    min_concurrency: int = 1
+
+
+def retry_after_seconds(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds a ``Retry-After`` header asks us to wait.
+
+    Accepts both forms of the header: delay-seconds and an HTTP date.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now if now is not None else datetime.now(timezone.utc).timestamp()
+    return max(0.0, when.timestamp() - now)
+
+
+class _HostState:
+    """Token bucket, adaptive concurrency limit and fair queue of one host."""
+
+    def __init__(self, limit: HostLimit):
+        self.limit = limit
+        self.rate = limit.requests_per_second
+        self.tokens = float(limit.burst)
+        self.refilled = time.monotonic()
+        # Start halfway and let additive increase find the ceiling
+        self.concurrency = max(float(limit.min_concurrency), limit.max_concurrency / 2)
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        self.last_decrease = 0.0
+        self.throttled = 0
+        self.granted = 0
+        self.condition = threading.Condition()
+        # Waiting tickets per flow; the flow at the front is served next
+        self.flows: 'OrderedDict[Hashable, Deque[object]]' = OrderedDict()
+
+    def refill(self, now: float):
+        self.tokens = min(float(self.limit.burst), self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+
+    def next_ticket(self) -> Optional[object]:
+        for tickets in self.flows.values():
+            return tickets[0]
+        return None
+
+    def dequeue(self, flow: Hashable, ticket: object):
+        tickets = self.flows.get(flow)
+        if tickets is None:
+            return
+        if tickets and tickets[0] is ticket:
+            tickets.popleft()
+            # Round robin: a flow that still has requests waits behind the others
+            if tickets:
+                self.flows.move_to_end(flow)
+        else:
+            try:
+                tickets.remove(ticket)
+            except ValueError:
+                pass
+        if not tickets:
+            del self.flows[flow]
+
+    def wait_time(self, now: float) -> Optional[float]:
+        """Seconds until the head of the queue could go, or None when it waits for a release."""
+        if now < self.cooldown_until:
+            return self.cooldown_until - now
+        if self.in_flight >= int(self.concurrency):
+            return None
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        return 0.0
+
+
+class Permit:
+    """One granted request; report its outcome with ``record``."""
+
+    __slots__ = ('host', 'started', 'status', 'retry_after')
+
+    def __init__(self, host: str):
+        self.host = host
+        self.started = time.monotonic()
+        self.status: Optional[int] = None
+        self.retry_after: Optional[float] = None
+
+    def record(self, response: requests.Response):
+        """Remember the response status and any ``Retry-After`` it carried."""
+        self.status = response.status_code
+        self.retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+
+
+class RateLimiter:
+    """
+    Per-host adaptive rate limiter for retailer requests.
+
+    Each host gets a token bucket (sustained rate plus burst) and an
+    in-flight limit that adapts AIMD-style: every successful response raises
+    it by ``1 / limit`` (about one per round trip of the whole window) up to
+    ``max_concurrency``, every 429/503 halves it and the refill rate, and a
+    ``Retry-After`` pauses the host until it has passed. The rate recovers
+    additively towards the configured one as responses succeed again.
+
+    Waiting requests are queued per flow (the search query) and served
+    round robin, so one large bill of materials can't starve an interactive
+    lookup behind it. With ``enabled=False`` every request goes straight
+    through.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, HostLimit]] = None,
+        default: Optional[HostLimit] = None,
+        max_wait: float = 30.0,
+        decrease_factor: float = 0.5,
+        default_cooldown: float = 1.0,
+        enabled: Optional[bool] = None,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            limits: Budgets keyed by host (``www.homedepot.com``)
+            default: Budget of hosts without an entry in ``limits``
+            max_wait: Seconds a request may queue before ``RateLimited`` is raised
+            decrease_factor: Multiplier applied to the in-flight limit and rate on a 429/503
+            default_cooldown: Seconds a host is paused after a 429/503 without ``Retry-After``
+            enabled: Throttle at all; defaults to the RATE_LIMIT env var (0 disables)
+        """
+        self.limits = limits or {}
+        self.default = default or HostLimit()
+        self.max_wait = max_wait
+        self.decrease_factor = decrease_factor
+        self.default_cooldown = default_cooldown
+        self.enabled = enabled if enabled is not None else os.environ.get('RATE_LIMIT', '1') != '0'
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_adapters(cls, adapters: Dict, **kwargs) -> 'RateLimiter':
+        """
+        Limiter with the budgets declared by store adapters.
+
+        Args:
+            adapters: Store adapters keyed by name, e.g. ``STORE_ADAPTERS``
+            **kwargs: Passed to ``RateLimiter``
+        """
+        limits = {
+            urlparse(adapter.base_url).netloc: HostLimit(
+                requests_per_second=adapter.requests_per_second,
+                burst=adapter.burst,
+                max_concurrency=adapter.max_concurrency,
+            )
+            for adapter in adapters.values()
+        }
+        return cls(limits, **kwargs)
+
+    def _state(self, host: str) -> _HostState:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState(self.limits.get(host, self.default))
+            return state
+
+    @contextmanager
+    def slot(self, url: str, flow: Hashable = None) -> Iterator[Permit]:
+        """
+        Wait for the host's budget, then hold one in-flight slot for the block.
+
+        Args:
+            url: URL about to be requested; its host selects the budget
+            flow: Queue the request is fair-queued in, usually the search query
+
+        Raises:
+            RateLimited: The request would have to wait longer than ``max_wait``
+
+        Example:
+            with limiter.slot(url, flow=query) as permit:
+                response = session.get(url)
+                permit.record(response)
+        """
+        host = urlparse(url).netloc
+        if not self.enabled:
+            yield Permit(host)
+            return
+
+        state = self._state(host)
+        permit = self._acquire(state, host, flow)
+        try:
+            yield permit
+        finally:
+            self._release(state, permit)
+
+    def _acquire(self, state: _HostState, host: str, flow: Hashable) -> Permit:
+        ticket = object()
+        queued = time.monotonic()
+        deadline = queued + self.max_wait
+        with state.condition:
+            state.flows.setdefault(flow, deque()).append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    state.refill(now)
+                    wait = state.wait_time(now)
+                    if wait == 0.0 and state.next_ticket() is ticket:
+                        break
+                    if now + (wait or 0.0) > deadline:
+                        metrics.inc('rate_limit_rejected_total', host=host)
+                        raise RateLimited(f"{host} is throttling requests; gave up after waiting {now - queued:.1f}s")
+                    state.condition.wait(timeout=wait if wait else deadline - now)
+            finally:
+                state.dequeue(flow, ticket)
+                # The next flow's head may be able to go right away
+                state.condition.notify_all()
+
+            state.tokens -= 1
+            state.in_flight += 1
+            state.granted += 1
+
+        metrics.observe('rate_limit_wait_seconds', time.monotonic() - queued, host=host)
+        return Permit(host)
+
+    def _release(self, state: _HostState, permit: Permit):
+        with state.condition:
+            state.in_flight -= 1
+            limit = state.limit
+            if permit.status in THROTTLE_STATUSES:
+                state.throttled += 1
+                now = time.monotonic()
+                cooldown = permit.retry_after if permit.retry_after is not None else self.default_cooldown
+                state.cooldown_until = max(state.cooldown_until, now + cooldown)
+                # Requests that were already in flight when we backed off report the
+                # same congestion; decrease once per episode, not once per response
+                if permit.started >= state.last_decrease:
+                    state.concurrency = max(float(limit.min_concurrency), state.concurrency * self.decrease_factor)
+                    state.rate = max(limit.requests_per_second / 10, state.rate * self.decrease_factor)
+                    state.last_decrease = now
+            elif permit.status is not None and permit.status < 500:
+                state.concurrency = min(float(limit.max_concurrency), state.concurrency + 1 / state.concurrency)
+                state.rate = min(limit.requests_per_second, state.rate + limit.requests_per_second / 20)
+            state.condition.notify_all()
+
+        if permit.status in THROTTLE_STATUSES:
+            metrics.inc('throttled_total', host=permit.host, status=permit.status)
+            print(
+                f"🚦 {permit.host} answered {permit.status}; backing off to "
+                f"{int(state.concurrency)} concurrent, {state.rate:.2f} req/s"
+            )
+
+    @property
+    def stats(self) -> Dict[str, Dict]:
+        """Current limit, rate, queue length and throttle count per host."""
+        with self._lock:
+            states = dict(self._hosts)
+        stats = {}
+        for host, state in states.items():
+            with state.condition:
+                stats[host] = {
+                    'concurrency': int(state.concurrency),
+                    'requests_per_second': round(state.rate, 3),
+                    'in_flight': state.in_flight,
+                    'queued': sum(len(tickets) for tickets in state.flows.values()),
+                    'granted': state.granted,
+                    'throttled': state.throttled,
+                    'cooldown': round(max(0.0, state.cooldown_until - time.monotonic()), 3),
+                }
+        return stats
@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+from .pricing import price_to_cents
+
+# Columns of a scrape DataFrame before the delivery columns are derived
+RECORD_COLUMNS = ['store', 'name', 'url', 'price_cents', 'delivery_text', 'delivery_price_cents', 'timestamp']
+
+
+@dataclass(slots=True)
+class ProductRecord:
+    """
+    One product as parsed from a results page.
+
+    Prices are integer cents and the delivery text is lower-cased and
+    whitespace-collapsed, so equal options compare equal. There is no
+    per-product timestamp: the records of one store's search share the
+    time it was scraped (see :func:`records_to_frame`).
+    """
+    store: str
+    name: str
+    url: str
+    price_cents: Optional[int] = None
+    delivery_text: str = ''
+    delivery_price_cents: int = 0
+
+    @classmethod
+    def from_dict(cls, product: Dict) -> 'ProductRecord':
+        """Build a record from its dict form, or from a product dict with price strings."""
+        price_cents = product.get('price_cents')
+        if price_cents is None and 'price' in product:
+            price_cents = price_to_cents(product['price'])
+        delivery_price_cents = product.get('delivery_price_cents')
+        if delivery_price_cents is None:
+            delivery_price_cents = price_to_cents(product.get('delivery_price')) or 0
+        return cls(
+            store=product['store'],
+            name=product['name'],
+            url=product['url'],
+            price_cents=None if price_cents is None else int(price_cents),
+            delivery_text=' '.join(str(product.get('delivery_text') or '').lower().split()),
+            delivery_price_cents=int(delivery_price_cents),
+        )
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form, as stored in the search cache and change snapshots."""
+        return {
+            'store': self.store,
+            'name': self.name,
+            'url': self.url,
+            'price_cents': self.price_cents,
+            'delivery_text': self.delivery_text,
+            'delivery_price_cents': self.delivery_price_cents,
+        }
+
+
+def records_to_frame(
+    records: Sequence[ProductRecord],
+    scraped_at: Union[datetime, Dict[str, datetime], None] = None,
+    stores: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """
+    Build a columnar scrape DataFrame from records in one pass per column.
+
+    ``store`` and ``delivery_text`` become categoricals (a handful of
+    distinct values repeated on every row), prices nullable Int64 cents and
+    ``timestamp`` the time each store's results were scraped, gathered by
+    store code. The latest of those times is kept in ``df.attrs['scraped_at']``.
+
+    Args:
+        records: Parsed products
+        scraped_at: Time of the scrape, or per store name (a cached search
+            keeps the time it was originally scraped); defaults to now
+        stores: Store categories, e.g. every configured store so frames from
+            different scrapes share one dtype; defaults to the stores present
+
+    Returns:
+        pd.DataFrame: One row per record with :data:`RECORD_COLUMNS`
+    """
+    per_store = scraped_at if isinstance(scraped_at, dict) else {}
+    default = scraped_at if isinstance(scraped_at, datetime) else datetime.now()
+    categories = list(dict.fromkeys(stores)) if stores is not None else []
+    codes = {store: code for code, store in enumerate(categories)}
+    store_codes = np.empty(len(records), dtype=np.int16)
+    for i, record in enumerate(records):
+        code = codes.get(record.store)
+        if code is None:
+            code = codes[record.store] = len(categories)
+            categories.append(record.store)
+        store_codes[i] = code
+
+    # Prices go straight into a masked Int64 array; -1 marks a missing price
+    price_cents = np.fromiter(
+        (-1 if record.price_cents is None else record.price_cents for record in records),
+        dtype=np.int64, count=len(records),
+    )
+
+    # One time per store category, gathered by code like the categorical itself
+    times = np.array(
+        [np.datetime64(per_store.get(store, default), 'ns') for store in categories], dtype='datetime64[ns]'
+    )
+
+    df = pd.DataFrame({
+        'store': pd.Categorical.from_codes(store_codes, dtype=pd.CategoricalDtype(categories)),
+        'name': [record.name for record in records],
+        'url': [record.url for record in records],
+        'price_cents': pd.arrays.IntegerArray(price_cents, price_cents < 0),
+        'delivery_text': pd.Categorical([record.delivery_text for record in records]),
+        'delivery_price_cents': np.fromiter(
+            (record.delivery_price_cents for record in records), dtype=np.int64, count=len(records)
+        ),
+        'timestamp': times[store_codes],
+    }, columns=RECORD_COLUMNS)
+    df.attrs['scraped_at'] = max(per_store.values(), default=default).isoformat()
+    return df
+
@@ -1,9 +1,26 @@
-from typing import Dict, List
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 from datetime import datetime
 import os
+import queue
+import threading
+import contextvars
+import time
+from .cache import ScrapeCache
+from .catalog import CatalogIndex
+from .changes import ChangeTracker
+from .delivery import add_delivery_columns
+from .history import PriceHistory
+from .metrics import metrics
+from .parse_pool import ParsePool
+from .parsing import HtmlParser, extract_products
+from .ratelimit import RateLimited, RateLimiter
+from .records import ProductRecord, records_to_frame
+from .stores import STORE_ADAPTERS, StoreAdapter
+from .transport import HttpTransport
 
 class ProcurementScraper:
     """
@@ -14,229 +31,459 @@ class ProcurementScraper:
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
 
-    def __init__(self, output_dir: str = 'data'):
-        """Initialize the scraper with output directory."""
+    # Default per-store deadline (seconds) used by the concurrent fan-out
+    DEFAULT_STORE_TIMEOUT = 30.0
+
+    def __init__(
+        self,
+        output_dir: str = 'data',
+        adapters: Optional[Dict[str, StoreAdapter]] = None,
+        store_timeouts: Optional[Dict[str, float]] = None,
+        transport: Optional[HttpTransport] = None,
+        cache: Optional[ScrapeCache] = None,
+        use_cache: bool = True,
+        parser: Optional[HtmlParser] = None,
+        history: Optional[PriceHistory] = None,
+        changes: Optional[ChangeTracker] = None,
+        catalog: Optional[CatalogIndex] = None,
+        parse_pool: Optional[ParsePool] = None,
+    ):
+        """
+        Initialize the scraper with output directory.
+
+        Args:
+            output_dir: Directory where scrape results are saved
+            adapters: Store adapters to query; defaults to every store in
+                ``config/stores.yaml``
+            store_timeouts: Optional per-store deadlines in seconds, keyed by store name
+            transport: Shared HTTP transport; a pooled one with default timeouts,
+                retries and a per-host rate limiter built from the adapters'
+                budgets is created when omitted
+            cache: Search result cache; one is created under ``output_dir`` when
+                omitted and ``use_cache`` is set
+            use_cache: Serve repeated searches from the cache instead of the stores
+            parser: HTML parser engine; defaults to the fastest installed backend
+            history: Price history store; defaults to a partitioned Parquet
+                dataset under ``output_dir/history``
+            changes: Change tracker used by incremental refreshes
+            catalog: Searchable index every scrape is added to; defaults to
+                ``output_dir/catalog.sqlite``
+            parse_pool: Worker processes to parse pages in, for bulk runs where
+                parsing would otherwise hold every fetch thread to one core;
+                pages are parsed in-process when omitted
+        """
         self.output_dir = output_dir
+        self.adapters = adapters if adapters is not None else STORE_ADAPTERS
+        self.transport = transport or HttpTransport(
+            headers=self.HEADERS, rate_limiter=RateLimiter.from_adapters(self.adapters)
+        )
+        self.store_timeouts = store_timeouts or {}
+        self.last_store_status: Dict[str, Dict] = {}
         os.makedirs(output_dir, exist_ok=True)
+        if cache is None and use_cache:
+            cache = ScrapeCache(path=os.path.join(output_dir, 'scrape_cache.sqlite'))
+        self.cache = cache
+        self.parser = parser or HtmlParser()
+        self.history = history or PriceHistory(root=os.path.join(output_dir, 'history'))
+        self.changes = changes or ChangeTracker(path=os.path.join(output_dir, 'changes.sqlite'))
+        self.catalog = catalog or CatalogIndex(path=os.path.join(output_dir, 'catalog.sqlite'))
+        self.parse_pool = parse_pool
+
+    @property
+    def stores(self) -> Dict[str, Callable]:
+        """All configured stores, mapped to the method that scrapes them."""
+        return {name: partial(self.scrape_adapter, adapter) for name, adapter in self.adapters.items()}
+
+    def scrape_store(self, store: str, product: str) -> Tuple[List[ProductRecord], datetime, bool]:
+        """
+        Scrape a single store, serving the search from the cache when possible.
 
-    def _parse_delivery_options(self, delivery_element) -> Dict[str, str]:
-        """Parse delivery options from the delivery element."""
-        try:
-            # This is a simplified example - actual implementation will depend on the website structure
-            delivery_text = delivery_element.get_text(' ', strip=True).lower()
-
-            # Extract delivery date if available
-            delivery_date = None
-            if 'delivery' in delivery_text or 'arrives' in delivery_text:
-                # Look for date patterns like 'by Mon, May 20' or 'on 05/20'
-                import re
-                date_patterns = [
-                    r'(?:by|on)\s+(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)[a-z]*,?\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2}',
-                    r'\d{1,2}/\d{1,2}(?:/\d{2,4})?',
-                    r'(?:in\s+)?(\d+)\s*(?:-\s*\d+)?\s*(?:day|business day|week)'
-                ]
-
-                for pattern in date_patterns:
-                    match = re.search(pattern, delivery_text)
-                    if match:
-                        delivery_date = match.group(0)
-                        break
+        Args:
+            store: Name of a configured store
+            product: The product to search for
 
-            # Estimate delivery speed
-            delivery_speed = 'standard'
-            if 'same day' in delivery_text or 'today' in delivery_text:
-                delivery_speed = 'same_day'
-            elif 'next day' in delivery_text or '1 day' in delivery_text:
-                delivery_speed = 'next_day'
-            elif '2 day' in delivery_text or '2-day' in delivery_text:
-                delivery_speed = 'two_day'
-
-            return {
-                'delivery_text': delivery_text,
-                'delivery_date': delivery_date,
-                'delivery_speed': delivery_speed,
-                'delivery_price': '0.00'  # This would be extracted from the page
-            }
-        except Exception as e:
-            print(f"Error parsing delivery options: {e}")
-            return {}
+        Returns:
+            Tuple[List[ProductRecord], datetime, bool]: Products found, when
+            they were scraped (a cached search keeps its original scrape time)
+            and whether this call scraped them rather than the cache
+        """
+        scrape = self.stores[store]
+        if self.cache is None:
+            return scrape(product), datetime.now(), True
+        cached, fetched_at, fetched = self.cache.get_or_fetch(
+            store, product, lambda query: [record.to_dict() for record in scrape(query)]
+        )
+        records = [ProductRecord.from_dict(product_data) for product_data in cached]
+        return records, datetime.fromtimestamp(fetched_at), fetched
+
+    def _parse_page(self, adapter: StoreAdapter, content: bytes) -> List[ProductRecord]:
+        """
+        Parse the products on a search results page of any store.
+
+        Pages go to the parse pool's worker processes when the scraper has
+        one, and are parsed in this process otherwise.
+
+        Args:
+            adapter: The store the page belongs to
+            content: Raw response body of the results page
 
-    def scrape_home_depot(self, product: str) -> List[Dict]:
+        Returns:
+            List[ProductRecord]: Products on the page, in page order
+        """
+        with metrics.span('scrape.parse', store=adapter.name) as span:
+            if self.parse_pool is not None:
+                page = self.parse_pool.parse(adapter, content)
+            else:
+                page = extract_products(adapter, content, self.parser)
+            span.set(bytes=len(content), products=len(page.records), worker=self.parse_pool is not None)
+        metrics.inc('products_parsed_total', len(page.records), store=adapter.name)
+        if page.errors:
+            metrics.inc('parse_errors_total', page.errors, store=adapter.name)
+        if not page.containers:
+            metrics.inc('empty_pages_total', store=adapter.name)
+        return page.records
+
+    def scrape_adapter(self, adapter: StoreAdapter, product: str) -> List[ProductRecord]:
         """
-        Scrape product data from Home Depot.
-        
+        Scrape the first page of product data from a store.
+
         Args:
+            adapter: The store to search
             product: The product to search for
-            
+
         Returns:
-            List[Dict]: List of product dictionaries with detailed information
+            List[ProductRecord]: Products on the first results page
         """
         try:
-            base_url = "https://www.homedepot.com"
-            search_url = f"{base_url}/s/{product.replace(' ', '%20')}"
+            print(f"\n🔍 Searching {adapter.name} for: {product}")
+            with metrics.span('scrape.fetch', store=adapter.name) as span:
+                response = self.transport.get(adapter.url(product), flow=product)
+                span.set(http_status=response.status_code, bytes=len(response.content))
+                response.raise_for_status()
+
+            products = self._parse_page(adapter, response.content)
 
-            print(f"\n🔍 Searching Home Depot for: {product}")
-            response = requests.get(search_url, headers=self.HEADERS)
+            print(f"✅ Successfully scraped {len(products)} products from {adapter.name}")
+            return products
+
+        except RateLimited as e:
+            print(f"🚦 {adapter.name} is rate limiting us: {str(e)}")
+            metrics.inc('fetch_errors_total', store=adapter.name, kind=type(e).__name__)
+            return []
+        except requests.RequestException as e:
+            print(f"❌ Error accessing {adapter.name}: {str(e)}")
+            metrics.inc('fetch_errors_total', store=adapter.name, kind=type(e).__name__)
+            return []
+        except Exception as e:
+            print(f"❌ Unexpected error while scraping {adapter.name}: {str(e)}")
+            metrics.inc('fetch_errors_total', store=adapter.name, kind=type(e).__name__)
+            return []
+
+    def scrape_home_depot(self, product: str) -> List[ProductRecord]:
+        """Scrape the first page of product data from Home Depot."""
+        return self.scrape_adapter(self.adapters['Home Depot'], product)
+
+    def scrape_lowes(self, product: str) -> List[ProductRecord]:
+        """Scrape the first page of product data from Lowe's."""
+        return self.scrape_adapter(self.adapters["Lowe's"], product)
+
+    def _fetch_page(self, url: str, flow: Optional[str] = None) -> bytes:
+        """Fetch one results page and return its raw body."""
+        with metrics.span('scrape.fetch_page') as span:
+            response = self.transport.get(url, flow=flow)
+            span.set(http_status=response.status_code, bytes=len(response.content))
             response.raise_for_status()
+        return response.content
+
+    def iter_products(self, store: str, product: str, max_pages: int = 5) -> Iterator[ProductRecord]:
+        """
+        Stream products from a store, following pagination.
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            products = []
+        The next page is fetched in the background while the current one is
+        parsed, and products are yielded as soon as their page is parsed, so
+        callers can start working on the first results immediately and deep
+        sweeps never hold more than two pages in memory. Results are not
+        cached.
 
-            # Find all product containers (update selector based on actual site structure)
-            product_containers = soup.select('.product-pod--default, .product-pod')
+        Args:
+            store: Name of a configured store
+            product: The product to search for
+            max_pages: Maximum number of result pages to read
 
-            if not product_containers:
-                print("⚠️ No products found on the page. The site structure might have changed.")
-                return products
+        Yields:
+            ProductRecord: Products in result order
+        """
+        adapter = self.adapters[store]
+        seen_urls = set()
 
-            print(f"Found {len(product_containers)} products on the first page")
+        prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prefetch')
+        try:
+            print(f"\n🔍 Streaming {store} results for: {product}")
+            pending = prefetcher.submit(self._fetch_page, adapter.url(product, 0), product)
 
-            for item in product_containers:
+            for page in range(max_pages):
                 try:
-                    # Extract product URL
-                    link_element = item.select_one('a[data-testid="product-title"]')
-                    if not link_element or 'href' not in link_element.attrs:
+                    content = pending.result()
+                except requests.RequestException as e:
+                    print(f"❌ Error accessing {store} (page {page + 1}): {str(e)}")
+                    return
+
+                # Start downloading the next page before parsing this one
+                if page + 1 < max_pages:
+                    pending = prefetcher.submit(self._fetch_page, adapter.url(product, page + 1), product)
+
+                new_products = 0
+                for product_data in self._parse_page(adapter, content):
+                    # Retailers repeat sponsored items across pages
+                    if product_data.url in seen_urls:
                         continue
+                    seen_urls.add(product_data.url)
+                    new_products += 1
+                    yield product_data
 
-                    # Ensure we have a clean, absolute URL
-                    product_url = self._ensure_absolute_url(
-                        link_element['href'], 
-                        'https://www.homedepot.com'
-                    )
-
-                    # Extract product name
-                    name = link_element.get_text(strip=True)
-
-                    # Extract price
-                    price_element = item.select_one('.price-format__main-price')
-                    price = price_element.get_text(strip=True) if price_element else 'Price not available'
-
-                    # Get delivery information
-                    delivery_element = item.select_one('.delivery-options, .delivery__subtitle')
-                    delivery_info = self._parse_delivery_options(delivery_element) if delivery_element else {}
-
-                    # Construct product data
-                    product_data = {
-                        'store': 'Home Depot',
-                        'name': name,
-                        'url': product_url,
-                        'price': price,
-                        'timestamp': datetime.now().isoformat(),
-                        **delivery_info
-                    }
+                # An empty or fully repeated page means we ran past the last one
+                if not new_products:
+                    return
+        finally:
+            prefetcher.shutdown(wait=False, cancel_futures=True)
 
-                    products.append(product_data)
+    def stream_all_stores(self, product: str, max_pages: int = 1) -> Iterator[ProductRecord]:
+        """
+        Stream products from every configured store as they are parsed.
 
-                except Exception as e:
-                    print(f"⚠️ Error parsing product: {str(e)}")
-                    continue
+        Stores are read in parallel and their products are interleaved in
+        arrival order.
 
-            print(f"✅ Successfully scraped {len(products)} products from Home Depot")
-            return products
-
-        except requests.RequestException as e:
-            print(f"❌ Error accessing Home Depot: {str(e)}")
-            return []
-        except Exception as e:
-            print(f"❌ Unexpected error while scraping Home Depot: {str(e)}")
-            return []
+        Args:
+            product: The product to search for
+            max_pages: Maximum number of result pages to read per store
 
-    def scrape_lowes(self, product: str) -> List[Dict]:
+        Yields:
+            ProductRecord: Products from any store
         """
-        Scrape product data from Lowe's.
-        
+        results: queue.Queue = queue.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def drain(store: str):
+            try:
+                for product_data in self.iter_products(store, product, max_pages):
+                    if stop.is_set():
+                        break
+                    results.put(product_data)
+            except Exception as e:
+                print(f"❌ Unexpected error while scraping {store}: {str(e)}")
+            finally:
+                results.put(done)
+
+        stores = list(self.adapters)
+        executor = ThreadPoolExecutor(max_workers=len(stores), thread_name_prefix='stream')
+        try:
+            for store in stores:
+                executor.submit(drain, store)
+
+            remaining = len(stores)
+            while remaining:
+                item = results.get()
+                if item is done:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            # The consumer may stop early; let the store threads wind down on their own
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def refresh_store(self, store: str, product: str) -> Dict[str, List[Dict]]:
+        """
+        Re-scrape a store and report only what changed since the last refresh.
+
+        The results page is requested conditionally (ETag / If-Modified-Since)
+        when the store sent validators before; a 304 means nothing changed and
+        skips parsing entirely. Otherwise products are compared by content
+        hash against the last snapshot.
+
         Args:
+            store: Name of a configured store
             product: The product to search for
-            
+
         Returns:
-            List[Dict]: List of product dictionaries with detailed information
+            Dict[str, List[Dict]]: 'new', 'removed' and 'changed' products
         """
-        try:
-            base_url = "https://www.lowes.com"
-            search_url = f"{base_url}/search?searchTerm={product.replace(' ', '%20')}"
+        adapter = self.adapters[store]
+        search_url = adapter.url(product)
+        unchanged = {'new': [], 'removed': [], 'changed': []}
 
-            print(f"\n🔍 Searching Lowe's for: {product}")
-            response = requests.get(search_url, headers=self.HEADERS)
+        try:
+            response = self.transport.get(
+                search_url, flow=product, headers=self.changes.conditional_headers(search_url)
+            )
+            if response.status_code == 304:
+                print(f"♻️ {store} results for '{product}' not modified")
+                return unchanged
             response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"❌ Error accessing {store}: {str(e)}")
+            return unchanged
+
+        products = self._parse_page(adapter, response.content)
+        if not products:
+            # A failed parse shouldn't report the whole listing as removed
+            return unchanged
+        self.changes.save_validators(search_url, response)
+
+        changes = self.changes.diff(store, product, [record.to_dict() for record in products])
+        print(
+            f"✅ {store}: {len(changes['new'])} new, {len(changes['changed'])} changed, "
+            f"{len(changes['removed'])} removed"
+        )
+        return changes
+
+    def refresh_watch_list(self, queries: List[str]) -> pd.DataFrame:
+        """
+        Incrementally refresh a list of standing searches across all stores.
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            products = []
+        Args:
+            queries: Products to re-check
 
-            # Find all product containers (update selector based on actual site structure)
-            product_containers = soup.select('.product-item, .product-wrapper')
+        Returns:
+            pd.DataFrame: One row per new, removed or changed product with
+            ``query`` and ``change`` columns
+        """
+        rows = []
+        with ThreadPoolExecutor(max_workers=len(self.stores), thread_name_prefix='refresh') as executor:
+            for query in queries:
+                futures = {store: executor.submit(self.refresh_store, store, query) for store in self.stores}
+                for store, future in futures.items():
+                    for change, products in future.result().items():
+                        rows.extend({**product, 'query': query, 'change': change} for product in products)
+        return pd.DataFrame(rows)
+
+    def _fan_out(self, product: str, stores: List[str]) -> Dict[str, Dict]:
+        """
+        Query every store in parallel, each bounded by its own deadline.
 
-            if not product_containers:
-                print("⚠️ No products found on the page. The site structure might have changed.")
-                return products
+        Args:
+            product: The product to search for
+            stores: Names of the stores to query
 
-            print(f"Found {len(product_containers)} products on the first page")
+        Returns:
+            Dict[str, Dict]: Per-store result with 'status', 'products',
+            'scraped_at' (None when the store failed), 'fetched' and 'elapsed'
+        """
+        results = {}
+        executor = ThreadPoolExecutor(max_workers=len(stores), thread_name_prefix='scrape')
+        try:
+            started = time.monotonic()
+            # Each worker runs in a copy of the caller's context so spans keep the request id
+            futures = {
+                name: executor.submit(contextvars.copy_context().run, self.scrape_store, name, product)
+                for name in stores
+            }
 
-            for item in product_containers:
+            # Collect in deadline order so each store is only waited on until its own deadline
+            deadlines = {
+                name: self.store_timeouts.get(name, self.DEFAULT_STORE_TIMEOUT)
+                for name in futures
+            }
+            for name in sorted(futures, key=deadlines.get):
+                remaining = max(0.0, deadlines[name] - (time.monotonic() - started))
                 try:
-                    # Extract product URL
-                    link_element = item.select_one('a[data-selector="product-title"]')
-                    if not link_element or 'href' not in link_element.attrs:
-                        continue
-
-                    # Ensure we have a clean, absolute URL
-                    product_url = self._ensure_absolute_url(
-                        link_element['href'], 
-                        'https://www.lowes.com'
-                    )
-
-                    # Extract product name
-                    name = link_element.get_text(strip=True)
-
-                    # Extract price
-                    price_element = item.select_one('.primary')
-                    price = price_element.get_text(strip=True) if price_element else 'Price not available'
-
-                    # Get delivery information
-                    delivery_element = item.select_one('.delivery-options, .delivery__subtitle')
-                    delivery_info = self._parse_delivery_options(delivery_element) if delivery_element else {}
-
-                    # Construct product data
-                    product_data = {
-                        'store': "Lowe's",
-                        'name': name,
-                        'url': product_url,
-                        'price': price,
-                        'timestamp': datetime.now().isoformat(),
-                        **delivery_info
-                    }
+                    products, scraped_at, fetched = futures[name].result(timeout=remaining)
+                    status = 'ok' if products else 'empty'
+                except FutureTimeoutError:
+                    futures[name].cancel()
+                    print(f"⏱️ {name} did not respond within {deadlines[name]:.0f}s, returning partial results")
+                    products, scraped_at, fetched, status = [], None, False, 'timeout'
+                except Exception as e:
+                    print(f"❌ Unexpected error while scraping {name}: {str(e)}")
+                    products, scraped_at, fetched, status = [], None, False, 'error'
+
+                results[name] = {
+                    'status': status,
+                    'products': products,
+                    'scraped_at': scraped_at,
+                    'fetched': fetched,
+                    'elapsed': round(time.monotonic() - started, 3),
+                }
+        finally:
+            # Don't block on stores that overran their deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results
+
+    def scrape_all_stores(
+        self,
+        product: str,
+        concurrent: bool = True,
+        stores: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Scrape product data from all configured stores.
 
-                    products.append(product_data)
+        Args:
+            product: The product to search for
+            concurrent: Query all stores in parallel (worst-case latency is the
+                slowest store) instead of one after the other
+            stores: Only query these stores; defaults to every configured store
 
-                except Exception as e:
-                    print(f"⚠️ Error parsing product: {str(e)}")
-                    continue
+        Returns:
+            pd.DataFrame: All products found (see ``records_to_frame``: categorical
+            ``store``, Int64 ``price_cents``, a ``timestamp`` per store: when its
+            results were scraped, even if served from the cache), with
+            normalized delivery columns (``delivery_earliest``, ``delivery_latest``,
+            ``delivery_days``, ``delivery_speed``). Per-store status is available in
+            ``df.attrs['store_status']`` and ``self.last_store_status``.
+        """
+        with metrics.span('scrape.all_stores', concurrent=concurrent) as span:
+            all_products = []
+            names = [name for name in self.stores if stores is None or name in stores]
+
+            if concurrent and names:
+                results = self._fan_out(product, names)
+            else:
+                results = {}
+                for name in names:
+                    started = time.monotonic()
+                    products, scraped_at, fetched = self.scrape_store(name, product)
+                    results[name] = {
+                        'status': 'ok' if products else 'empty',
+                        'products': products,
+                        'scraped_at': scraped_at,
+                        'fetched': fetched,
+                        'elapsed': round(time.monotonic() - started, 3),
+                    }
 
-            print(f"✅ Successfully scraped {len(products)} products from Lowe's")
-            return products
+            # Keep store order stable regardless of completion order
+            for name in names:
+                all_products.extend(results[name]['products'])
+                metrics.inc('store_results_total', store=name, status=results[name]['status'])
 
-        except requests.RequestException as e:
-            print(f"❌ Error accessing Lowe's: {str(e)}")
-            return []
-        except Exception as e:
-            print(f"❌ Unexpected error while scraping Lowe's: {str(e)}")
-            return []
+            self.last_store_status = {
+                name: {'status': result['status'], 'count': len(result['products']), 'elapsed': result['elapsed']}
+                for name, result in results.items()
+            }
 
-    def scrape_all_stores(self, product: str) -> pd.DataFrame:
-        """Scrape product data from all configured stores."""
-        all_products = []
+            # Build the columnar batch (a scrape time per store, categorical
+            # stores) and resolve delivery dates/speed for all of it at once
+            scraped_at = {name: result['scraped_at'] for name, result in results.items() if result['scraped_at']}
+            with metrics.span('scrape.delivery'):
+                df = add_delivery_columns(records_to_frame(all_products, scraped_at, stores=self.adapters))
+            df.attrs['store_status'] = self.last_store_status
 
-        # Scrape from each store
-        all_products.extend(self.scrape_home_depot(product))
-        all_products.extend(self.scrape_lowes(product))
+            # Only stores scraped by this call are new observations; results
+            # served from the cache were recorded when they were fetched
+            fetched = [name for name, result in results.items() if result['fetched']]
+            observed = df if len(fetched) == len(results) else df[df['store'].isin(fetched)]
 
-        # Convert to DataFrame
-        df = pd.DataFrame(all_products)
+            # Record prices in the history store (batched, partitioned by store and date)
+            with metrics.span('scrape.history'):
+                self.history.append(observed, product)
 
-        # Save to CSV
-        if not df.empty:
-            filename = f"{self.output_dir}/procurement_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            df.to_csv(filename, index=False)
-            print(f"Data saved to {filename}")
+            # Keep the local catalog current so earlier results can be searched offline
+            with metrics.span('scrape.catalog'):
+                self.catalog.add(observed, product)
+            span.set(products=len(df))
 
         return df
 
@@ -244,4 +491,5 @@ class ProcurementScraper:
 if __name__ == "__main__":
     scraper = ProcurementScraper()
     results = scraper.scrape_all_stores("2x4x8 lumber")
+    scraper.history.close()
     print(f"Found {len(results)} products")
\ No newline at end of file
@@ -0,0 +1,83 @@
+from crewai.tools import BaseTool
+from typing import Any, List, Optional, Type
+from pydantic import BaseModel, Field
+import json
+
+# Only what the analyst needs; everything else stays out of the context window
+OUTPUT_FIELDS = ['store', 'name', 'price', 'delivery_speed', 'delivery_days', 'url']
+
+
+class ScrapeProductsToolInput(BaseModel):
+    """Input schema for ScrapeProductsTool."""
+    product: str = Field(..., description="The product to search for, e.g. '2x4x8 pressure treated lumber'.")
+    stores: Optional[List[str]] = Field(
+        None, description="Only these stores (e.g. ['Home Depot']). Defaults to all stores."
+    )
+    max_delivery_days: Optional[int] = Field(
+        None, description="Skip products known to arrive later than this many days."
+    )
+    top_k: int = Field(10, description="Maximum number of products to return, cheapest first.")
+
+
+class ScrapeProductsTool(BaseTool):
+    name: str = "Search supplier products"
+    description: str = (
+        "Searches Home Depot, Lowe's and the other configured retailers for a product and "
+        "returns live results as compact JSON: store, name, price, delivery speed, days to "
+        "deliver and product URL, cheapest first. Call it once per product."
+    )
+    args_schema: Type[BaseModel] = ScrapeProductsToolInput
+    scraper: Any = Field(default=None, exclude=True)
+    max_chars: int = 4000
+    name_width: int = 80
+
+    def _run(
+        self,
+        product: str,
+        stores: Optional[List[str]] = None,
+        max_delivery_days: Optional[int] = None,
+        top_k: int = 10,
+    ) -> str:
+        # pandas is only imported once the tool is actually used
+        from .pricing import frame_cents
+        from .ranking import format_cents
+        from .stores import resolve_stores
+
+        if stores:
+            # Only the requested stores are queried, however the agent spelled them
+            stores, unknown = resolve_stores(stores, self.scraper.adapters)
+            if unknown:
+                return json.dumps({
+                    'product': product,
+                    'error': f"Unknown stores {unknown}; choose from {list(self.scraper.adapters)}",
+                })
+
+        df = self.scraper.scrape_all_stores(product, stores=stores or None)
+        found = len(df)
+        if df.empty:
+            return json.dumps({'product': product, 'found': 0, 'products': []})
+
+        if max_delivery_days is not None and 'delivery_days' in df:
+            df = df[~(df['delivery_days'] > max_delivery_days)]
+
+        df = df.assign(_cents=frame_cents(df, 'price')).sort_values('_cents', na_position='last').head(top_k)
+        df = df.assign(price=df['_cents'].map(format_cents), store=df['store'].astype(str))
+        df = df[[column for column in OUTPUT_FIELDS if column in df.columns]]
+        df = df.assign(name=df['name'].str.slice(0, self.name_width))
+        if 'delivery_speed' in df:
+            df = df.assign(delivery_speed=df['delivery_speed'].astype(str))
+
+        products = json.loads(df.to_json(orient='records'))
+        return self._compact(product, found, products)
+
+    def _compact(self, product: str, found: int, products: List[dict]) -> str:
+        """Serialize the result, dropping the most expensive products until it fits ``max_chars``."""
+        while True:
+            result = json.dumps(
+                {'product': product, 'found': found, 'returned': len(products), 'products': products},
+                separators=(',', ':'),
+                ensure_ascii=False,
+            )
+            if len(result) <= self.max_chars or not products:
+                return result
+            products = products[:-1]
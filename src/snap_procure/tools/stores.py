@@ -0,0 +1,102 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+import soupsieve
+import yaml
+
+STORES_CONFIG = Path(__file__).resolve().parent.parent / 'config' / 'stores.yaml'
+
+
+@dataclass(frozen=True)
+class StoreAdapter:
+    """
+    A retailer described as data: where to search and how to read a result.
+
+    Selectors are compiled once when the adapter is created and reused for
+    every product container on every page. ``requests_per_second``, ``burst``
+    and ``max_concurrency`` are the host's budget in the scraper's rate limiter.
+    """
+    key: str
+    name: str
+    base_url: str
+    search_url: str
+    page_url: str
+    containers: List[str]
+    title: str
+    price: str
+    delivery: Optional[str] = None
+    page_size: int = 24
+    requests_per_second: float = 2.0
+    burst: int = 4
+    max_concurrency: int = 4
+    title_selector: soupsieve.SoupSieve = field(init=False, repr=False, compare=False)
+    price_selector: soupsieve.SoupSieve = field(init=False, repr=False, compare=False)
+    delivery_selector: Optional[soupsieve.SoupSieve] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'title_selector', soupsieve.compile(self.title))
+        object.__setattr__(self, 'price_selector', soupsieve.compile(self.price))
+        object.__setattr__(
+            self, 'delivery_selector', soupsieve.compile(self.delivery) if self.delivery else None
+        )
+
+    def url(self, query: str, page: int = 0) -> str:
+        """Search URL for a results page (0-based)."""
+        template = self.page_url if page else self.search_url
+        return template.format(query=quote(query), offset=page * self.page_size)
+
+
+def load_store_adapters(path: Path = STORES_CONFIG) -> Dict[str, StoreAdapter]:
+    """
+    Load and compile the store adapters defined in a YAML file.
+
+    Args:
+        path: YAML file of adapters keyed by an identifier
+
+    Returns:
+        Dict[str, StoreAdapter]: Adapters keyed by store display name
+    """
+    with open(path, encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    adapters = [StoreAdapter(key=key, **definition) for key, definition in config.items()]
+    return {adapter.name: adapter for adapter in adapters}
+
+
+# Compiled once at import; every ProcurementScraper shares these
+STORE_ADAPTERS: Dict[str, StoreAdapter] = load_store_adapters()
+
+
+def register_store(adapter: StoreAdapter):
+    """Add (or replace) a store adapter at runtime."""
+    STORE_ADAPTERS[adapter.name] = adapter
+
+
+def store_aliases(adapters: Dict[str, StoreAdapter]) -> Dict[str, str]:
+    """Spellings a user might type for each store ("lowe's", "lowes", "home depot", "homedepot")."""
+    aliases = {}
+    for name, adapter in adapters.items():
+        for alias in (name, adapter.key.replace('_', ' ')):
+            alias = alias.lower()
+            aliases[alias] = name
+            aliases[alias.replace("'", '')] = name
+            aliases[alias.replace("'", '').replace(' ', '')] = name
+    return aliases
+
+
+def resolve_stores(names: List[str], adapters: Dict[str, StoreAdapter]) -> Tuple[List[str], List[str]]:
+    """
+    Map store names as a user or agent typed them to configured store names.
+
+    Args:
+        names: Store names in any spelling known to :func:`store_aliases`
+        adapters: Configured store adapters
+
+    Returns:
+        Tuple[List[str], List[str]]: Resolved store names (deduplicated, in
+        order) and the names that matched no store
+    """
+    aliases = store_aliases(adapters)
+    resolved = [aliases.get(name.strip().lower()) for name in names]
+    unknown = [name for name, store in zip(names, resolved) if store is None]
+    return list(dict.fromkeys(store for store in resolved if store is not None)), unknown
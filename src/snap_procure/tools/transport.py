@@ -0,0 +1,139 @@
+from typing import Dict, Hashable, Optional, Tuple
+import random
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .ratelimit import THROTTLE_STATUSES, RateLimiter
+
+
+def _accept_encoding() -> str:
+    """Advertise brotli only when a decoder is installed, otherwise urllib3 can't decode it."""
+    try:
+        import brotli  # noqa: F401
+        return 'gzip, deflate, br'
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            return 'gzip, deflate, br'
+        except ImportError:
+            return 'gzip, deflate'
+
+
+class JitteredRetry(Retry):
+    """urllib3 Retry with full jitter on top of exponential backoff."""
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return 0
+        return random.uniform(0, backoff)
+
+
+class HttpTransport:
+    """
+    Shared HTTP transport for the store scrapers.
+
+    Wraps a single ``requests.Session`` so every request reuses pooled,
+    keep-alive connections per host, negotiates compression and is bounded
+    by connect/read timeouts and a limited number of jittered retries.
+
+    With a ``rate_limiter`` every request first waits for its host's budget,
+    and 429/503 responses are retried through the limiter instead of inside
+    urllib3, so each one slows the host down and ``Retry-After`` is honoured
+    by every thread, not just the one that got it.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 20.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            headers: Default headers sent with every request
+            connect_timeout: Seconds to wait for the TCP/TLS connection
+            read_timeout: Seconds to wait between bytes of the response
+            max_retries: Retries on connection errors and retryable statuses
+            backoff_factor: Base of the exponential backoff between retries
+            pool_connections: Number of hosts to keep connection pools for
+            pool_maxsize: Connections kept alive per host
+            rate_limiter: Per-host limiter requests wait on; no throttling when omitted
+        """
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter
+        throttled = THROTTLE_STATUSES if rate_limiter is not None and rate_limiter.enabled else frozenset()
+        self.retry = JitteredRetry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=[status for status in self.RETRY_STATUSES if status not in throttled],
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            # urllib3 would otherwise retry 429/503 with Retry-After behind the limiter's back
+            respect_retry_after_header=not throttled,
+            raise_on_status=False,
+        )
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=self.retry,
+        )
+        self._headers = {
+            'Accept-Encoding': _accept_encoding(),
+            'Connection': 'keep-alive',
+            **(headers or {}),
+        }
+        self._session = requests.Session()
+        self._session.headers.update(self._headers)
+        self._session.mount('https://', self._adapter)
+        self._session.mount('http://', self._adapter)
+
+    @property
+    def session(self) -> requests.Session:
+        """The pooled session shared by all store adapters."""
+        return self._session
+
+    def get(self, url: str, flow: Hashable = None, **kwargs) -> requests.Response:
+        """
+        GET a URL through the pooled session.
+
+        Args:
+            url: The URL to fetch
+            flow: Fair-queuing key for the rate limiter, usually the search query
+            **kwargs: Extra arguments passed to ``requests.Session.get``;
+                ``timeout`` defaults to the transport's (connect, read) timeouts
+
+        Returns:
+            requests.Response: The response (status is not checked here)
+
+        Raises:
+            RateLimited: The host's queue was longer than the limiter's ``max_wait``
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        if self.rate_limiter is None:
+            return self._session.get(url, **kwargs)
+
+        for attempt in range(self.max_retries + 1):
+            with self.rate_limiter.slot(url, flow) as permit:
+                response = self._session.get(url, **kwargs)
+                permit.record(response)
+            if response.status_code not in THROTTLE_STATUSES or attempt == self.max_retries:
+                return response
+            response.close()
+        return response
+
+    def close(self):
+        """Close all pooled connections."""
+        self._session.close()
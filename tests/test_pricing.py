@@ -0,0 +1,18 @@
+import pandas as pd
+from snap_procure.tools.pricing import parse_price_cents, price_to_cents
+
+
+def test_price_without_dollars():
+    assert price_to_cents('$.99') == 99
+    assert parse_price_cents(pd.Series(['$.99'])).tolist() == [99]
+
+
+def test_multi_buy_price_uses_the_dollar_amount():
+    assert price_to_cents('2 for $10') == 1000
+    assert parse_price_cents(pd.Series(['2 for $10'])).tolist() == [1000]
+
+
+def test_plain_prices():
+    prices = ['$5.47', '$1,299.00', '$5.47/each', '5', 'Price not available', None]
+    assert [price_to_cents(price) for price in prices] == [547, 129900, 547, 500, None, None]
+    assert parse_price_cents(pd.Series(prices)).tolist() == [547, 129900, 547, 500, pd.NA, pd.NA]
@@ -0,0 +1,43 @@
+from snap_procure.memory import ConversationMemory
+from snap_procure.response_cache import ResponseCache
+
+
+class CountingCrew:
+    def __init__(self):
+        self.kickoffs = []
+
+    def kickoff(self, inputs):
+        self.kickoffs.append(inputs)
+        return f"answer {len(self.kickoffs)} to {inputs['user_request']}"
+
+
+def chat(cache, crew, memory, request):
+    reply = cache.kickoff(crew, request, model='test', inputs={'conversation': memory.render()})
+    memory.add(request, reply)
+    return reply
+
+
+def test_repeated_question_hits_the_cache_in_a_multi_turn_session():
+    cache, crew, memory = ResponseCache(), CountingCrew(), ConversationMemory()
+
+    first = chat(cache, crew, memory, "Compare 2x4x8 prices at Home Depot and Lowe's")
+    chat(cache, crew, memory, "Plan the lumber for a 10x12 deck")
+    again = chat(cache, crew, memory, "compare 2x4x8 prices at home depot and lowe's?")
+
+    assert again == first
+    assert len(crew.kickoffs) == 2
+    assert cache.stats['hits'] == 1
+
+
+def test_follow_up_is_keyed_on_the_conversation():
+    cache, crew = ResponseCache(), CountingCrew()
+    lumber, paint = ConversationMemory(), ConversationMemory()
+
+    chat(cache, crew, lumber, "Compare 2x4x8 prices at Home Depot and Lowe's")
+    chat(cache, crew, paint, "Compare exterior paint prices at Home Depot and Lowe's")
+    lumber_reply = chat(cache, crew, lumber, "Which of those ships fastest?")
+    paint_reply = chat(cache, crew, paint, "Which of those ships fastest?")
+
+    assert lumber_reply != paint_reply
+    assert len(crew.kickoffs) == 4
+    assert cache.stats['hits'] == 0